@@ -0,0 +1,96 @@
+"""Compare two `benchmarks.suite` result files and flag regressions.
+
+A case regresses when its throughput drops or its peak RSS grows by more than `--threshold`
+relative to the baseline, or its p99 latency grows by more than the looser `--p99-threshold`,
+as tail latencies are noisier. Exits with 1 if any case regressed, so it can
+gate CI. Results from different machines or Python versions are compared with a warning.
+
+    python -m benchmarks.compare baseline.json current.json --threshold 0.15
+"""
+
+import argparse
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+# metric -> True if higher is better
+METRICS = {"ops_per_s": True, "p99_ms": False, "peak_rss_mb": False}
+COMPARABLE = ("python", "implementation", "machine", "cpu_count", "libyaml", "seed")
+
+
+@dataclass
+class Finding:
+    """The change of one metric of one case."""
+
+    case: str
+    metric: str
+    baseline: float
+    current: float
+
+    @property
+    def delta(self) -> float:
+        """Relative change of the metric."""
+        return (self.current - self.baseline) / self.baseline if self.baseline else 0.0
+
+    @property
+    def worsening(self) -> float:
+        """Relative change, positive when the metric got worse."""
+        return -self.delta if METRICS[self.metric] else self.delta
+
+
+def compare(baseline: dict[str, Any], current: dict[str, Any]) -> list[Finding]:
+    """Pair the metrics of the cases both runs measured."""
+    findings: list[Finding] = []
+    for case, result in current["results"].items():
+        before = baseline["results"].get(case)
+        if before is None or "skipped" in before or "skipped" in result:
+            continue
+        findings.extend(Finding(case, metric, before[metric], result[metric]) for metric in METRICS)
+    return findings
+
+
+def environment_differences(baseline: dict[str, Any], current: dict[str, Any]) -> list[str]:
+    """List the settings that differ between two runs and make their numbers incomparable."""
+    return [
+        f"{key}: {baseline['meta'].get(key)} → {current['meta'].get(key)}"
+        for key in COMPARABLE
+        if baseline["meta"].get(key) != current["meta"].get(key)
+    ]
+
+
+def main() -> None:
+    """Print the comparison."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("baseline", type=Path)
+    parser.add_argument("current", type=Path)
+    parser.add_argument("--threshold", type=float, default=0.10, help="Relative change that counts as a regression")
+    parser.add_argument("--p99-threshold", type=float, default=0.25, help="Regression threshold for p99 latency")
+    args = parser.parse_args()
+
+    baseline, current = (json.loads(path.read_text()) for path in (args.baseline, args.current))
+    for difference in environment_differences(baseline, current):
+        print(f"warning: runs differ in {difference}")
+    missing = sorted(set(baseline["results"]) - set(current["results"]))
+    if missing:
+        print(f"not measured in {args.current}: {', '.join(missing)}")
+
+    thresholds = dict.fromkeys(METRICS, args.threshold) | {"p99_ms": args.p99_threshold}
+    regressions = 0
+    print(f"{'case':<34} {'metric':<12} {'baseline':>10} {'current':>10} {'change':>8}")
+    for finding in compare(baseline, current):
+        threshold = thresholds[finding.metric]
+        regressed = finding.worsening > threshold
+        regressions += regressed
+        mark = "  REGRESSION" if regressed else ("  improved" if finding.worsening < -threshold else "")
+        print(
+            f"{finding.case:<34} {finding.metric:<12} {finding.baseline:>10.2f} {finding.current:>10.2f}"
+            f" {finding.delta:>+8.1%}{mark}"
+        )
+    print(f"{regressions} regressions")
+    if regressions:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
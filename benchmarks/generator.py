@@ -0,0 +1,191 @@
+"""Seeded synthetic ODCS contracts and datasets for the benchmark suite.
+
+The same seed always produces the same contracts and rows, so runs on different machines or
+commits measure the same input. Every generated contract is valid under both validation engines.
+
+    python -m benchmarks.generator /tmp/corpus --corpus wide --seed 7
+"""
+
+import argparse
+import csv
+import random
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+import yaml
+
+Dumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
+LOGICAL_TYPES = {
+    "string": ("varchar(255)", "text", "char(36)"),
+    "integer": ("int", "bigint", "smallint"),
+    "number": ("double", "decimal(18,2)", "float"),
+    "boolean": ("boolean",),
+    "date": ("date", "timestamp"),
+}
+TAGS = ("pii", "finance", "sales", "ops", "gold", "silver", "bronze", "gdpr")
+WORDS = ("order", "customer", "amount", "status", "region", "account", "event", "price", "item", "user", "device")
+
+
+def _name(rng: random.Random, index: int) -> str:
+    return f"{rng.choice(WORDS)}_{rng.choice(WORDS)}_{index}"
+
+
+def _leaf(rng: random.Random, index: int) -> dict[str, Any]:
+    logical = rng.choice(list(LOGICAL_TYPES))
+    prop: dict[str, Any] = {
+        "name": _name(rng, index),
+        "logicalType": logical,
+        "physicalType": rng.choice(LOGICAL_TYPES[logical]),
+        "required": rng.random() < 0.5,
+    }
+    if rng.random() < 0.5:
+        prop["description"] = f"The {prop['name'].replace('_', ' ')} of the record."
+    if rng.random() < 0.3:
+        prop["tags"] = rng.sample(TAGS, 2)
+    if logical == "string" and rng.random() < 0.2:
+        prop["logicalTypeOptions"] = {"maxLength": 255}
+    return prop
+
+
+def properties(rng: random.Random, count: int, depth: int = 0, fanout: int = 3) -> list[dict[str, Any]]:
+    """Generate `count` properties, nesting objects and arrays of objects `depth` levels down."""
+    props = [_leaf(rng, index) for index in range(count)]
+    nested = min(fanout, count) if depth else 0
+    for index in range(nested):
+        children = properties(rng, max(2, count // fanout), depth - 1, fanout)
+        name = _name(rng, index)
+        if index % 2:
+            props[index] = {
+                "name": name,
+                "logicalType": "array",
+                "physicalType": "array<struct>",
+                "items": {"logicalType": "object", "physicalType": "struct", "properties": children},
+            }
+        else:
+            props[index] = {"name": name, "logicalType": "object", "physicalType": "struct", "properties": children}
+    return props
+
+
+def contract(rng: random.Random, index: int, objects: int, props: int, depth: int = 0) -> dict[str, Any]:
+    """Generate one contract with `objects` schema objects of `props` properties each."""
+    return {
+        "apiVersion": "v3.0.2",
+        "kind": "DataContract",
+        "id": f"bench-{index:05d}",
+        "name": f"Benchmark contract {index}",
+        "version": f"1.{index % 10}.0",
+        "status": "active",
+        "domain": rng.choice(("sales", "finance", "ops")),
+        "tags": rng.sample(TAGS, 3),
+        "description": {"purpose": "Synthetic contract for benchmarks", "usage": "Do not use"},
+        "schema": [
+            {
+                "name": f"table_{index}_{obj}",
+                "physicalName": f"tbl_{index}_{obj}",
+                "logicalType": "object",
+                "physicalType": "table",
+                "description": "A synthetic table.",
+                "properties": properties(rng, props, depth),
+            }
+            for obj in range(objects)
+        ],
+        "team": [{"username": f"user{index}@example.com", "role": "Data Owner", "dateIn": "2024-01-01"}],
+    }
+
+
+# name -> (files, objects per contract, properties per object, nesting depth)
+CORPORA: dict[str, tuple[int, int, int, int]] = {
+    "small": (20, 2, 15, 0),
+    "wide": (1, 1, 10_000, 0),
+    "deep": (10, 1, 24, 6),
+    "many": (1000, 1, 8, 0),
+}
+
+
+def corpus(name: str, seed: int = 0) -> list[tuple[str, dict[str, Any]]]:
+    """Return the `(file name, contract)` pairs of a corpus."""
+    if name not in CORPORA:
+        raise ValueError(f"Unknown corpus '{name}', expected one of: {', '.join(CORPORA)}")
+    files, objects, props, depth = CORPORA[name]
+    rng = random.Random(f"{name}:{seed}")
+    return [(f"{name}_{index:05d}.yaml", contract(rng, index, objects, props, depth)) for index in range(files)]
+
+
+def write_corpus(name: str, directory: Path, seed: int = 0) -> list[Path]:
+    """Write a corpus as YAML files into `directory` and return their paths."""
+    directory.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for file_name, document in corpus(name, seed):
+        path = directory / file_name
+        path.write_text(yaml.dump(document, Dumper=Dumper, sort_keys=False))
+        paths.append(path)
+    return paths
+
+
+COLUMNS: dict[str, Callable[[random.Random, int], Any]] = {
+    "id": lambda rng, row: row,
+    "customer": lambda rng, row: f"customer-{rng.randrange(10_000)}",
+    "amount": lambda rng, row: round(rng.uniform(0, 1000), 2),
+    "quantity": lambda rng, row: rng.randrange(100),
+    "active": lambda rng, row: rng.random() < 0.5,
+    "region": lambda rng, row: rng.choice(("emea", "amer", "apac")),
+}
+
+
+def rows(count: int, seed: int = 0) -> dict[str, list[Any]]:
+    """Generate `count` rows as columns."""
+    rng = random.Random(f"rows:{seed}")
+    data: dict[str, list[Any]] = {column: [] for column in COLUMNS}
+    for row in range(count):
+        for column, make in COLUMNS.items():
+            data[column].append(make(rng, row))
+    return data
+
+
+def write_csv(directory: Path, files: int = 4, rows_per_file: int = 25_000, seed: int = 0) -> Path:
+    """Write a CSV dataset with a header row, split into `files` files."""
+    directory.mkdir(parents=True, exist_ok=True)
+    for index in range(files):
+        data = rows(rows_per_file, seed + index)
+        with open(directory / f"part-{index:05d}.csv", "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(data)
+            writer.writerows(zip(*data.values()))
+    return directory
+
+
+def write_parquet(directory: Path, files: int = 4, rows_per_file: int = 25_000, seed: int = 0) -> Path:
+    """Write a Parquet dataset split into `files` files, with a nested struct and a list column."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    directory.mkdir(parents=True, exist_ok=True)
+    for index in range(files):
+        data: dict[str, Any] = rows(rows_per_file, seed + index)
+        data["address"] = [{"city": region, "zip": str(q)} for region, q in zip(data["region"], data["quantity"])]
+        data["tags"] = [[region] * (q % 3) for region, q in zip(data["region"], data["quantity"])]
+        pq.write_table(pa.table(data), directory / f"part-{index:05d}.parquet")
+    return directory
+
+
+def main() -> None:
+    """Write corpora and datasets to a directory."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("directory", type=Path)
+    parser.add_argument("--corpus", action="append", choices=list(CORPORA), help="Corpora to write (default: all)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--datasets", action="store_true", help="Also write the Parquet and CSV datasets")
+    args = parser.parse_args()
+
+    for name in args.corpus or CORPORA:
+        paths = write_corpus(name, args.directory / name, args.seed)
+        print(f"{name}: {len(paths)} files in {args.directory / name}")
+    if args.datasets:
+        print(f"parquet: {write_parquet(args.directory / 'parquet', seed=args.seed)}")
+        print(f"csv: {write_csv(args.directory / 'csv', seed=args.seed)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,233 @@
+"""Benchmark YAML loading, validation and schema detection on synthetic corpora.
+
+The corpora and datasets come from `benchmarks.generator`, so the same seed measures the same
+input everywhere. Every case runs in a fresh process: its peak RSS is not inflated by earlier
+cases, and imports, model building and schema compilation happen in an untimed warm-up call.
+A case repeats its operation, one file or dataset at a time, until `--min-time` has passed and
+reports throughput with p50/p99 latency. Results are written as JSON for `benchmarks.compare`.
+
+    python -m benchmarks.suite --output baseline.json
+    python -m benchmarks.suite -k 'validate/*' --min-time 5 --output current.json
+"""
+
+import argparse
+import fnmatch
+import json
+import math
+import os
+import platform
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from datetime import UTC, datetime
+from multiprocessing import get_context
+from pathlib import Path
+from typing import Any
+
+import yaml
+
+from benchmarks import generator
+from datadoc import __version__
+
+# (name, kind, corpus or dataset, engine)
+Case = tuple[str, str, str, str | None]
+
+
+def cases() -> list[Case]:
+    """List every benchmark case."""
+    found: list[Case] = []
+    for corpus in generator.CORPORA:
+        found.append((f"yaml.load/{corpus}", "yaml.load", corpus, None))
+        for engine in ("pydantic", "jsonschema"):
+            found.append((f"validate/{corpus}/{engine}", "validate", corpus, engine))
+    found.append(("detect_schema/parquet/native", "detect_schema", "parquet", "native"))
+    found.append(("detect_schema/csv/spark", "detect_schema", "csv", "spark"))
+    return found
+
+
+def unavailable(engine: str | None) -> str | None:
+    """Return why a case cannot run here, if it cannot."""
+    if engine == "spark":
+        try:
+            import pyspark  # noqa: F401
+        except ImportError:
+            return "pyspark is not installed"
+        if not (os.environ.get("JAVA_HOME") or shutil.which("java")):
+            return "no Java runtime"
+    if engine == "native":
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            return "pyarrow is not installed"
+    return None
+
+
+def prepare(root: Path, source: str, seed: int) -> Path:
+    """Generate a corpus or dataset under `root` unless an earlier case already did."""
+    path = root / f"{source}-{seed}"
+    if not path.exists():
+        staging = Path(tempfile.mkdtemp(dir=root))
+        if source == "parquet":
+            generator.write_parquet(staging, seed=seed)
+        elif source == "csv":
+            generator.write_csv(staging, seed=seed)
+        else:
+            generator.write_corpus(source, staging, seed)
+        staging.rename(path)
+    return path
+
+
+def _operation(kind: str, path: Path, engine: str | None) -> tuple[list[Any], Callable[[Any], Any], list[int]]:
+    """Return the items a case cycles through, the operation applied to each, and their sizes."""
+    if kind == "detect_schema":
+        files = sorted(p for p in path.iterdir() if p.is_file())
+        sizes = [sum(p.stat().st_size for p in files)]
+        if engine == "native":
+            from datadoc.extraction.engine import detect_schema_native
+
+            return [str(path)], lambda data_path: detect_schema_native(data_path, "parquet"), sizes
+        from datadoc.extraction.engine import detect_schema
+        from datadoc.spark import SharedSparkSession
+
+        spark = SharedSparkSession("benchmark")()
+        options = {"header": "true", "inferSchema": "true"}
+        return [str(path)], lambda data_path: detect_schema(spark, data_path, "csv", options), sizes
+
+    files = sorted(path.glob("*.yaml"))
+    data = [file.read_bytes() for file in files]
+    sizes = [len(item) for item in data]
+    if kind == "yaml.load":
+        from datadoc import yaml_io
+
+        return data, lambda item: list(yaml_io.load_all(item)), sizes
+
+    from datadoc.validation import validate_source
+
+    def validate(item: tuple[str, bytes]) -> None:
+        results = validate_source(*item, engine=engine or "pydantic")
+        if not all(result.valid for result in results):
+            raise AssertionError(f"{item[0]} is not valid: {results[0].message}")
+
+    return list(zip(map(str, files), data)), validate, sizes
+
+
+def _percentile(ordered: list[float], q: float) -> float:
+    """Nearest-rank percentile of sorted values."""
+    return ordered[max(0, math.ceil(q * len(ordered)) - 1)]
+
+
+def run_case(kind: str, path: Path, engine: str | None, min_time: float, min_ops: int) -> dict[str, Any]:
+    """Time one case in the current process; meant to run in a fresh child process."""
+    items, operation, sizes = _operation(kind, path, engine)
+    operation(items[0])
+    latencies: list[float] = []
+    processed = 0
+    started = time.perf_counter()
+    while time.perf_counter() - started < min_time or len(latencies) < min_ops:
+        index = len(latencies) % len(items)
+        start = time.perf_counter()
+        operation(items[index])
+        latencies.append(time.perf_counter() - start)
+        processed += sizes[index % len(sizes)]
+    total = sum(latencies)
+    ordered = sorted(latencies)
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in KiB on Linux and in bytes on macOS
+    peak_mb = peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+    return {
+        "ops": len(latencies),
+        "ops_per_s": len(latencies) / total,
+        "mb_per_s": processed / total / 1e6,
+        "p50_ms": _percentile(ordered, 0.50) * 1000,
+        "p99_ms": _percentile(ordered, 0.99) * 1000,
+        "peak_rss_mb": peak_mb,
+    }
+
+
+def _in_child(func: Callable[..., Any], *args: Any) -> Any:
+    """Call `func` in a freshly spawned process.
+
+    Linux keeps `ru_maxrss` across exec, so a child forked from a parent that grew while
+    generating inputs would report the parent's peak; inputs are generated in a child too.
+    """
+    with ProcessPoolExecutor(1, mp_context=get_context("spawn")) as pool:
+        return pool.submit(func, *args).result()
+
+
+def _git_commit() -> str | None:
+    try:
+        result = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip()
+
+
+def metadata(seed: int, min_time: float) -> dict[str, Any]:
+    """Describe the machine and settings a run was made with."""
+    return {
+        "timestamp": datetime.now(UTC).isoformat(timespec="seconds"),
+        "datadoc": __version__,
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "libyaml": yaml.__with_libyaml__,
+        "seed": seed,
+        "min_time": min_time,
+    }
+
+
+def main() -> None:
+    """Run the suite."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-k", "--case", action="append", help="Glob of case names to run (default: all)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--min-time", type=float, default=2.0, help="Seconds to repeat each case for")
+    parser.add_argument("--min-ops", type=int, default=5, help="Operations to time per case at least")
+    parser.add_argument("--data-dir", type=Path, help="Keep generated inputs here and reuse them across runs")
+    parser.add_argument("--output", "-o", type=Path, default=Path("benchmark.json"), help="JSON results file")
+    parser.add_argument("--list", action="store_true", help="List the cases and exit")
+    args = parser.parse_args()
+
+    selected = [case for case in cases() if not args.case or any(fnmatch.fnmatch(case[0], p) for p in args.case)]
+    if args.list:
+        print("\n".join(case[0] for case in selected))
+        return
+    if not selected:
+        raise SystemExit("No cases match")
+
+    root = args.data_dir or Path(tempfile.mkdtemp(prefix="datadoc-bench-"))
+    root.mkdir(parents=True, exist_ok=True)
+    results: dict[str, dict[str, Any]] = {}
+    print(f"{'case':<34} {'ops/s':>10} {'MB/s':>8} {'p50 ms':>9} {'p99 ms':>9} {'peak RSS MB':>12}")
+    try:
+        for name, kind, source, engine in selected:
+            reason = unavailable(engine)
+            if reason:
+                results[name] = {"skipped": reason}
+                print(f"{name:<34} skipped: {reason}")
+                continue
+            path = _in_child(prepare, root, source, args.seed)
+            result = _in_child(run_case, kind, path, engine, args.min_time, args.min_ops)
+            results[name] = result
+            print(
+                f"{name:<34} {result['ops_per_s']:>10.1f} {result['mb_per_s']:>8.2f} {result['p50_ms']:>9.2f}"
+                f" {result['p99_ms']:>9.2f} {result['peak_rss_mb']:>12.1f}"
+            )
+    finally:
+        if args.data_dir is None:
+            shutil.rmtree(root, ignore_errors=True)
+
+    args.output.write_text(json.dumps({"meta": metadata(args.seed, args.min_time), "results": results}, indent=2))
+    print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""Compare ways of reloading contracts that already passed validation.
+
+For each generated corpus, every contract is reloaded from YAML with `model_validate` (what a
+reload costs today), built with `model_validate` from an already parsed document, built with a
+recursive `model_construct` that skips validation, and loaded from its trusted form with
+`datadoc.trusted.load`. Times are per contract, with the speedup over the YAML reload.
+
+    python -m benchmarks.trusted_load --corpus small --corpus wide --min-time 2
+"""
+
+import argparse
+import time
+import types
+from collections.abc import Callable
+from datetime import date
+from enum import Enum
+from functools import cache
+from typing import Annotated, Any, Union, get_args, get_origin
+
+import yaml
+from pydantic import BaseModel, RootModel
+
+from benchmarks import generator
+from datadoc import trusted, yaml_io
+from datadoc.models.odcs import OpenDataContractStandardODCS
+
+
+def _converter(annotation: Any) -> Callable[[Any], Any] | None:
+    """How to build the value of a field from raw data, or None to keep it as it is."""
+    origin, args = get_origin(annotation), get_args(annotation)
+    if origin is Annotated:
+        return _converter(args[0])
+    if origin in (Union, types.UnionType):
+        members = [arg for arg in args if arg is not type(None)]
+        return _converter(members[0]) if len(members) == 1 else None
+    if origin is list and args:
+        item = _converter(args[0])
+        return None if item is None else lambda values: [item(value) for value in values]
+    if not isinstance(annotation, type):
+        return None
+    if issubclass(annotation, RootModel):
+        root = _converter(annotation.model_fields["root"].annotation)
+        model: Any = annotation
+        return lambda value: model.model_construct(value if root is None else root(value))
+    if issubclass(annotation, BaseModel):
+        return lambda value: construct(annotation, value)
+    if issubclass(annotation, Enum):
+        return annotation
+    if annotation is date:
+        return lambda value: date.fromisoformat(value) if isinstance(value, str) else value
+    return None
+
+
+@cache
+def _converters(model: type[BaseModel]) -> dict[str, Callable[[Any], Any]]:
+    fields = ((field.alias or name, _converter(field.annotation)) for name, field in model.model_fields.items())
+    return {key: convert for key, convert in fields if convert is not None}
+
+
+def construct(model: type[BaseModel], data: dict[str, Any]) -> BaseModel:
+    """Build `model` and its nested models and enums with `model_construct`, without validating."""
+    converters = _converters(model)
+    return model.model_construct(
+        **{
+            key: converters[key](value) if key in converters and value is not None else value
+            for key, value in data.items()
+        }
+    )
+
+
+def measure(operation: Callable[[Any], Any], items: list[Any], min_time: float) -> float:
+    """Return the mean seconds per item of repeating `operation` over `items` for `min_time`."""
+    for item in items[:3]:
+        operation(item)
+    count = 0
+    start = time.perf_counter()
+    while count < len(items) or time.perf_counter() - start < min_time:
+        for item in items:
+            operation(item)
+        count += len(items)
+    return (time.perf_counter() - start) / count
+
+
+def main() -> None:
+    """Run the comparison."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--corpus", action="append", choices=list(generator.CORPORA), help="Default: all but wide")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--min-time", type=float, default=1.0, help="Seconds to repeat each method for")
+    args = parser.parse_args()
+
+    model = OpenDataContractStandardODCS
+    for name in args.corpus or [corpus for corpus in generator.CORPORA if corpus != "wide"]:
+        documents = [document for _, document in generator.corpus(name, args.seed)]
+        sources = [yaml.dump(document, Dumper=generator.Dumper, sort_keys=False) for document in documents]
+        parsed = [yaml_io.load(source) for source in sources]
+        forms = [trusted.dump(document, spot_check=1.0) for document in parsed]
+        assert all(construct(model, document) == model.model_validate(document) for document in parsed)
+
+        methods: dict[str, Callable[[Any], Any]] = {
+            "YAML + model_validate": lambda source: model.model_validate(yaml_io.load(source)),
+            "model_validate": model.model_validate,
+            "recursive model_construct": lambda document: construct(model, document),
+            "trusted.load": trusted.load,
+        }
+        inputs = [sources, parsed, parsed, forms]
+        print(f"{name}: {len(documents)} contracts")
+        baseline = None
+        for (label, operation), items in zip(methods.items(), inputs):
+            seconds = measure(operation, items, args.min_time)
+            baseline = baseline or seconds
+            print(f"  {label:>26}: {seconds * 1e6:10.1f} µs/contract  {baseline / seconds:7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Compare the pydantic and jsonschema validation engines on a corpus of contracts.
+
+Every contract is parsed once up front, so the timings cover validation only. The script
+reports the throughput of each engine and lists the contracts on which they disagree.
+
+    python -m benchmarks.validation_engines examples/ path/to/contracts/ --repeat 50
+"""
+
+import argparse
+import time
+from pathlib import Path
+from typing import Any
+
+import yaml
+
+from datadoc import yaml_io
+from datadoc.validation import ENGINES, ValidationResult, collect_contract_files, validate_content
+
+
+def load_corpus(paths: list[str]) -> list[tuple[str, Any]]:
+    """Parse every contract of every file, skipping files that are not valid YAML."""
+    corpus: list[tuple[str, Any]] = []
+    for path in collect_contract_files(paths):
+        try:
+            documents = list(yaml_io.load_all(path.read_bytes()))
+        except yaml.YAMLError:
+            print(f"skipping {path}: invalid YAML")
+            continue
+        labels = [str(path)] if len(documents) == 1 else [f"{path}#{i}" for i in range(1, len(documents) + 1)]
+        corpus.extend(zip(labels, documents))
+    return corpus
+
+
+def run_engine(engine: str, corpus: list[tuple[str, Any]], repeat: int) -> tuple[float, list[ValidationResult]]:
+    """Validate the corpus `repeat` times and return the elapsed seconds and the last results."""
+    validate_content(*corpus[0], engine=engine)  # import the models / compile the schema outside the timing
+    results: list[ValidationResult] = []
+    start = time.perf_counter()
+    for _ in range(repeat):
+        results = [validate_content(path, content, engine) for path, content in corpus]
+    return time.perf_counter() - start, results
+
+
+def _first_error(result: ValidationResult) -> str:
+    if result.valid:
+        return "valid"
+    if not result.errors:
+        return str(result.message).splitlines()[0]
+    error = result.errors[0]
+    return f"{'.'.join(str(p) for p in error['loc'])}: {error['msg']}"
+
+
+def main() -> None:
+    """Run the comparison."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("paths", nargs="*", default=[str(Path(__file__).parent.parent / "examples")])
+    parser.add_argument("--repeat", type=int, default=20, help="Passes over the corpus per engine")
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.paths)
+    if not corpus:
+        raise SystemExit("No contracts to validate")
+
+    outcomes = {}
+    print(f"{len(corpus)} contracts, {args.repeat} passes")
+    for engine in ENGINES:
+        elapsed, results = run_engine(engine, corpus, args.repeat)
+        outcomes[engine] = results
+        rate = len(corpus) * args.repeat / elapsed
+        valid = sum(r.valid for r in results)
+        print(f"{engine:>10}: {rate:10.0f} contracts/s  {elapsed / args.repeat * 1000:8.2f} ms/pass  {valid} valid")
+
+    pairs = list(zip(*(outcomes[engine] for engine in ENGINES)))
+    disagreements = [pair for pair in pairs if len({r.valid for r in pair}) > 1]
+    agreement = 1 - len(disagreements) / len(pairs)
+    print(f"agreement: {agreement:.1%} ({len(disagreements)} of {len(pairs)} contracts differ)")
+    for pair in disagreements:
+        print(f"  {pair[0].path}")
+        for engine, result in zip(ENGINES, pair):
+            print(f"    {engine}: {_first_error(result)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,324 @@
+"""In-process Python API for embedding datadoc in other programs.
+
+The commands render with Rich and exit with status codes; these classes return the same
+`ValidationResult` and `ExtractionResult` objects the commands render, and never exit or
+raise for an invalid contract or unreadable dataset. Build them once and reuse them: the ODCS
+models or the compiled JSON schema, worker processes and the SparkSession are set up once and
+shared by every call.
+
+    from datadoc.api import ContractValidator
+
+    validator = ContractValidator(engine="jsonschema")
+    results = validator.validate_bytes(body)
+    if not all(result.valid for result in results):
+        ...
+
+Async services use the coroutine variants, which run parsing, validation and dataset reads on
+the object's executor so the event loop stays free: `await validator.validate_async(body)`,
+`async for result in validator.validate_stream(sources)` and `await extractor.extract_async(path)`.
+
+Contract files compiled with `datadoc compile` are read from their fresh snapshots instead of
+parsing YAML; `datadoc.snapshot.Bundle` loads single contracts from a compiled bundle.
+"""
+
+import asyncio
+import os
+import threading
+import time
+from collections import deque
+from collections.abc import AsyncIterable, AsyncIterator, Iterable, Iterator, Mapping
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+from types import TracebackType
+from typing import TYPE_CHECKING, Any, Self
+
+from datadoc.cache import ExtractionCache
+from datadoc.validation import ENGINES, ValidationResult, _warm_worker, validate_content, validate_source
+
+if TYPE_CHECKING:
+    from datadoc.extraction.engine import DatasetSpec, ExtractionResult
+    from datadoc.extraction.sampling import SamplingConfig
+
+# A contract file path, its raw YAML, an already parsed document, or a `(label, raw or parsed)` pair.
+Source = str | os.PathLike[str] | bytes | Mapping[str, Any] | tuple[str, bytes | Mapping[str, Any]]
+
+
+def _validate_item(label: str, payload: bytes | Mapping[str, Any] | None, engine: str) -> list[ValidationResult]:
+    """Validate one normalised source; runs in worker processes too."""
+    if payload is None or isinstance(payload, bytes):
+        return validate_source(label, payload, engine)
+    start = time.perf_counter()
+    result = validate_content(label, payload, engine)
+    result.duration_ms = (time.perf_counter() - start) * 1000
+    return [result]
+
+
+def _normalise(source: Source, label: str) -> tuple[str, bytes | Mapping[str, Any] | None]:
+    """Split a source into the label of its results and what to validate; None means read the file.
+
+    `label` names in-memory sources that do not come with one.
+    """
+    if isinstance(source, tuple):
+        return source
+    if isinstance(source, bytes | Mapping):
+        return label, source
+    return os.fspath(source), None
+
+
+async def _aenumerate(sources: Iterable[Source] | AsyncIterable[Source]) -> AsyncIterator[tuple[int, Source]]:
+    if isinstance(sources, AsyncIterable):
+        index = 0
+        async for source in sources:
+            yield index, source
+            index += 1
+    else:
+        for item in enumerate(sources):
+            yield item
+
+
+class ContractValidator:
+    """Validates contracts in this process, or across a pool of worker processes it keeps.
+
+    With `workers` above 1, `validate_many` fans out over that many processes, started on first
+    use and kept until `close`. The single-contract methods always run in the calling thread
+    and are safe to call from several threads at once.
+
+    The coroutine methods run on the same process pool, or on one background thread when
+    `workers` is 1; that keeps the event loop responsive but still shares the GIL with it. At
+    most `max_pending` of their validations are queued or running at once, further callers wait.
+    Cancelling a caller withdraws its validation unless a worker has already started it.
+    """
+
+    def __init__(self, engine: str = "pydantic", workers: int = 1, max_pending: int | None = None) -> None:
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown validation engine '{engine}', expected one of: {', '.join(ENGINES)}")
+        self.engine = engine
+        self.workers = max(1, workers)
+        self.max_pending = max_pending or 2 * self.workers
+        self._pool: ProcessPoolExecutor | None = None
+        self._thread: ThreadPoolExecutor | None = None
+        self._semaphore: asyncio.Semaphore | None = None
+        self._lock = threading.Lock()
+        _warm_worker(engine)
+
+    def validate_bytes(self, data: bytes, path: str = "<bytes>") -> list[ValidationResult]:
+        """Parse and validate every `---`-separated document of a YAML stream."""
+        return validate_source(path, data, self.engine)
+
+    def validate_mapping(self, content: Mapping[str, Any], path: str = "<mapping>") -> ValidationResult:
+        """Validate an already parsed contract document."""
+        return _validate_item(path, content, self.engine)[0]
+
+    def validate_file(self, path: str | os.PathLike[str]) -> list[ValidationResult]:
+        """Read and validate a contract file."""
+        return validate_source(os.fspath(path), None, self.engine)
+
+    def validate_many(self, sources: Iterable[Source]) -> Iterator[ValidationResult]:
+        """Validate a stream of sources lazily, yielding results in the order of `sources`.
+
+        Paths are read where they are validated; in-memory sources are labelled `<input N>`
+        unless given as `(label, source)` pairs. Each document of a multi-document source gets
+        its own result. With several workers, at most `max_pending` sources are read from
+        `sources` ahead of the results consumed, so memory stays bounded on endless streams.
+        """
+        items = (_normalise(source, f"<input {index}>") for index, source in enumerate(sources))
+        if self.workers == 1:
+            for label, payload in items:
+                yield from _validate_item(label, payload, self.engine)
+            return
+
+        pool = self._executor()
+        pending: deque[Future[list[ValidationResult]]] = deque()
+        try:
+            for label, payload in items:
+                pending.append(pool.submit(_validate_item, label, payload, self.engine))
+                if len(pending) >= self.max_pending:
+                    yield from pending.popleft().result()
+            while pending:
+                yield from pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+    async def validate_async(self, source: Source, label: str = "<input>") -> list[ValidationResult]:
+        """Validate one path, YAML stream or parsed document off the event loop."""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_pending)
+        path, payload = _normalise(source, label)
+        async with self._semaphore:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._background(), _validate_item, path, payload, self.engine)
+
+    async def validate_stream(
+        self, sources: Iterable[Source] | AsyncIterable[Source]
+    ) -> AsyncIterator[ValidationResult]:
+        """Validate a sync or async stream of sources off the event loop, yielding results in order.
+
+        Sources are labelled as in `validate_many`. At most `max_pending` of them are read ahead
+        of the results consumed; closing or cancelling the iteration withdraws the validations
+        that have not started.
+        """
+        loop = asyncio.get_running_loop()
+        executor = self._background()
+        pending: deque[asyncio.Future[list[ValidationResult]]] = deque()
+        try:
+            async for index, source in _aenumerate(sources):
+                path, payload = _normalise(source, f"<input {index}>")
+                pending.append(loop.run_in_executor(executor, _validate_item, path, payload, self.engine))
+                if len(pending) >= self.max_pending:
+                    for result in await pending.popleft():
+                        yield result
+            while pending:
+                for result in await pending.popleft():
+                    yield result
+        finally:
+            for future in pending:
+                future.cancel()
+
+    def _executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(self.workers, initializer=_warm_worker, initargs=(self.engine,))
+            return self._pool
+
+    def _background(self) -> Executor:
+        """The executor the coroutine methods run on."""
+        if self.workers > 1:
+            return self._executor()
+        with self._lock:
+            if self._thread is None:
+                self._thread = ThreadPoolExecutor(1, thread_name_prefix="datadoc-validate")
+            return self._thread
+
+    def close(self) -> None:
+        """Stop the worker processes and the background thread, if any were started."""
+        with self._lock:
+            executors = [self._pool, self._thread]
+            self._pool = self._thread = None
+        for executor in executors:
+            if executor is not None:
+                executor.shutdown(cancel_futures=True)
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        await asyncio.to_thread(self.close)
+
+
+class SchemaExtractor:
+    """Extracts dataset schemas, starting a SparkSession only once a dataset needs it.
+
+    The session and, with `cache`, the extraction cache in `cache_dir` are kept until `close`,
+    so repeated extractions of unchanged local datasets are answered without reading data.
+    `extract_async` runs up to `parallelism` extractions at once on threads of its own, so a
+    slow Spark read neither blocks the event loop nor the other datasets. Cancelling a caller
+    withdraws its extraction unless it has already started.
+    """
+
+    def __init__(
+        self, engine: str = "auto", parallelism: int = 1, cache: bool = False, cache_dir: Path | None = None
+    ) -> None:
+        from datadoc.extraction.engine import ENGINES as EXTRACT_ENGINES
+        from datadoc.spark import SharedSparkSession
+
+        if engine not in EXTRACT_ENGINES:
+            raise ValueError(f"Unknown engine '{engine}', expected one of: {', '.join(EXTRACT_ENGINES)}")
+        self.engine = engine
+        self.parallelism = max(1, parallelism)
+        self.spark = SharedSparkSession("datadoc")
+        self._cache: ExtractionCache | None = None
+        if cache:
+            self._cache = ExtractionCache(cache_dir)
+        self._threads: ThreadPoolExecutor | None = None
+        self._lock = threading.Lock()
+
+    def extract(
+        self,
+        data_path: str,
+        format: str = "csv",
+        options: dict[str, Any] | None = None,
+        name: str | None = None,
+        sampling: "SamplingConfig | None" = None,
+        engine: str | None = None,
+    ) -> "ExtractionResult":
+        """Extract the schema of one dataset; failures are reported in `ExtractionResult.error`."""
+        from datadoc.extraction.engine import DatasetSpec
+
+        spec = DatasetSpec(
+            name or Path(data_path.rstrip("/")).stem, data_path, format, dict(options or {}), engine, sampling
+        )
+        return next(self.extract_many([spec]))
+
+    async def extract_async(
+        self,
+        data_path: str,
+        format: str = "csv",
+        options: dict[str, Any] | None = None,
+        name: str | None = None,
+        sampling: "SamplingConfig | None" = None,
+        engine: str | None = None,
+    ) -> "ExtractionResult":
+        """Extract the schema of one dataset on a background thread, see `extract`."""
+        with self._lock:
+            if self._threads is None:
+                self._threads = ThreadPoolExecutor(self.parallelism, thread_name_prefix="datadoc-extract")
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._threads, self.extract, data_path, format, options, name, sampling, engine
+        )
+
+    def extract_many(self, specs: Iterable["DatasetSpec"], profile: bool = False) -> Iterator["ExtractionResult"]:
+        """Extract several datasets, up to `parallelism` at once, yielding results in order."""
+        from datadoc.extraction.engine import extract_datasets
+
+        yield from extract_datasets(list(specs), self.engine, self.spark, self.parallelism, profile, self._cache)
+
+    def close(self) -> None:
+        """Stop the extraction threads and the SparkSession, and close the cache."""
+        with self._lock:
+            threads, self._threads = self._threads, None
+        if threads is not None:
+            threads.shutdown(cancel_futures=True)
+        self.spark.stop()
+        if self._cache is not None:
+            self._cache.close()
+            self._cache = None
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        await asyncio.to_thread(self.close)
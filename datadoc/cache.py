@@ -0,0 +1,137 @@
+"""On-disk caches for validation results and extracted schemas."""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections.abc import Iterable
+from functools import cache
+from pathlib import Path
+from types import TracebackType
+from typing import Any, Self
+
+from datadoc import __version__
+
+DEFAULT_MAX_ENTRIES = 100_000
+_LOOKUP_BATCH = 500
+
+
+def default_cache_dir() -> Path:
+    """Return the cache directory, honouring `DATADOC_CACHE_DIR`."""
+    env = os.environ.get("DATADOC_CACHE_DIR")
+    if env:
+        return Path(env)
+    return Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache")) / "datadoc"
+
+
+@cache
+def model_fingerprint(engine: str = "pydantic") -> str:
+    """Hash what a validation engine checks against so cached results are dropped when it changes.
+
+    That is the generated ODCS models for `pydantic` and the JSON schema for `jsonschema`. The
+    source file is hashed instead of importing it, so a fully warm run never loads pydantic.
+    The hash is kept for the life of the process, like the models it describes.
+    """
+    from datadoc.validation import SCHEMA_FILE
+
+    digest = hashlib.sha256(f"{__version__}:{engine}".encode())
+    if engine == "jsonschema":
+        digest.update(SCHEMA_FILE.read_bytes())
+    else:
+        digest.update((Path(__file__).parent / "models" / "odcs.py").read_bytes())
+    return digest.hexdigest()
+
+
+def content_key(data: bytes, fingerprint: str) -> str:
+    """Build the cache key for a contract's raw bytes."""
+    return hashlib.sha256(fingerprint.encode() + b"\0" + data).hexdigest()
+
+
+class ResultCache:
+    """A size-bounded SQLite store mapping string keys to JSON documents.
+
+    Entries are evicted least-recently-used first once `max_entries` is exceeded. A cache may
+    be shared between threads.
+    """
+
+    filename = "results.sqlite"
+    default_max_entries = DEFAULT_MAX_ENTRIES
+
+    def __init__(self, directory: Path | None = None, max_entries: int | None = None) -> None:
+        self.directory = directory or default_cache_dir()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries or self.default_max_entries
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.directory / self.filename, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, result TEXT NOT NULL, accessed REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS results_accessed ON results (accessed)")
+
+    def get_many(self, keys: Iterable[str]) -> dict[str, dict[str, Any]]:
+        """Return the cached results found for `keys` and mark them as recently used."""
+        keys = list(keys)
+        found: dict[str, dict[str, Any]] = {}
+        with self._lock:
+            for start in range(0, len(keys), _LOOKUP_BATCH):
+                batch = keys[start : start + _LOOKUP_BATCH]
+                placeholders = ",".join("?" * len(batch))
+                rows = self._conn.execute(f"SELECT key, result FROM results WHERE key IN ({placeholders})", batch)
+                found.update((key, json.loads(result)) for key, result in rows)
+            if found:
+                now = time.time()
+                with self._conn:
+                    self._conn.executemany("UPDATE results SET accessed = ? WHERE key = ?", ((now, k) for k in found))
+        return found
+
+    def put_many(self, items: Iterable[tuple[str, dict[str, Any]]]) -> None:
+        """Store results and evict the oldest entries if the cache is over its bound."""
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO results (key, result, accessed) VALUES (?, ?, ?)",
+                ((key, json.dumps(result), now) for key, result in items),
+            )
+            (count,) = self._conn.execute("SELECT COUNT(*) FROM results").fetchone()
+            if count > self.max_entries:
+                self._conn.execute(
+                    "DELETE FROM results WHERE key IN (SELECT key FROM results ORDER BY accessed LIMIT ?)",
+                    (count - self.max_entries,),
+                )
+
+    def clear(self) -> None:
+        """Remove every cached result."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM results")
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        self._conn.close()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self.close()
+
+
+class ValidationCache(ResultCache):
+    """Validation results keyed by contract content, see `content_key`."""
+
+    filename = "validation.sqlite"
+
+
+class ExtractionCache(ResultCache):
+    """Extracted schemas and the file listings they were computed from, keyed by dataset."""
+
+    filename = "extraction.sqlite"
+    default_max_entries = 10_000
@@ -0,0 +1,365 @@
+"""A SQLite catalog of contract metadata for fast lookups across many contracts.
+
+`Catalog.update` reads the raw YAML of contract files without building any models, parsing only
+the top-level sections it needs (see `datadoc.contracts`), and stores their headers, schema
+objects, properties, servers, tags and team members in indexed tables.
+Files are tracked by size, modification time and content hash, so re-indexing an unchanged tree
+only costs a `stat` per file and an edited file only replaces its own rows.
+"""
+
+import hashlib
+import os
+import sqlite3
+from collections.abc import Iterable, Mapping
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from types import TracebackType
+from typing import Any, NamedTuple, Self
+
+import yaml
+
+from datadoc import snapshot
+from datadoc.cache import default_cache_dir
+from datadoc.contracts import RawContract, load_documents
+
+CATALOG_FILE = "catalog.sqlite"
+# Batches up to this many changed files are parsed in this process.
+IN_PROCESS_LIMIT = 64
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY, size INTEGER NOT NULL, mtime_ns INTEGER NOT NULL, hash TEXT NOT NULL, error TEXT
+);
+CREATE TABLE IF NOT EXISTS contracts (
+    rowid INTEGER PRIMARY KEY,
+    path TEXT NOT NULL REFERENCES files (path) ON DELETE CASCADE,
+    document INTEGER,
+    id TEXT, name TEXT, version TEXT, status TEXT, domain TEXT, data_product TEXT, tenant TEXT, api_version TEXT
+);
+CREATE TABLE IF NOT EXISTS schema_objects (
+    contract INTEGER NOT NULL REFERENCES contracts (rowid) ON DELETE CASCADE,
+    name TEXT, physical_name TEXT, physical_type TEXT, business_name TEXT
+);
+CREATE TABLE IF NOT EXISTS properties (
+    contract INTEGER NOT NULL REFERENCES contracts (rowid) ON DELETE CASCADE,
+    object TEXT, path TEXT, name TEXT, logical_type TEXT, physical_type TEXT,
+    required INTEGER, primary_key INTEGER, classification TEXT
+);
+CREATE TABLE IF NOT EXISTS servers (
+    contract INTEGER NOT NULL REFERENCES contracts (rowid) ON DELETE CASCADE,
+    server TEXT, type TEXT, environment TEXT
+);
+CREATE TABLE IF NOT EXISTS tags (
+    contract INTEGER NOT NULL REFERENCES contracts (rowid) ON DELETE CASCADE, scope TEXT NOT NULL, tag TEXT
+);
+CREATE TABLE IF NOT EXISTS team (
+    contract INTEGER NOT NULL REFERENCES contracts (rowid) ON DELETE CASCADE, username TEXT, name TEXT, role TEXT
+);
+CREATE INDEX IF NOT EXISTS contracts_path ON contracts (path);
+CREATE INDEX IF NOT EXISTS contracts_id ON contracts (id);
+CREATE INDEX IF NOT EXISTS contracts_name ON contracts (name);
+CREATE INDEX IF NOT EXISTS contracts_domain ON contracts (domain);
+CREATE INDEX IF NOT EXISTS contracts_status ON contracts (status);
+CREATE INDEX IF NOT EXISTS schema_objects_contract ON schema_objects (contract);
+CREATE INDEX IF NOT EXISTS schema_objects_name ON schema_objects (name, contract);
+CREATE INDEX IF NOT EXISTS properties_contract ON properties (contract);
+CREATE INDEX IF NOT EXISTS properties_name ON properties (name, contract);
+CREATE INDEX IF NOT EXISTS servers_contract ON servers (contract);
+CREATE INDEX IF NOT EXISTS servers_type ON servers (type, contract);
+CREATE INDEX IF NOT EXISTS tags_contract ON tags (contract);
+CREATE INDEX IF NOT EXISTS tags_tag ON tags (tag, contract);
+CREATE INDEX IF NOT EXISTS team_contract ON team (contract);
+CREATE INDEX IF NOT EXISTS team_username ON team (username, contract);
+"""
+
+HEADER_FIELDS = ("id", "name", "version", "status", "domain", "dataProduct", "tenant", "apiVersion")
+
+# Query filters: option name -> (table, column). Contract columns are matched directly, the
+# others through the child table of the same name.
+FILTERS = {
+    "id": ("contracts", "id"),
+    "name": ("contracts", "name"),
+    "domain": ("contracts", "domain"),
+    "status": ("contracts", "status"),
+    "object": ("schema_objects", "name"),
+    "property": ("properties", "name"),
+    "server_type": ("servers", "type"),
+    "tag": ("tags", "tag"),
+    "member": ("team", "username"),
+}
+
+
+class ContractRow(NamedTuple):
+    """A contract found in the catalog."""
+
+    path: str
+    document: int | None
+    id: str | None
+    name: str | None
+    version: str | None
+    status: str | None
+    domain: str | None
+
+
+@dataclass
+class IndexStats:
+    """What one catalog update did."""
+
+    indexed: int = 0
+    unchanged: int = 0
+    removed: int = 0
+    errors: int = 0
+    contracts: int = 0
+
+
+def _text(value: Any) -> str | None:
+    return None if value is None or isinstance(value, dict | list) else str(value)
+
+
+def _items(value: Any) -> list[dict]:
+    return [item for item in value if isinstance(item, dict)] if isinstance(value, list) else []
+
+
+def _tags(value: Any) -> list[str]:
+    return [str(tag) for tag in value if tag is not None] if isinstance(value, list) else []
+
+
+def contract_rows(content: Any) -> dict[str, list[tuple]] | None:
+    """Flatten one contract document into catalog rows, or return None if it is not a mapping."""
+    if not isinstance(content, Mapping):
+        return None
+    if isinstance(content, RawContract):
+        # Parse only the sections the catalog reads, all at once.
+        content.load([*HEADER_FIELDS, "tags", "servers", "team", "schema"])
+    rows: dict[str, list[tuple]] = {
+        "header": [tuple(_text(content.get(key)) for key in HEADER_FIELDS)],
+        "schema_objects": [],
+        "properties": [],
+        "servers": [
+            (_text(s.get("server")), _text(s.get("type")), _text(s.get("environment")))
+            for s in _items(content.get("servers"))
+        ],
+        "tags": [("", tag) for tag in _tags(content.get("tags"))],
+        "team": [
+            (_text(m.get("username")), _text(m.get("name")), _text(m.get("role"))) for m in _items(content.get("team"))
+        ],
+    }
+    for obj in _items(content.get("schema")):
+        object_name = _text(obj.get("name"))
+        rows["schema_objects"].append(
+            (
+                object_name,
+                _text(obj.get("physicalName")),
+                _text(obj.get("physicalType")),
+                _text(obj.get("businessName")),
+            )
+        )
+        rows["tags"].extend((object_name or "", tag) for tag in _tags(obj.get("tags")))
+        # Walk nested properties and array items without recursion; paths are dotted, items end in [].
+        stack = [(prop, "") for prop in reversed(_items(obj.get("properties")))]
+        while stack:
+            prop, parent = stack.pop()
+            name = _text(prop.get("name"))
+            if name is None:
+                path = f"{parent}[]"
+            elif parent:
+                path = f"{parent}.{name}"
+            else:
+                path = name
+            rows["properties"].append(
+                (
+                    object_name,
+                    path,
+                    name,
+                    _text(prop.get("logicalType")),
+                    _text(prop.get("physicalType")),
+                    bool(prop.get("required")),
+                    bool(prop.get("primaryKey")),
+                    _text(prop.get("classification")),
+                )
+            )
+            rows["tags"].extend((f"{object_name}.{path}", tag) for tag in _tags(prop.get("tags")))
+            children = _items(prop.get("properties"))
+            if isinstance(prop.get("items"), dict):
+                children.append(prop["items"])
+            stack.extend((child, path) for child in reversed(children))
+    return rows
+
+
+def _hash(path: str) -> str | None:
+    try:
+        return hashlib.sha256(Path(path).read_bytes()).hexdigest()
+    except OSError:
+        return None
+
+
+def parse_file(path: str) -> tuple[str, list[tuple[int | None, dict[str, list[tuple]]]], str | None]:
+    """Read and flatten every document of a contract file.
+
+    Returns the content hash, the rows of each document and a YAML or I/O error, if any.
+    """
+    try:
+        data = Path(path).read_bytes()
+    except OSError as e:
+        return "", [], str(e)
+    digest = hashlib.sha256(data).hexdigest()
+    documents: list[tuple[int | None, dict[str, list[tuple]]]] = []
+    try:
+        compiled = snapshot.documents(path, data)
+        for number, content in enumerate(load_documents(data) if compiled is None else compiled, start=1):
+            rows = contract_rows(content)
+            if rows is not None:
+                documents.append((number, rows))
+    except yaml.YAMLError as e:
+        return digest, documents, str(e)
+    if len(documents) == 1:
+        documents = [(None, documents[0][1])]
+    return digest, documents, None
+
+
+class Catalog:
+    """The contract catalog database."""
+
+    def __init__(self, path: Path | None = None) -> None:
+        self.path = path or self.default_path()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA foreign_keys=ON")
+        self._conn.executescript(SCHEMA)
+
+    @staticmethod
+    def default_path() -> Path:
+        """Return the catalog database in the cache directory."""
+        return default_cache_dir() / CATALOG_FILE
+
+    def update(self, files: Iterable[Path], roots: Iterable[Path] = (), workers: int | None = None) -> IndexStats:
+        """Bring the catalog in line with `files`.
+
+        Files whose size and modification time are unchanged are skipped, and files whose content
+        hash is unchanged only have their stat refreshed, without being parsed. Catalogued files
+        below `roots` that are not in `files` any more are removed.
+        """
+        stats = IndexStats()
+        known = {
+            path: (size, mtime_ns, digest)
+            for path, size, mtime_ns, digest in self._conn.execute("SELECT path, size, mtime_ns, hash FROM files")
+        }
+        current: dict[str, os.stat_result] = {}
+        for file in files:
+            path = str(Path(file).absolute())
+            try:
+                current[path] = os.stat(path)
+            except OSError:
+                continue
+        changed, touched = [], []
+        for path, stat in current.items():
+            old = known.get(path)
+            if old is not None and old[:2] == (stat.st_size, stat.st_mtime_ns):
+                stats.unchanged += 1
+            elif old is not None and _hash(path) == old[2]:
+                touched.append(path)
+            else:
+                changed.append(path)
+
+        prefixes = tuple(str(Path(root).absolute()).rstrip(os.sep) + os.sep for root in roots)
+        explicit = {str(Path(root).absolute()) for root in roots}
+        removed = [path for path in known if path not in current and (path in explicit or path.startswith(prefixes))]
+
+        parsed = self._parse(changed, workers)
+        with self._conn:
+            self._conn.executemany("DELETE FROM files WHERE path = ?", ((path,) for path in removed))
+            stats.removed = len(removed)
+            self._conn.executemany(
+                "UPDATE files SET size = ?, mtime_ns = ? WHERE path = ?",
+                ((current[path].st_size, current[path].st_mtime_ns, path) for path in touched),
+            )
+            stats.unchanged += len(touched)
+            for path, (digest, documents, error) in zip(changed, parsed):
+                stat = current[path]
+                self._conn.execute("DELETE FROM files WHERE path = ?", (path,))
+                self._conn.execute(
+                    "INSERT INTO files (path, size, mtime_ns, hash, error) VALUES (?, ?, ?, ?, ?)",
+                    (path, stat.st_size, stat.st_mtime_ns, digest, error),
+                )
+                for document, rows in documents:
+                    self._insert(path, document, rows)
+                stats.indexed += 1
+                stats.errors += error is not None
+        (stats.contracts,) = self._conn.execute("SELECT COUNT(*) FROM contracts").fetchone()
+        self._conn.execute("PRAGMA optimize")
+        return stats
+
+    def _parse(self, paths: list[str], workers: int | None) -> list:
+        workers = workers or os.cpu_count() or 1
+        if workers <= 1 or len(paths) <= IN_PROCESS_LIMIT:
+            return [parse_file(path) for path in paths]
+        workers = min(workers, len(paths))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(parse_file, paths, chunksize=max(1, len(paths) // (workers * 4))))
+
+    def _insert(self, path: str, document: int | None, rows: dict[str, list[tuple]]) -> None:
+        cursor = self._conn.execute(
+            "INSERT INTO contracts (path, document, id, name, version, status, domain, data_product, tenant,"
+            " api_version) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (path, document, *rows["header"][0]),
+        )
+        contract = cursor.lastrowid
+        for table, columns in (
+            ("schema_objects", "name, physical_name, physical_type, business_name"),
+            ("properties", "object, path, name, logical_type, physical_type, required, primary_key, classification"),
+            ("servers", "server, type, environment"),
+            ("tags", "scope, tag"),
+            ("team", "username, name, role"),
+        ):
+            if rows[table]:
+                placeholders = ", ".join("?" * (columns.count(",") + 2))
+                self._conn.executemany(
+                    f"INSERT INTO {table} (contract, {columns}) VALUES ({placeholders})",
+                    ((contract, *row) for row in rows[table]),
+                )
+
+    def find(self, limit: int | None = None, **filters: str | None) -> list[ContractRow]:
+        """Return the contracts matching every given filter, see `FILTERS`.
+
+        A value containing `*`, `?` or `[` is matched as a glob pattern, anything else exactly.
+        """
+        clauses = []
+        params: list[Any] = []
+        for key, value in filters.items():
+            if value is None:
+                continue
+            if key not in FILTERS:
+                raise ValueError(f"Unknown filter '{key}', expected one of: {', '.join(FILTERS)}")
+            table, column = FILTERS[key]
+            match = f"{column} GLOB ?" if any(c in value for c in "*?[") else f"{column} = ?"
+            if table == "contracts":
+                clauses.append(f"c.{match}")
+            else:
+                clauses.append(f"c.rowid IN (SELECT contract FROM {table} WHERE {match})")
+            params.append(value)
+        sql = "SELECT c.path, c.document, c.id, c.name, c.version, c.status, c.domain FROM contracts AS c"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY c.path, c.document"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return [ContractRow(*row) for row in self._conn.execute(sql, params)]
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        self._conn.close()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self.close()
@@ -0,0 +1,238 @@
+"""Execution of ODCS data quality rules against a dataset.
+
+Library rules from every property of a schema object are compiled into a set of metrics,
+duplicates are merged, and all metrics are computed in one Spark aggregation, so a table
+is scanned once however many rules and columns it has. SQL rules run as individual queries.
+
+Supported library rules:
+
+- `rowCount`: number of rows, compared with `mustBe`, `mustBeGreaterThan`, ...
+- `nullCount` / `nullValues`: number of nulls in the property (default `mustBe: 0`)
+- `duplicateCount` / `duplicateValues`: non-null values minus distinct values (default `mustBe: 0`)
+- `validValues`: every non-null value must be in `validValues` (if given) and satisfy the
+  comparisons; the metric is the number of values that do not
+"""
+
+import operator
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from pyspark.sql import Column, DataFrame, SparkSession
+
+COMPARISONS: dict[str, Callable[[Any, Any], bool]] = {
+    "mustBe": operator.eq,
+    "mustNotBe": operator.ne,
+    "mustBeGreaterThan": operator.gt,
+    "mustBeGreaterOrEqualTo": operator.ge,
+    "mustBeLessThan": operator.lt,
+    "mustBeLessOrEqualTo": operator.le,
+    "mustBeBetween": lambda value, bounds: bounds[0] <= value <= bounds[1],
+    "mustNotBeBetween": lambda value, bounds: not bounds[0] <= value <= bounds[1],
+}
+
+RULE_ALIASES = {"nullValues": "nullCount", "duplicateValues": "duplicateCount"}
+COUNT_RULES = {"rowCount", "nullCount", "duplicateCount"}
+
+MetricKey = tuple[Any, ...]
+
+
+@dataclass
+class Rule:
+    """A quality rule attached to a schema object or one of its properties."""
+
+    object_name: str
+    property_name: str | None
+    definition: dict[str, Any]
+
+    @property
+    def type(self) -> str:
+        """The ODCS quality type, `library` when omitted."""
+        return str(self.definition.get("type") or "library")
+
+    @property
+    def name(self) -> str:
+        """The canonical rule name, or the check name for SQL rules."""
+        if self.type == "sql":
+            return str(self.definition.get("name") or "sql")
+        rule = str(self.definition.get("rule") or self.definition.get("name") or "")
+        return RULE_ALIASES.get(rule, rule)
+
+    @property
+    def comparisons(self) -> dict[str, Any]:
+        """The `mustBe...` operators set on the rule."""
+        return {key: self.definition[key] for key in COMPARISONS if self.definition.get(key) is not None}
+
+
+@dataclass
+class RuleResult:
+    """The outcome of one rule: `passed`, `failed` or `skipped`."""
+
+    rule: Rule
+    status: str
+    value: Any = None
+    message: str = ""
+
+
+def collect_rules(schema_object: dict[str, Any]) -> list[Rule]:
+    """List the quality rules of a schema object and its properties, in contract order."""
+    name = schema_object.get("name", "")
+    rules = [Rule(name, None, q) for q in schema_object.get("quality") or []]
+    for prop in schema_object.get("properties") or []:
+        rules.extend(Rule(name, prop.get("name"), q) for q in prop.get("quality") or [])
+    return rules
+
+
+def _freeze(value: Any) -> Any:
+    """Make rule arguments hashable so identical metrics are computed once."""
+    if isinstance(value, list | tuple):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def metric_key(rule: Rule) -> MetricKey | None:
+    """Return the aggregate a library rule needs, or None if the rule cannot be compiled."""
+    if rule.type != "library":
+        return None
+    if rule.name == "rowCount":
+        return ("rows",)
+    if rule.property_name is None:
+        return None
+    if rule.name == "nullCount":
+        return ("nulls", rule.property_name)
+    if rule.name == "duplicateCount":
+        return ("duplicates", rule.property_name)
+    if rule.name == "validValues":
+        constraints = tuple(sorted((k, _freeze(v)) for k, v in rule.comparisons.items()))
+        allowed = rule.definition.get("validValues")
+        if allowed is None and not constraints:
+            return None
+        return ("invalid", rule.property_name, _freeze(allowed), constraints)
+    return None
+
+
+def plan_metrics(rules: list[Rule]) -> dict[MetricKey, str]:
+    """Assign one aggregate column alias to every distinct metric the rules need."""
+    plan: dict[MetricKey, str] = {}
+    for rule in rules:
+        key = metric_key(rule)
+        if key is not None and key not in plan:
+            plan[key] = f"m{len(plan)}"
+    return plan
+
+
+def _column(name: str) -> "Column":
+    from pyspark.sql import functions as F
+
+    return F.col("`" + name.replace("`", "``") + "`")
+
+
+def _value_predicate(column: "Column", allowed: Any, constraints: tuple) -> "Column":
+    """Build the condition every valid value must satisfy."""
+    from pyspark.sql import functions as F
+
+    predicate = F.lit(True)
+    if allowed is not None:
+        predicate = predicate & column.isin(list(allowed))
+    for op, arg in constraints:
+        if op == "mustBe":
+            predicate = predicate & (column == arg)
+        elif op == "mustNotBe":
+            predicate = predicate & (column != arg)
+        elif op == "mustBeGreaterThan":
+            predicate = predicate & (column > arg)
+        elif op == "mustBeGreaterOrEqualTo":
+            predicate = predicate & (column >= arg)
+        elif op == "mustBeLessThan":
+            predicate = predicate & (column < arg)
+        elif op == "mustBeLessOrEqualTo":
+            predicate = predicate & (column <= arg)
+        elif op == "mustBeBetween":
+            predicate = predicate & column.between(arg[0], arg[1])
+        elif op == "mustNotBeBetween":
+            predicate = predicate & ~column.between(arg[0], arg[1])
+    return predicate
+
+
+def metric_expression(key: MetricKey) -> "Column":
+    """Build the Spark aggregate for a metric key."""
+    from pyspark.sql import functions as F
+
+    kind = key[0]
+    if kind == "rows":
+        return F.count(F.lit(1))
+    column = _column(key[1])
+    if kind == "nulls":
+        return F.count(F.lit(1)) - F.count(column)
+    if kind == "duplicates":
+        return F.count(column) - F.countDistinct(column)
+    if kind == "invalid":
+        invalid = column.isNotNull() & ~_value_predicate(column, key[2], key[3])
+        return F.coalesce(F.sum(F.when(invalid, 1).otherwise(0)), F.lit(0))
+    raise ValueError(f"Unknown metric: {key!r}")
+
+
+def compute_metrics(df: "DataFrame", plan: dict[MetricKey, str]) -> dict[MetricKey, Any]:
+    """Compute every planned metric in a single aggregation over `df`."""
+    if not plan:
+        return {}
+    row = df.agg(*(metric_expression(key).alias(alias) for key, alias in plan.items())).collect()[0]
+    return {key: row[alias] for key, alias in plan.items()}
+
+
+def compare(value: Any, comparisons: dict[str, Any]) -> bool:
+    """Return True if `value` satisfies every comparison."""
+    return all(COMPARISONS[op](value, arg) for op, arg in comparisons.items())
+
+
+def evaluate(rule: Rule, metrics: dict[MetricKey, Any]) -> RuleResult:
+    """Judge a library rule from precomputed metrics."""
+    key = metric_key(rule)
+    if key is None:
+        return RuleResult(rule, "skipped", message=f"Unsupported {rule.type} rule '{rule.name}'")
+    value = metrics[key]
+    if rule.name == "validValues":
+        passed = value == 0
+        expected = "0 invalid values"
+    else:
+        comparisons = rule.comparisons or ({"mustBe": 0} if rule.name in COUNT_RULES - {"rowCount"} else {})
+        if not comparisons:
+            return RuleResult(rule, "skipped", value, "No comparison given")
+        passed = compare(value, comparisons)
+        expected = ", ".join(f"{op} {arg}" for op, arg in comparisons.items())
+    return RuleResult(rule, "passed" if passed else "failed", value, expected)
+
+
+def run_sql_rule(spark: "SparkSession", rule: Rule, view: str) -> RuleResult:
+    """Run a `sql` rule against a temporary view, substituting `${table}`, `${object}` and `${column}`."""
+    query = str(rule.definition.get("query") or "")
+    if not query:
+        return RuleResult(rule, "skipped", message="Missing query")
+    for placeholder, value in (("table", view), ("object", view), ("column", rule.property_name or "")):
+        query = query.replace("${" + placeholder + "}", value)
+    value = spark.sql(query).collect()[0][0]
+    comparisons = rule.comparisons
+    if not comparisons:
+        return RuleResult(rule, "skipped", value, "No comparison given")
+    passed = compare(value, comparisons)
+    return RuleResult(
+        rule, "passed" if passed else "failed", value, ", ".join(f"{k} {v}" for k, v in comparisons.items())
+    )
+
+
+def run_checks(spark: "SparkSession", df: "DataFrame", schema_object: dict[str, Any]) -> list[RuleResult]:
+    """Run every quality rule of a schema object against `df`, with one scan for all library rules."""
+    rules = collect_rules(schema_object)
+    metrics = compute_metrics(df, plan_metrics(rules))
+    view = None
+    results = []
+    for rule in rules:
+        if rule.type == "sql":
+            if view is None:
+                view = "datadoc_" + "".join(c if c.isalnum() else "_" for c in rule.object_name)
+                df.createOrReplaceTempView(view)
+            results.append(run_sql_rule(spark, rule, view))
+        else:
+            results.append(evaluate(rule, metrics))
+    return results
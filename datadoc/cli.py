@@ -1,17 +1,22 @@
 """Main CLI entry point."""
 
 from pathlib import Path
-from typing import Optional
+from typing import Any, Optional
 
 import typer
-import yaml
 from rich.console import Console
 from rich.panel import Panel
-from rich.syntax import Syntax
+from rich.table import Table
 
+from datadoc import timing
+from datadoc.commands.catalog import index, query
+from datadoc.commands.check import check
+from datadoc.commands.compile import compile_contracts
+from datadoc.commands.diff import diff
 from datadoc.commands.extract import extract
-
-from .models.odcs import OpenDataContractStandardODCS
+from datadoc.commands.listing import list_contracts
+from datadoc.commands.serve import serve
+from datadoc.commands.validate import validate
 
 app = typer.Typer(
     name="datadoc",
@@ -20,81 +25,76 @@ app = typer.Typer(
 )
 console = Console()
 
-# Add subcommands
-app.command()(extract)
 
-
-@app.command()
-def validate(
-    file: Path = typer.Argument(
-        ...,
-        help="Path to the YAML file to validate",
-        exists=True,
-        file_okay=True,
-        dir_okay=False,
-        readable=True,
-    ),
-    verbose: bool = typer.Option(
+@app.callback()
+def options(
+    ctx: typer.Context,
+    profile: bool = typer.Option(
         False,
-        "--verbose",
-        "-v",
-        help="Show detailed validation errors",
+        "--profile",
+        help="Time each phase of the command and print a breakdown to stderr",
+    ),
+    profile_output: Optional[Path] = typer.Option(
+        None,
+        "--profile-output",
+        help="Also write a Chrome trace (*.json) or cProfile stats (any other name); implies --profile",
+        dir_okay=False,
     ),
 ) -> None:
-    """
-    Validate a YAML file against the Open Data Contract Standard (ODCS) schema.
-
-    The command will check if the YAML file contains a valid data contract
-    according to the ODCS specification.
-    """
-    try:
-        # Read and parse YAML file
-        with open(file) as f:
-            yaml_content = yaml.safe_load(f)
-
-        # Validate against Pydantic model
-        contract = OpenDataContractStandardODCS.model_validate(yaml_content)
-
-        # If we get here, validation passed
-        console.print(
-            Panel(
-                "[green]✓[/green] YAML file is a valid ODCS data contract",
-                title="Validation Successful",
-                border_style="green",
-            )
+    """Set up options shared by every command."""
+    if not profile and profile_output is None:
+        return
+    recorder = timing.enable()
+    profiler = None
+    if profile_output is not None and profile_output.suffix != ".json":
+        import cProfile
+
+        profiler = cProfile.Profile()
+        profiler.enable()
+    ctx.call_on_close(lambda: _finish_profile(recorder, profiler, profile_output))
+
+
+def _finish_profile(recorder: timing.Recorder, profiler: Any, output: Optional[Path]) -> None:
+    """Stop profiling, print the phase breakdown and write the requested profile file."""
+    if profiler is not None:
+        profiler.disable()
+    timing.disable()
+    wall = recorder.elapsed_ns()
+    table = Table(title=f"Profile ({wall / 1e6:.1f} ms)", caption="Phases in worker threads overlap the wall time")
+    for column in ("Phase", "Calls", "Total ms", "Self ms", "% of wall"):
+        table.add_column(column, justify="left" if column == "Phase" else "right")
+    for phase in recorder.phases():
+        table.add_row(
+            phase.name,
+            str(phase.calls),
+            f"{phase.total_ns / 1e6:.1f}",
+            f"{phase.self_ns / 1e6:.1f}",
+            f"{100 * phase.self_ns / wall:.1f}",
         )
+    other = recorder.unattributed_ns()
+    table.add_row("[dim](other)[/dim]", "", "", f"{other / 1e6:.1f}", f"{100 * other / wall:.1f}")
+    stderr = Console(stderr=True)
+    stderr.print(table)
+    if output is None:
+        return
+    if profiler is not None:
+        profiler.dump_stats(output)
+        stderr.print(f"cProfile stats saved to {output} (python -m pstats {output})")
+    else:
+        recorder.write_chrome_trace(output)
+        stderr.print(f"Chrome trace saved to {output}")
 
-        if verbose:
-            # Show the validated contract details
-            console.print("\n[bold]Contract Details:[/bold]")
-            console.print(f"Version: {contract.version}")
-            console.print(f"ID: {contract.id}")
-            console.print(f"Name: {contract.name}")
-            console.print(f"Status: {contract.status}")
-            if contract.description:
-                console.print(f"Description: {contract.description}")
-
-    except yaml.YAMLError as e:
-        console.print(
-            Panel(
-                f"[red]✗[/red] Invalid YAML format:\n{str(e)}",
-                title="Validation Failed",
-                border_style="red",
-            )
-        )
-        raise typer.Exit(1)
-    except Exception as e:
-        console.print(
-            Panel(
-                f"[red]✗[/red] Invalid data contract:\n{str(e)}",
-                title="Validation Failed",
-                border_style="red",
-            )
-        )
-        if verbose:
-            console.print("\n[bold]Detailed Error:[/bold]")
-            console.print(Syntax(str(e), "python", theme="monokai"))
-        raise typer.Exit(1)
+
+# Add subcommands
+app.command()(extract)
+app.command()(validate)
+app.command()(check)
+app.command()(serve)
+app.command()(index)
+app.command()(query)
+app.command(name="list")(list_contracts)
+app.command()(diff)
+app.command(name="compile")(compile_contracts)
 
 
 @app.command()
@@ -156,7 +156,8 @@ def generate_models(
     ]
 
     try:
-        subprocess.run(cmd, check=True)
+        with timing.span("codegen"):
+            subprocess.run(cmd, check=True)
         console.print(
             Panel(
                 f"[green]✓[/green] Successfully generated models at {output_file}",
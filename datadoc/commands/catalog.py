@@ -0,0 +1,103 @@
+"""Build and query the contract catalog."""
+
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Optional
+
+import typer
+from rich.console import Console
+from rich.table import Table
+
+from datadoc.catalog import Catalog
+from datadoc.validation import collect_contract_files
+
+console = Console()
+
+CATALOG_HELP = "Catalog database (default: catalog.sqlite in $DATADOC_CACHE_DIR or ~/.cache/datadoc)"
+
+
+def index(
+    files: list[str] = typer.Argument(..., help="Contract files, directories or glob patterns to index"),
+    catalog_path: Optional[Path] = typer.Option(None, "--catalog", help=CATALOG_HELP, dir_okay=False),
+    workers: Optional[int] = typer.Option(
+        None, "--workers", "-w", min=1, help="Number of worker processes for parsing (default: number of CPUs)"
+    ),
+) -> None:
+    """
+    Index contract metadata into a SQLite catalog for `datadoc query`.
+
+    Headers, schema objects, properties, servers, tags and team members are
+    read from the raw YAML. Only files whose content changed are parsed again,
+    and catalogued files that disappeared from the given directories are removed.
+    """
+    try:
+        paths = collect_contract_files(files)
+    except FileNotFoundError as e:
+        raise typer.BadParameter(str(e))
+
+    start = time.perf_counter()
+    roots = [Path(f) for f in files if Path(f).exists()]
+    with Catalog(catalog_path) as catalog:
+        stats = catalog.update(paths, roots, workers)
+    elapsed = time.perf_counter() - start
+    console.print(
+        f"[green]✓[/green] {stats.contracts} contracts in the catalog: {stats.indexed} files indexed, "
+        f"{stats.unchanged} unchanged, {stats.removed} removed ({elapsed:.2f}s)"
+    )
+    if stats.errors:
+        console.print(f"[yellow]{stats.errors} files could not be parsed completely[/yellow]")
+
+
+def query(
+    id: Optional[str] = typer.Option(None, "--id", help="Contract id"),
+    name: Optional[str] = typer.Option(None, "--name", help="Contract name"),
+    domain: Optional[str] = typer.Option(None, "--domain", help="Contract domain"),
+    status: Optional[str] = typer.Option(None, "--status", help="Contract status"),
+    object: Optional[str] = typer.Option(None, "--object", help="Name of a schema object in the contract"),
+    property: Optional[str] = typer.Option(None, "--property", help="Name of a property in the contract"),
+    server_type: Optional[str] = typer.Option(None, "--server-type", help="Type of a server of the contract"),
+    tag: Optional[str] = typer.Option(None, "--tag", help="Tag of the contract, a schema object or a property"),
+    member: Optional[str] = typer.Option(None, "--member", help="Username of a team member"),
+    limit: Optional[int] = typer.Option(None, "--limit", min=1, help="Return at most this many contracts"),
+    output_format: str = typer.Option("text", "--format", "-f", help="Output format: text or jsonl"),
+    catalog_path: Optional[Path] = typer.Option(None, "--catalog", help=CATALOG_HELP, dir_okay=False),
+) -> None:
+    """
+    Find contracts in the catalog built by `datadoc index`.
+
+    Filters are combined with AND. Values containing *, ? or [ are matched as
+    glob patterns, e.g. --name 'orders_*'.
+    """
+    if output_format not in ("text", "jsonl"):
+        raise typer.BadParameter(f"Unknown format '{output_format}', expected one of: text, jsonl")
+    catalog_path = catalog_path or Catalog.default_path()
+    if not catalog_path.exists():
+        raise typer.BadParameter(f"No catalog at {catalog_path}; run `datadoc index` first")
+
+    with Catalog(catalog_path) as catalog:
+        rows = catalog.find(
+            limit=limit,
+            id=id,
+            name=name,
+            domain=domain,
+            status=status,
+            object=object,
+            property=property,
+            server_type=server_type,
+            tag=tag,
+            member=member,
+        )
+
+    if output_format == "jsonl":
+        for row in rows:
+            sys.stdout.write(json.dumps(row._asdict()) + "\n")
+        return
+    table = Table(title=f"{len(rows)} contracts")
+    for column in ("File", "ID", "Name", "Version", "Status", "Domain"):
+        table.add_column(column)
+    for row in rows:
+        label = row.path if row.document is None else f"{row.path}#{row.document}"
+        table.add_row(label, row.id, row.name, row.version, row.status, row.domain)
+    console.print(table)
@@ -0,0 +1,142 @@
+"""Run the data quality rules of a contract against data."""
+
+from pathlib import Path
+from typing import Any, Optional
+
+import typer
+from rich.console import Console
+from rich.table import Table
+
+from datadoc import snapshot
+from datadoc.checks import RuleResult, run_checks
+from datadoc.spark import SharedSparkSession
+
+console = Console()
+
+STATUS_STYLES = {
+    "passed": "[green]passed[/green]",
+    "failed": "[red]failed[/red]",
+    "skipped": "[yellow]skipped[/yellow]",
+}
+
+
+def parse_pairs(values: list[str], what: str) -> dict[str, str]:
+    """Parse repeated KEY=VALUE options."""
+    pairs = {}
+    for value in values:
+        key, sep, item = value.partition("=")
+        if not sep or not key:
+            raise typer.BadParameter(f"Expected KEY=VALUE for {what}, got '{value}'")
+        pairs[key] = item
+    return pairs
+
+
+def data_locations(objects: list[dict[str, Any]], data: list[str]) -> dict[str, str]:
+    """Match `--data` arguments to schema objects by `name` or `physicalName`.
+
+    A bare path is accepted when the contract has exactly one schema object.
+    """
+    names = {}
+    for obj in objects:
+        for key in ("name", "physicalName"):
+            if obj.get(key):
+                names[obj[key]] = obj["name"]
+    locations = {}
+    for value in data:
+        key, sep, path = value.partition("=")
+        if not sep:
+            if len(objects) != 1:
+                raise typer.BadParameter("Use OBJECT=PATH for --data when the contract has several schema objects")
+            locations[objects[0]["name"]] = value
+        elif key in names:
+            locations[names[key]] = path
+        else:
+            raise typer.BadParameter(f"No schema object named '{key}' in the contract")
+    return locations
+
+
+def _print_results(results: list[RuleResult]) -> None:
+    """Render rule outcomes as a table."""
+    table = Table(title="Quality Checks")
+    table.add_column("Object", style="cyan")
+    table.add_column("Property", style="cyan")
+    table.add_column("Rule", style="magenta")
+    table.add_column("Value")
+    table.add_column("Expected")
+    table.add_column("Status")
+    for result in results:
+        rule = result.rule
+        table.add_row(
+            rule.object_name,
+            rule.property_name or "",
+            rule.name,
+            "" if result.value is None else str(result.value),
+            result.message,
+            STATUS_STYLES[result.status],
+        )
+    console.print(table)
+
+
+def check(
+    contract: Path = typer.Argument(
+        ...,
+        help="Path to the data contract",
+        exists=True,
+        file_okay=True,
+        dir_okay=False,
+        readable=True,
+    ),
+    data: list[str] = typer.Option(
+        ...,
+        "--data",
+        "-d",
+        help="Data location: PATH for a single-object contract, or OBJECT=PATH (repeatable)",
+    ),
+    format: str = typer.Option("parquet", "--format", "-f", help="Spark data source format"),
+    option: Optional[list[str]] = typer.Option(
+        None,
+        "--option",
+        help="Spark reader option as KEY=VALUE (repeatable)",
+    ),
+) -> None:
+    """
+    Run the quality rules of a data contract against data.
+
+    Library rules of all properties of a schema object are computed in a single
+    aggregation over its table. The command exits non-zero if any rule fails.
+    """
+    spark = SharedSparkSession("QualityChecker")
+    try:
+        from datadoc.models.odcs import OpenDataContractStandardODCS
+
+        content = snapshot.load(contract)
+        OpenDataContractStandardODCS.model_validate(content)
+        objects = [obj for obj in content.get("schema") or [] if obj.get("name")]
+        locations = data_locations(objects, data)
+        options = parse_pairs(option or [], "--option")
+
+        results: list[RuleResult] = []
+        for obj in objects:
+            if obj["name"] not in locations:
+                continue
+            console.print(f"Checking {obj['name']} against {locations[obj['name']]}...")
+            session = spark()
+            df = session.read.format(format).options(**options).load(locations[obj["name"]])
+            results.extend(run_checks(session, df, obj))
+    except typer.BadParameter:
+        raise
+    except Exception as e:
+        console.print(f"[red]Error: {str(e)}")
+        raise typer.Exit(1)
+    finally:
+        spark.stop()
+
+    if not results:
+        console.print("[yellow]No quality rules to check")
+        return
+    _print_results(results)
+    failed = sum(r.status == "failed" for r in results)
+    if failed:
+        console.print(f"[red]✗[/red] {failed} of {len(results)} rules failed")
+        raise typer.Exit(1)
+    console.print(f"[green]✓[/green] {sum(r.status == 'passed' for r in results)} rules passed")
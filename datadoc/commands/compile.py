@@ -0,0 +1,111 @@
+"""Compile validated contracts into snapshots that reload without parsing YAML."""
+
+import os
+from pathlib import Path
+from typing import Any, Optional
+
+import typer
+import yaml
+from rich.console import Console
+
+from datadoc import snapshot, yaml_io
+from datadoc.timing import span
+from datadoc.validation import ENGINES, ValidationResult, collect_contract_files, validate_content
+
+console = Console()
+
+
+def compile_file(path: str, engine: str = "pydantic") -> tuple[list[ValidationResult], list[Any], dict[str, Any]]:
+    """Parse and validate a contract file, returning its results, documents and `snapshot.source_info`."""
+    try:
+        stat = os.stat(path)
+        data = Path(path).read_bytes()
+    except OSError as e:
+        return [ValidationResult(path=path, valid=False, error_type="io", message=str(e))], [], {}
+    try:
+        with span("yaml.parse"):
+            documents = list(yaml_io.load_all(data))
+    except yaml.YAMLError as e:
+        return [ValidationResult(path=path, valid=False, error_type="yaml", message=str(e))], [], {}
+    with span(f"validate.{engine}"):
+        results = [validate_content(path, document, engine) for document in documents or [None]]
+    if len(results) > 1:
+        for number, result in enumerate(results, start=1):
+            result.document = number
+    return results, documents, snapshot.source_info(stat, data)
+
+
+def compile_contracts(
+    files: list[str] = typer.Argument(..., help="Contract files, directories or glob patterns to compile"),
+    bundle: Optional[Path] = typer.Option(
+        None,
+        "--bundle",
+        "-b",
+        help="Pack every contract into this bundle instead of writing a snapshot next to each file",
+        dir_okay=False,
+    ),
+    engine: str = typer.Option(
+        "pydantic",
+        "--engine",
+        "-e",
+        help="Validation engine: pydantic or jsonschema",
+    ),
+) -> None:
+    """
+    Compile validated contracts into snapshots that reload without parsing YAML.
+
+    Each valid file gets a `<file>.snapshot` next to it, which every command
+    reads instead of the YAML until the file changes. Files holding values a
+    snapshot cannot keep the types of are skipped with a warning. With --bundle, all
+    contracts are packed into one file indexed by contract id, written only
+    if every contract is valid. Exits with 1 if any contract is invalid.
+    """
+    if engine not in ENGINES:
+        raise typer.BadParameter(f"Unknown validation engine '{engine}', expected one of: {', '.join(ENGINES)}")
+    try:
+        paths = collect_contract_files(files)
+    except FileNotFoundError as e:
+        raise typer.BadParameter(str(e))
+
+    contracts: dict[str, tuple[str, Any]] = {}
+    compiled = failed = 0
+    for path in paths:
+        results, documents, info = compile_file(str(path), engine)
+        invalid = [result for result in results if not result.valid]
+        for result in invalid:
+            reason = str(result.message).splitlines()[0]
+            console.print(f"[red]✗[/red] {result.label}: {reason}")
+        if invalid:
+            failed += 1
+            continue
+        if bundle is None:
+            try:
+                with span("snapshot.write"):
+                    snapshot.write(path, documents, info)
+            except snapshot.SnapshotError as e:
+                console.print(f"[yellow]![/yellow] {path} is read from YAML: {e}")
+                continue
+            compiled += 1
+            continue
+        compiled += 1
+        for document in documents:
+            key = str(document["id"])
+            if key in contracts:
+                raise typer.BadParameter(f"Contract id '{key}' is declared in both {contracts[key][0]} and {path}")
+            contracts[key] = (str(path), document)
+
+    if failed:
+        console.print(f"[red]{failed} of {len(paths)} files have invalid contracts[/red]")
+        if bundle is not None:
+            console.print(f"[red]{bundle} was not written[/red]")
+        raise typer.Exit(1)
+    if bundle is not None:
+        try:
+            with span("snapshot.write"):
+                snapshot.write_bundle(bundle, contracts)
+        except snapshot.SnapshotError as e:
+            console.print(f"[red]✗[/red] {e}\n[red]{bundle} was not written[/red]")
+            raise typer.Exit(1)
+        console.print(f"[green]✓[/green] Packed {len(contracts)} contracts from {compiled} files into {bundle}")
+    else:
+        console.print(f"[green]✓[/green] Compiled {compiled} files")
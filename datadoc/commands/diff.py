@@ -0,0 +1,82 @@
+"""Compare two versions of data contracts for backward compatibility."""
+
+import json
+import sys
+from pathlib import Path
+
+import typer
+from rich.console import Console
+from rich.markup import escape
+
+from datadoc.diff import ContractDiff, diff_paths
+
+console = Console()
+
+
+def _show(diff: ContractDiff) -> None:
+    """Print the changes of one contract, breaking ones first."""
+    label = diff.new_file or diff.old_file
+    version = ""
+    if diff.old_version != diff.new_version:
+        version = f" ({diff.old_version} → {diff.new_version})"
+    status = "[red]breaking[/red]" if diff.breaking else "[green]compatible[/green]"
+    console.print(f"\n[bold]{escape(str(diff.id))}[/bold] {escape(str(label))}{escape(version)}: {status}")
+    for change in sorted(diff.changes, key=lambda c: not c.breaking):
+        mark = "[red]✗[/red]" if change.breaking else "[green]✓[/green]"
+        detail = ""
+        if change.old is not None or change.new is not None:
+            detail = f": {change.old!r} → {change.new!r}"
+        console.print(f"  {mark} {change.kind} {escape(change.path)}{escape(detail)}", highlight=False)
+    if diff.needs_major_bump:
+        console.print("  [yellow]Breaking changes without a major version bump[/yellow]")
+
+
+def diff(
+    old: Path = typer.Argument(..., exists=True, help="The previous contract file or directory"),
+    new: Path = typer.Argument(..., exists=True, help="The new contract file or directory"),
+    output_format: str = typer.Option("text", "--format", "-f", help="Output format: text or jsonl"),
+) -> None:
+    """
+    Report schema changes between two contract versions as breaking or not.
+
+    Schema objects and properties are matched by name, then by physicalName
+    to detect renames. Dropped or renamed properties, properties becoming
+    required, narrowed types and primary key changes are breaking. Two
+    directories are compared contract by contract, matched by id. Exits with
+    1 if any change is breaking.
+    """
+    if output_format not in ("text", "jsonl"):
+        raise typer.BadParameter(f"Unknown format '{output_format}', expected one of: text, jsonl")
+    try:
+        diffs = diff_paths(old, new)
+    except ValueError as e:
+        raise typer.BadParameter(str(e))
+
+    breaking = sum(diff.breaking for diff in diffs)
+    if output_format == "jsonl":
+        for diff in diffs:
+            for change in diff.changes:
+                record = {
+                    "id": diff.id,
+                    "old_file": diff.old_file,
+                    "new_file": diff.new_file,
+                    "old_version": diff.old_version,
+                    "new_version": diff.new_version,
+                    "kind": change.kind,
+                    "path": change.path,
+                    "breaking": change.breaking,
+                    "old": change.old,
+                    "new": change.new,
+                }
+                sys.stdout.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+        raise typer.Exit(1 if breaking else 0)
+
+    if not diffs:
+        console.print("[green]✓[/green] No changes")
+        return
+    for diff in diffs:
+        _show(diff)
+    changes = sum(len(diff.changes) for diff in diffs)
+    console.print(f"\n{changes} changes in {len(diffs)} contracts, {breaking} with breaking changes")
+    if breaking:
+        raise typer.Exit(1)
@@ -1,95 +1,312 @@
-"""Extract schema from YAML files using Spark."""
+"""Extract schema from data files using footer metadata or Spark."""
 
 from pathlib import Path
 from typing import Any, Optional  # noqa: UP
 
 import typer
 import yaml
-from pyspark.sql import SparkSession
 from rich.console import Console
 from rich.table import Table
 
-from datadoc.models.odcs import LogicalType1
+from datadoc import snapshot, yaml_io
+from datadoc.cache import ExtractionCache
+from datadoc.daemon import extract_remote
+from datadoc.extraction.drift import Drift, compare_contract
+
+# Extraction lives in `datadoc.extraction.engine`; its public names are re-exported for existing imports.
+from datadoc.extraction.engine import (  # noqa: F401
+    DEFAULT_SCHEMA_NAME,
+    ENGINES,
+    DatasetSpec,
+    ExtractionResult,
+    check_engine,
+    ddl_schema,
+    detect_schema,
+    detect_schema_native,
+    detect_schema_sampled,
+    extract_datasets,
+    extract_incremental,
+    extract_schema,
+    map_spark_to_logical_type,
+    profile_dataset,
+    schema_from_fields,
+)
+from datadoc.extraction.sampling import SAMPLED_FORMATS, SamplingConfig
+from datadoc.spark import SharedSparkSession
+from datadoc.timing import span, traced
 
 console = Console()
 
+MAX_DEFAULT_PARALLELISM = 8
+# Inference budget for CSV and JSON datasets without a `sampling` section when checking drift.
+DRIFT_SAMPLING = SamplingConfig(max_rows=10_000)
+CACHE_NOTES = {"hit": " (unchanged, from cache)", "incremental": " (changed files merged into the cached schema)"}
+
 
 def read_config(config_path: str) -> dict[str, Any]:
     """Read and parse the YAML configuration file."""
     try:
-        with open(config_path) as f:
-            return yaml.safe_load(f)
+        with span("config.read"), open(config_path) as f:
+            return yaml_io.load(f)
     except Exception as e:
         raise typer.BadParameter(f"Error reading configuration file: {str(e)}")
 
 
-def detect_schema(spark: SparkSession, data_path: str, format: str) -> dict:
-    """Detect schema from data file using Spark and return a dict in ODCS shape."""
-    df = spark.read.format(format).load(data_path)
-    spark_schema = df.schema
-    properties = []
-    for field in spark_schema.fields:
-        properties.append(
-            {
-                "name": field.name,
-                "logicalType": str(map_spark_to_logical_type(field.dataType.typeName())),
-                "physicalType": str(field.dataType),
-                "required": not field.nullable,
-            }
+def dataset_specs(config: dict[str, Any]) -> list[DatasetSpec]:
+    """Read the datasets to extract from a configuration.
+
+    A configuration either lists `datasets`, each with its own `data_path`, `format`, `options`,
+    `engine` and `sampling`, or describes a single dataset with top-level `data_path` and `format`.
+    Top-level `format`, `options` and `sampling` act as defaults for listed datasets.
+    """
+    default_format = config.get("format", "csv")
+    default_options = config.get("options") or {}
+    default_sampling = _sampling_config(config.get("sampling"), "sampling")
+    if "datasets" not in config:
+        data_path = config.get("data_path")
+        if not data_path:
+            raise typer.BadParameter("data_path is required in configuration")
+        return [
+            DatasetSpec(DEFAULT_SCHEMA_NAME, data_path, default_format, dict(default_options), None, default_sampling)
+        ]
+
+    datasets = config["datasets"]
+    if not isinstance(datasets, list) or not datasets:
+        raise typer.BadParameter("datasets must be a non-empty list")
+    specs = []
+    for index, entry in enumerate(datasets):
+        if not isinstance(entry, dict) or not entry.get("data_path"):
+            raise typer.BadParameter(f"datasets[{index}].data_path is required in configuration")
+        data_path = entry["data_path"]
+        specs.append(
+            DatasetSpec(
+                name=entry.get("name") or Path(data_path.rstrip("/")).stem,
+                data_path=data_path,
+                format=entry.get("format", default_format),
+                options={**default_options, **(entry.get("options") or {})},
+                engine=entry.get("engine"),
+                sampling=_sampling_config(entry["sampling"], f"datasets[{index}].sampling")
+                if "sampling" in entry
+                else default_sampling,
+            )
         )
-    schema = {"name": "extracted_schema", "logicalType": "object", "properties": properties}
-    return schema
-
-
-def map_spark_to_logical_type(spark_type: str) -> LogicalType1:
-    """Map Spark data type to ODCS logical type."""
-    type_mapping = {
-        "string": LogicalType1.string,
-        "integer": LogicalType1.integer,
-        "long": LogicalType1.integer,
-        "double": LogicalType1.number,
-        "float": LogicalType1.number,
-        "boolean": LogicalType1.boolean,
-        "date": LogicalType1.date,
-        "timestamp": LogicalType1.date,
-        "array": LogicalType1.array,
-        "struct": LogicalType1.object,
-        "map": LogicalType1.object,
-    }
-    return type_mapping.get(spark_type.lower(), LogicalType1.string)
+    names = [spec.name for spec in specs]
+    duplicates = sorted({name for name in names if names.count(name) > 1})
+    if duplicates:
+        raise typer.BadParameter(f"Dataset names must be unique, found duplicates: {', '.join(duplicates)}")
+    return specs
+
+
+def _sampling_config(raw: Any, where: str) -> SamplingConfig | None:
+    """Parse a `sampling` section, reporting problems as configuration errors."""
+    if raw is not None and not isinstance(raw, dict):
+        raise typer.BadParameter(f"{where} must be a mapping")
+    try:
+        return SamplingConfig.from_config(raw)
+    except ValueError as e:
+        raise typer.BadParameter(f"{where}: {e}")
+
+
+class _NoAliasDumper(yaml.Dumper):
+    """Write shared (interned) sub-schemas out in full instead of as YAML aliases."""
+
+    def ignore_aliases(self, data: Any) -> bool:
+        return True
+
+
+def _write_yaml(path: Path, content: Any) -> None:
+    """Dump `content` to `path`, creating parent directories."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with span("write.yaml"), open(path, "w") as f:
+        yaml.dump(content, f, Dumper=_NoAliasDumper, sort_keys=False)
+
+
+@traced("render")
+def _print_schema_table(schema: dict, title: str) -> None:
+    """Render the properties of an extracted schema."""
+    table = Table(title=title)
+    table.add_column("Name", style="cyan")
+    table.add_column("Type", style="magenta")
+    table.add_column("Required", style="green")
+    for prop in schema["properties"]:
+        table.add_row(prop["name"], prop["logicalType"], str(prop["required"]))
+    console.print(table)
+
+
+@traced("render")
+def _print_drift(drift: Drift) -> None:
+    """Render the differences between a dataset and its schema object."""
+    if not drift.drifted:
+        console.print(f"[green]✓[/green] {drift.dataset} matches schema object '{drift.object_name}'")
+        return
+    table = Table(title=f"Schema Drift: {drift.dataset} vs '{drift.object_name}'")
+    table.add_column("Column", style="cyan")
+    table.add_column("Change")
+    table.add_column("Contract", style="magenta")
+    table.add_column("Data", style="magenta")
+    for path in drift.added:
+        table.add_row(path, "[yellow]added[/yellow]", "", "")
+    for path in drift.missing:
+        table.add_row(path, "[red]missing[/red]", "", "")
+    for path, declared, live in drift.type_changed:
+        table.add_row(path, "[red]type changed[/red]", str(declared), str(live))
+    console.print(table)
+
+
+def check_drift(against: Path, results: list[ExtractionResult], merged_output: Path | None) -> bool:
+    """Compare extracted schemas with a contract, optionally writing the merged contract.
+
+    Returns True if any dataset drifted or has no schema object in the contract.
+    """
+    compiled = snapshot.documents(against)
+    contract = compiled[0] if compiled else read_config(str(against))
+    if not isinstance(contract, dict):
+        raise typer.BadParameter(f"{against} is not a data contract")
+    extracted = [(r.spec.name, r.schema) for r in results if r.schema is not None]
+    drifts, unmatched, merged = compare_contract(contract, extracted)
+    for drift in drifts:
+        _print_drift(drift)
+    for name in unmatched:
+        console.print(f"[red]✗[/red] {name} has no schema object in {against}")
+    if merged_output is not None:
+        _write_yaml(merged_output, merged)
+        console.print(f"Merged contract saved to {merged_output}")
+    return bool(unmatched) or any(drift.drifted for drift in drifts)
 
 
 def extract(
     config_path: str = typer.Argument(..., help="Path to the YAML configuration file"),
     output: Optional[str] = typer.Option(None, "--output", "-o", help="Path to save the extracted schema"),  # noqa: UP
+    engine: Optional[str] = typer.Option(  # noqa: UP
+        None,
+        "--engine",
+        "-e",
+        help="Extraction engine: auto, native (file footers via pyarrow) or spark (default: config or auto)",
+    ),
+    parallelism: Optional[int] = typer.Option(  # noqa: UP
+        None,
+        "--parallelism",
+        "-p",
+        min=1,
+        help="Number of datasets to extract concurrently (default: config or up to 8)",
+    ),
+    split: bool = typer.Option(
+        False,
+        "--split",
+        help="Treat --output as a directory and write one <name>.yaml per dataset",
+    ),
+    profile_data: bool = typer.Option(
+        False,
+        "--profile-data",
+        help="Scan the data once with Spark to fill required/unique flags and quality rules",
+    ),
+    no_cache: bool = typer.Option(False, "--no-cache", help="Extract every dataset from scratch"),
+    cache_dir: Optional[Path] = typer.Option(  # noqa: UP
+        None, "--cache-dir", help="Extraction cache directory (default: $DATADOC_CACHE_DIR or ~/.cache/datadoc)"
+    ),
+    against: Optional[Path] = typer.Option(  # noqa: UP
+        None,
+        "--against",
+        help="Report drift between the data and the matching schema objects of this contract",
+        exists=True,
+        dir_okay=False,
+    ),
+    merged_output: Optional[Path] = typer.Option(  # noqa: UP
+        None, "--merged-output", help="With --against, write the contract updated with the live schemas here"
+    ),
+    no_daemon: bool = typer.Option(
+        False, "--no-daemon", help="Extract in this process even if a `datadoc serve` daemon is running"
+    ),
 ) -> None:
-    """Extract schema from data files using Spark."""
-    spark = None
+    """Extract schema from data files, reading file footers when possible and Spark otherwise.
+
+    The configuration may list several datasets; they are extracted concurrently in one shared
+    SparkSession and written as a single ODCS `schema:` list, or one file per dataset with --split.
+    Local datasets are fingerprinted so unchanged ones come from the cache and only changed
+    files are read again.
+
+    With --against, each dataset is compared with the schema object of the same name (or the
+    only one) in a contract, reporting added, missing and type-changed columns; the command
+    exits with 1 on drift. CSV and JSON datasets without a sampling section are inferred from
+    a bounded sample in this mode.
+
+    When a `datadoc serve` daemon is running, the datasets are extracted there, with its
+    SparkSession and cache.
+    """
+    spark = SharedSparkSession()
+    cache = None
     try:
         config = read_config(config_path)
-        data_path = config.get("data_path")
-        format = config.get("format", "csv")
-        if not data_path:
-            raise typer.BadParameter("data_path is required in configuration")
-        console.print(f"Processing data from {data_path}...")
-        spark = SparkSession.builder.appName("SchemaExtractor").getOrCreate()
-        schema = detect_schema(spark, data_path, format)
-        if output:
+        specs = dataset_specs(config)
+        multi = "datasets" in config
+        if split and not output:
+            raise typer.BadParameter("--split requires --output")
+        if merged_output and not against:
+            raise typer.BadParameter("--merged-output requires --against")
+        if against:
+            for spec in specs:
+                if spec.sampling is None and spec.format.lower() in SAMPLED_FORMATS:
+                    spec.sampling = DRIFT_SAMPLING
+        engine = engine or config.get("engine", "auto")
+        for name in {engine, *(spec.engine for spec in specs if spec.engine)}:
+            try:
+                check_engine(name)
+            except ValueError as e:
+                raise typer.BadParameter(str(e))
+        workers = parallelism or config.get("parallelism") or min(len(specs), MAX_DEFAULT_PARALLELISM)
+        if multi:
+            console.print(f"Processing {len(specs)} datasets...")
+        else:
+            console.print(f"Processing data from {specs[0].data_path}...")
+
+        remote = None
+        # The daemon owns the default cache; an explicit --cache-dir is honoured locally.
+        if not no_daemon and cache_dir is None:
+            with span("daemon.request"):
+                remote = extract_remote(specs, engine, workers, profile_data, cache=not no_cache)
+        if remote is not None:
+            results = remote
+        else:
+            cache = None if no_cache else ExtractionCache(cache_dir)
+            results = list(extract_datasets(specs, engine, spark, workers, profile=profile_data, cache=cache))
+        extracted = [r for r in results if r.schema is not None]
+        for result in results:
+            if result.fallback is not None:
+                console.print(f"[yellow]{result.spec.name + ': ' if multi else ''}{result.fallback}")
+            if result.sampling is not None:
+                console.print(f"Sampled {result.spec.name}: {result.sampling.describe()}")
+        failed = [r for r in results if r.error is not None]
+        for result in failed:
+            prefix = f"{result.spec.name}: " if multi else ""
+            console.print(f"[red]Error: {prefix}{result.error}")
+
+        if output and extracted:
             output_path = Path(output)
-            output_path.parent.mkdir(parents=True, exist_ok=True)
-            with open(output_path, "w") as f:
-                yaml.dump(schema, f, sort_keys=False)
-            console.print(f"Schema saved to {output_path}")
-        table = Table(title="Extracted Schema")
-        table.add_column("Name", style="cyan")
-        table.add_column("Type", style="magenta")
-        table.add_column("Required", style="green")
-        for prop in schema["properties"]:
-            table.add_row(prop["name"], prop["logicalType"], str(prop["required"]))
-        console.print(table)
+            if split:
+                for result in extracted:
+                    _write_yaml(output_path / f"{result.spec.name}.yaml", result.schema)
+                console.print(f"{len(extracted)} schemas saved to {output_path}")
+            else:
+                _write_yaml(output_path, {"schema": [r.schema for r in extracted]} if multi else extracted[0].schema)
+                console.print(f"Schema saved to {output_path}")
+
+        if against:
+            drifted = check_drift(against, extracted, merged_output)
+            if failed or drifted:
+                raise typer.Exit(1)
+            return
+        for result in extracted:
+            assert result.schema is not None
+            console.print(f"Schema read with the {result.engine} engine{CACHE_NOTES.get(result.cache or '', '')}")
+            _print_schema_table(result.schema, f"Extracted Schema: {result.spec.name}" if multi else "Extracted Schema")
+        if failed:
+            raise typer.Exit(1)
+    except typer.Exit:
+        raise
     except Exception as e:
         console.print(f"[red]Error: {str(e)}")
         raise typer.Exit(1)
     finally:
-        if spark:
-            spark.stop()
+        if cache is not None:
+            cache.close()
+        spark.stop()
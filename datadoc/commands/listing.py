@@ -0,0 +1,80 @@
+"""List contract headers without validating whole contracts."""
+
+import json
+import sys
+from typing import Any
+
+import typer
+from rich.console import Console
+from rich.table import Table
+
+from datadoc.validation import collect_contract_files
+
+console = Console()
+
+
+def list_contracts(
+    files: list[str] = typer.Argument(..., help="Contract files, directories or glob patterns to list"),
+    output_format: str = typer.Option("text", "--format", "-f", help="Output format: text or jsonl"),
+) -> None:
+    """
+    List the id, name, version, status, domain and tags of contracts.
+
+    Only the header of each contract is parsed and validated, so listing
+    stays fast however large the schemas are; use `datadoc validate` to
+    check whole contracts. Exits with 1 if any header is invalid.
+    """
+    from datadoc.contracts import read_headers
+
+    if output_format not in ("text", "jsonl"):
+        raise typer.BadParameter(f"Unknown format '{output_format}', expected one of: text, jsonl")
+    try:
+        paths = collect_contract_files(files)
+    except FileNotFoundError as e:
+        raise typer.BadParameter(str(e))
+
+    failed = 0
+    if output_format == "jsonl":
+        for path in paths:
+            for result in read_headers(str(path)):
+                failed += not result.valid
+                record: dict[str, Any] = {"file": result.path, "document": result.document, "valid": result.valid}
+                record.update(result.contract or {})
+                if not result.valid:
+                    record["error_type"] = result.error_type
+                    record["errors"] = result.errors or [{"loc": [], "msg": result.message, "type": result.error_type}]
+                sys.stdout.write(json.dumps(record, ensure_ascii=False) + "\n")
+        raise typer.Exit(1 if failed else 0)
+
+    table = Table()
+    for column in ("File", "ID", "Name", "Version", "Status", "Domain", "Tags"):
+        table.add_column(column)
+    for path in paths:
+        for result in read_headers(str(path)):
+            header = result.contract or {}
+            if not result.valid:
+                failed += 1
+                reason = str(result.message)
+                if result.errors:
+                    loc = ".".join(str(key) for key in result.errors[0]["loc"])
+                    reason = f"{loc}: {result.errors[0]['msg']}" if loc else result.errors[0]["msg"]
+                table.add_row(result.label, _text(header.get("id")), f"[red]✗ {reason}[/red]")
+                continue
+            table.add_row(
+                result.label,
+                header.get("id"),
+                header.get("name"),
+                header.get("version"),
+                header.get("status"),
+                header.get("domain"),
+                ", ".join(header.get("tags") or []),
+            )
+    table.title = f"{table.row_count} contracts"
+    console.print(table)
+    if failed:
+        console.print(f"[red]{failed} contracts have an invalid header[/red]")
+        raise typer.Exit(1)
+
+
+def _text(value: object) -> str | None:
+    return None if value is None else str(value)
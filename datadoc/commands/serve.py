@@ -0,0 +1,67 @@
+"""Run the validation daemon."""
+
+from pathlib import Path
+from typing import Optional
+
+import typer
+from rich.console import Console
+
+from datadoc.daemon import DaemonError, default_socket_path, request, start_server
+
+console = Console()
+
+
+def serve(
+    socket_path: Optional[Path] = typer.Option(
+        None,
+        "--socket",
+        help="Unix socket to listen on (default: $DATADOC_SOCKET or daemon.sock in the cache directory)",
+        dir_okay=False,
+    ),
+    cache_dir: Optional[Path] = typer.Option(
+        None,
+        "--cache-dir",
+        help="Directory for the validation and extraction caches (default: $DATADOC_CACHE_DIR or ~/.cache/datadoc)",
+        file_okay=False,
+        dir_okay=True,
+    ),
+    stop: bool = typer.Option(False, "--stop", help="Stop the daemon listening on the socket"),
+    status: bool = typer.Option(False, "--status", help="Report whether a daemon is listening on the socket"),
+) -> None:
+    """
+    Keep models and caches warm in a long-lived process for fast validation.
+
+    While the daemon runs, `datadoc validate` and `datadoc extract` send their
+    work over the socket instead of loading models and Spark themselves. Editor integrations can speak the
+    same line-delimited JSON protocol directly.
+    """
+    socket_path = socket_path or default_socket_path()
+    if stop or status:
+        try:
+            running = request({"op": "shutdown" if stop else "ping"}, socket_path)
+        except (OSError, ValueError, DaemonError) as e:
+            console.print(f"[red]Error: {e}")
+            raise typer.Exit(1)
+        if running is None:
+            console.print(f"No daemon is listening on {socket_path}")
+            raise typer.Exit(1)
+        if stop:
+            console.print(f"[green]✓[/green] Stopped the daemon on {socket_path}")
+        else:
+            console.print(
+                f"Daemon {running['version']} (pid {running['pid']}) on {socket_path}: "
+                f"up {running['uptime']:.0f}s, {running['requests']} requests"
+            )
+        return
+
+    try:
+        server = start_server(socket_path, cache_dir)
+    except DaemonError as e:
+        console.print(f"[red]Error: {e}")
+        raise typer.Exit(1)
+    server.warm()
+    console.print(f"[green]✓[/green] Serving on {socket_path} (stop with `datadoc serve --stop` or Ctrl+C)")
+    try:
+        server.serve()
+    except KeyboardInterrupt:
+        pass
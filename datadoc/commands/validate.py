@@ -0,0 +1,270 @@
+"""Validate data contracts against the ODCS schema."""
+
+import glob
+import itertools
+import sys
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Optional
+
+import typer
+from rich.console import Console
+from rich.panel import Panel
+
+from datadoc.cache import ValidationCache
+from datadoc.daemon import validate_remote
+from datadoc.reporting import FORMATS, WRITERS, write_update_jsonl
+from datadoc.timing import span, traced
+from datadoc.validation import ENGINES, ValidationResult, collect_contract_files, validate_many
+from datadoc.watch import ContractSet, Update, watch_changes
+from datadoc.watch import is_available as watchfiles_available
+
+console = Console()
+
+
+@traced("render")
+def _print_contract_details(result: ValidationResult) -> None:
+    """Show the fields of a validated contract."""
+    contract = result.contract or {}
+    console.print("\n[bold]Contract Details:[/bold]")
+    console.print(f"Version: {contract.get('version')}")
+    console.print(f"ID: {contract.get('id')}")
+    console.print(f"Name: {contract.get('name')}")
+    console.print(f"Status: {contract.get('status')}")
+    if contract.get("description"):
+        console.print(f"Description: {contract['description']}")
+
+
+@traced("render")
+def _print_failure(result: ValidationResult, verbose: bool, title: str = "Validation Failed") -> None:
+    """Render a failed validation result."""
+    if result.error_type == "yaml":
+        body = f"[red]✗[/red] Invalid YAML format:\n{result.message}"
+    else:
+        body = f"[red]✗[/red] Invalid data contract:\n{result.message}"
+    console.print(Panel(body, title=title, border_style="red"))
+    if verbose and result.error_type == "contract":
+        from rich.syntax import Syntax
+
+        console.print("\n[bold]Detailed Error:[/bold]")
+        console.print(Syntax(str(result.message), "python", theme="monokai"))
+
+
+def validate(
+    files: list[str] = typer.Argument(
+        ...,
+        help="Contract files, directories or glob patterns to validate",
+    ),
+    verbose: bool = typer.Option(
+        False,
+        "--verbose",
+        "-v",
+        help="Show detailed validation errors",
+    ),
+    workers: Optional[int] = typer.Option(
+        None,
+        "--workers",
+        "-w",
+        min=1,
+        help="Number of worker processes (default: number of CPUs)",
+    ),
+    no_cache: bool = typer.Option(
+        False,
+        "--no-cache",
+        help="Re-validate every file instead of reusing cached results",
+    ),
+    cache_dir: Optional[Path] = typer.Option(
+        None,
+        "--cache-dir",
+        help="Directory for the validation cache (default: $DATADOC_CACHE_DIR or ~/.cache/datadoc)",
+        file_okay=False,
+        dir_okay=True,
+    ),
+    engine: str = typer.Option(
+        "pydantic",
+        "--engine",
+        "-e",
+        help="Validation engine: pydantic (generated models) or jsonschema (compiled ODCS JSON schema)",
+    ),
+    output_format: str = typer.Option(
+        "text",
+        "--format",
+        "-f",
+        help="Output format: text, jsonl (one JSON record per contract) or sarif",
+    ),
+    watch: bool = typer.Option(
+        False,
+        "--watch",
+        help="Keep running and revalidate contracts as their files change",
+    ),
+    no_daemon: bool = typer.Option(
+        False,
+        "--no-daemon",
+        help="Validate in this process even if a `datadoc serve` daemon is running",
+    ),
+) -> None:
+    """
+    Validate YAML files against the Open Data Contract Standard (ODCS) schema.
+
+    Accepts any mix of files, directories (searched recursively for .yaml/.yml)
+    and glob patterns. Results are cached by file content, so unchanged
+    contracts are not parsed again. When a `datadoc serve` daemon is running,
+    the contracts are validated there. With --format jsonl or sarif, one
+    structured record per contract is streamed to stdout as it completes.
+    With --watch, only changed files are revalidated and duplicate contract
+    ids across the watched set are reported as they appear. The command
+    exits non-zero if any contract is invalid.
+    """
+    if engine not in ENGINES:
+        raise typer.BadParameter(f"Unknown engine '{engine}', expected one of: {', '.join(ENGINES)}")
+    if output_format not in FORMATS:
+        raise typer.BadParameter(f"Unknown format '{output_format}', expected one of: {', '.join(FORMATS)}")
+    if watch:
+        if output_format == "sarif":
+            raise typer.BadParameter("--watch supports the text and jsonl formats")
+        if any(glob.has_magic(f) for f in files):
+            raise typer.BadParameter("--watch needs files or directories, not glob patterns")
+        if not watchfiles_available():
+            raise typer.BadParameter("--watch needs the watchfiles package: pip install datadoc[watch]")
+    try:
+        paths = collect_contract_files(files)
+    except FileNotFoundError as e:
+        raise typer.BadParameter(str(e))
+
+    if watch:
+        cache = None if no_cache else ValidationCache(cache_dir)
+        try:
+            _watch(paths, [Path(f) for f in files], verbose, workers, cache, engine, output_format)
+        finally:
+            if cache is not None:
+                cache.close()
+        return
+
+    # The daemon owns the default cache; an explicit --cache-dir is honoured locally.
+    if not no_daemon and cache_dir is None:
+        with span("daemon.request"):
+            remote = validate_remote(paths, engine, cache=not no_cache, workers=workers)
+        if remote is not None:
+            _emit(paths, verbose, iter(remote), output_format, engine)
+            return
+
+    cache = None if no_cache else ValidationCache(cache_dir)
+    try:
+        _emit(paths, verbose, validate_many(paths, workers=workers, cache=cache, engine=engine), output_format, engine)
+    finally:
+        if cache is not None:
+            cache.close()
+
+
+def _watch(
+    paths: list[Path],
+    roots: list[Path],
+    verbose: bool,
+    workers: Optional[int],
+    cache: Optional[ValidationCache],
+    engine: str,
+    output_format: str,
+) -> None:
+    """Validate `paths`, then revalidate whatever changes below `roots` until interrupted."""
+    contracts = ContractSet(engine, cache)
+    _show_update(contracts, contracts.update(paths, workers=workers), verbose, output_format, engine)
+    if output_format == "text":
+        console.print(f"Watching {', '.join(str(r) for r in roots)} for changes (Ctrl+C to stop)...")
+    try:
+        for changed, removed in watch_changes(roots):
+            _show_update(contracts, contracts.update(changed, removed), True, output_format, engine)
+    except KeyboardInterrupt:
+        pass
+
+
+def _show_update(contracts: ContractSet, update: Update, verbose: bool, output_format: str, engine: str) -> None:
+    """Report the contracts an update revalidated and the duplicate ids it found or resolved."""
+    if output_format == "jsonl":
+        write_update_jsonl(update, engine, sys.stdout)
+        return
+    for result in update.results:
+        if not result.valid:
+            _print_failure(result, False, title=result.label)
+        elif verbose:
+            console.print(f"[green]✓[/green] {result.label}")
+    for path in update.removed:
+        console.print(f"[yellow]-[/yellow] {path} removed")
+    for key, labels in update.duplicates.items():
+        console.print(f"[red]✗[/red] Duplicate contract id '{key}' in: {', '.join(labels)}")
+    for key in update.resolved:
+        console.print(f"[green]✓[/green] Contract id '{key}' is unique again")
+    console.print(
+        f"[dim]{len(contracts)} contracts, {contracts.invalid} invalid, {len(contracts.duplicated)} duplicate ids "
+        f"(checked {len(update.results)} in {update.elapsed_ms:.0f} ms)[/dim]"
+    )
+
+
+def _emit(
+    paths: list[Path], verbose: bool, results: Iterator[ValidationResult], output_format: str, engine: str
+) -> None:
+    """Write the results in the requested format and exit non-zero if any contract failed."""
+    if output_format == "text":
+        _report(paths, verbose, results)
+        return
+    if WRITERS[output_format](results, engine, sys.stdout):
+        raise typer.Exit(1)
+
+
+def _report(paths: list[Path], verbose: bool, results: Iterator[ValidationResult]) -> None:
+    """Print the per-file failures and a summary for the results of validating `paths`."""
+    if len(paths) == 1:
+        result = next(results)
+        following = next(results, None)
+        if following is not None:
+            # A multi-document bundle is reported like a set of files.
+            _report_many(itertools.chain([result, following], results), verbose)
+            return
+        if not result.valid:
+            _print_failure(result, verbose)
+            raise typer.Exit(1)
+        with span("render"):
+            console.print(
+                Panel(
+                    "[green]✓[/green] YAML file is a valid ODCS data contract",
+                    title="Validation Successful",
+                    border_style="green",
+                )
+            )
+        if verbose:
+            _print_contract_details(result)
+        return
+    _report_many(results, verbose)
+
+
+def _report_many(results: Iterator[ValidationResult], verbose: bool) -> None:
+    """Print failures as they arrive, then a summary over all contracts."""
+    failed = 0
+    total = 0
+    for result in results:
+        total += 1
+        if not result.valid:
+            failed += 1
+            _print_failure(result, verbose, title=result.label)
+        elif verbose:
+            with span("render"):
+                console.print(f"[green]✓[/green] {result.label}")
+
+    with span("render"):
+        if failed:
+            console.print(
+                Panel(
+                    f"[red]✗[/red] {failed} of {total} contracts failed validation",
+                    title="Validation Failed",
+                    border_style="red",
+                )
+            )
+        else:
+            console.print(
+                Panel(
+                    f"[green]✓[/green] All {total} contracts are valid ODCS data contracts",
+                    title="Validation Successful",
+                    border_style="green",
+                )
+            )
+    if failed:
+        raise typer.Exit(1)
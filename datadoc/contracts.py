@@ -0,0 +1,276 @@
+"""Header-first contract loading.
+
+Listing or searching contracts usually needs a handful of header fields, while most of the
+bytes of a contract sit in its `schema`, `servers` or SLA sections. `load_documents` splits a
+block-style YAML stream at its top-level keys without parsing it, and each section is parsed
+the first time it is read. `LazyContract` validates the header of such a document eagerly and
+every other section against its ODCS model on first access.
+
+Streams the splitter cannot follow (flow style, directives, explicit keys, ...) are parsed in
+full, so the result is always the same mapping `yaml_io.load_all` would produce.
+"""
+
+import functools
+import re
+import time
+from collections.abc import Iterator, Mapping
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import yaml
+
+from datadoc import snapshot, yaml_io
+from datadoc.validation import ValidationResult
+
+if TYPE_CHECKING:
+    from pydantic import BaseModel
+
+    from datadoc.models import OpenDataContractStandardODCS
+
+# Top-level keys validated when a contract is loaded; every other ODCS section is deferred.
+HEADER_KEYS = (
+    "apiVersion",
+    "kind",
+    "id",
+    "name",
+    "version",
+    "status",
+    "domain",
+    "tenant",
+    "dataProduct",
+    "tags",
+    "contractCreatedTs",
+)
+SECTION_KEYS = (
+    "description",
+    "servers",
+    "schema",
+    "support",
+    "price",
+    "team",
+    "roles",
+    "slaDefaultElement",
+    "slaProperties",
+    "authoritativeDefinitions",
+    "customProperties",
+)
+
+# Lines starting in column 0 that are not comments; block sequences may sit there too.
+_TOP_LEVEL = re.compile(rb"^[^ \t\r\n#].*$", re.MULTILINE)
+_KEY = re.compile(rb"""(?:"([^"\\]*)"|'([^']*)'|([^\s#'"?:\[\]{},&*!|>%@`-][^:#]*?))[ \t]*:(?:[ \t]|$)""")
+_MARKER = re.compile(rb"---[ \t]*(?:#.*)?$")
+
+
+class RawContract(Mapping[str, Any]):
+    """The top-level mapping of one YAML document, parsing each key's value on first access."""
+
+    def __init__(self, data: bytes, sections: dict[str, tuple[int, int]], span: tuple[int, int]) -> None:
+        self._data = data
+        self._sections = sections
+        self._span = span
+        self._values: dict[str, Any] = {}
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self._values:
+            if key not in self._sections:
+                raise KeyError(key)
+            self.load([key])
+        return self._values[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._sections)
+
+    def __len__(self) -> int:
+        return len(self._sections)
+
+    def load(self, keys: list[str]) -> None:
+        """Parse the values of several keys at once."""
+        keys = [key for key in keys if key in self._sections and key not in self._values]
+        if not keys:
+            return
+        text = b"\n".join(self._data[slice(*self._sections[key])] for key in keys)
+        try:
+            self._values.update(yaml_io.load(text))
+        except yaml.YAMLError:
+            # An alias to an anchor in another section only resolves in the whole document.
+            self._values = yaml_io.load(self._data[slice(*self._span)])
+
+    def to_dict(self) -> dict[str, Any]:
+        """Parse every section and return a plain dictionary."""
+        self.load(list(self._sections))
+        return {key: self._values[key] for key in self._sections}
+
+
+def load_documents(data: bytes) -> Iterator[Any]:
+    """Yield the documents of a YAML stream, as `RawContract`s when its layout allows it."""
+    split = _split(data)
+    if split is None:
+        yield from yaml_io.load_all(data)
+        return
+    for sections, span in split:
+        yield RawContract(data, sections, span)
+
+
+def _split(data: bytes) -> list[tuple[dict[str, tuple[int, int]], tuple[int, int]]] | None:
+    """Find the byte range of every top-level key of every document, or None if that isn't safe."""
+    documents: list[tuple[dict[str, tuple[int, int]], tuple[int, int]]] = []
+    sections: dict[str, tuple[int, int]] = {}
+    key: str | None = None
+    start = begin = 0
+    markers = 0
+    for match in _TOP_LEVEL.finditer(data):
+        line = match.group()
+        if line.startswith(b"- ") or line.rstrip() == b"-":
+            # A block sequence may be indented like the key it belongs to.
+            if key is None:
+                return None
+            continue
+        if key is not None:
+            sections[key] = (start, match.start())
+            key = None
+        if line.startswith(b"---"):
+            if not _MARKER.match(line):
+                return None
+            if markers and not sections:
+                return None
+            if sections:
+                documents.append((sections, (begin, match.start())))
+            sections = {}
+            markers += 1
+            begin = match.end()
+            continue
+        found = _KEY.match(line)
+        if found is None:
+            return None
+        raw = next(group for group in found.groups() if group is not None)
+        key, start = raw.decode("utf-8").strip(), match.start()
+        sections.pop(key, None)
+    if key is not None:
+        sections[key] = (start, len(data))
+    if sections:
+        documents.append((sections, (begin, len(data))))
+    elif markers:
+        return None
+    return documents
+
+
+@functools.cache
+def _model_fields() -> dict[str, tuple[str, Any]]:
+    """Map the top-level keys of a contract to their ODCS field names and definitions."""
+    from datadoc.models import OpenDataContractStandardODCS
+
+    return {field.alias or name: (name, field) for name, field in OpenDataContractStandardODCS.model_fields.items()}
+
+
+@functools.cache
+def header_model() -> "type[BaseModel]":
+    """Return a model of the contract header, rejecting unknown top-level keys like the full model."""
+    from pydantic import ConfigDict, create_model
+
+    fields = _model_fields()
+    definitions: dict[str, Any] = {fields[key][0]: (fields[key][1].annotation, fields[key][1]) for key in HEADER_KEYS}
+    return create_model("ContractHeader", __config__=ConfigDict(extra="forbid"), **definitions)
+
+
+@functools.cache
+def section_model(key: str) -> "type[BaseModel]":
+    """Return a model holding one deferred section, so its errors are located like the full model's."""
+    from pydantic import create_model
+
+    name, field = _model_fields()[key]
+    definitions: dict[str, Any] = {name: (field.annotation, field)}
+    return create_model(f"ContractSection_{name}", **definitions)
+
+
+class LazyContract:
+    """An ODCS contract whose header is validated on load and whose other sections on first access.
+
+    Header fields and sections are read as attributes, using the ODCS model's field names:
+    `contract.id`, `contract.schema_`. Raises `pydantic.ValidationError` for an invalid header,
+    or when an invalid section is first read.
+    """
+
+    def __init__(self, data: Any) -> None:
+        if not isinstance(data, Mapping):
+            header_model().model_validate(data)
+        keys = [key for key in data if key not in SECTION_KEYS]
+        if isinstance(data, RawContract):
+            data.load(keys)
+        self.header = header_model().model_validate({key: data[key] for key in keys})
+        self._data = data
+        self._sections: dict[str, Any] = {}
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("_") or name == "header":
+            raise AttributeError(name)
+        key = "schema" if name == "schema_" else name
+        if key in SECTION_KEYS:
+            return self.section(key)
+        return getattr(self.header, name)
+
+    def raw(self, key: str) -> Any:
+        """Return the unvalidated value of a top-level key, or None if it is absent."""
+        return self._data.get(key)
+
+    def section(self, key: str) -> Any:
+        """Validate a deferred section on first access and return its model value."""
+        if key not in self._sections:
+            name = _model_fields()[key][0]
+            model = section_model(key)
+            values = {key: self._data[key]} if key in self._data else {}
+            self._sections[key] = getattr(model.model_validate(values), name)
+        return self._sections[key]
+
+    def to_model(self) -> "OpenDataContractStandardODCS":
+        """Validate the whole contract and return the full ODCS model."""
+        from datadoc.models import OpenDataContractStandardODCS
+
+        data = self._data.to_dict() if isinstance(self._data, RawContract) else dict(self._data)
+        return OpenDataContractStandardODCS.model_validate(data)
+
+
+def read_headers(path: str) -> list[ValidationResult]:
+    """Load every document of a contract file, validating only its header.
+
+    A valid result's `contract` holds the header fields that are set. Deferred sections are
+    neither validated nor, when the file's layout allows it, parsed.
+    """
+    from pydantic import ValidationError
+
+    try:
+        data = Path(path).read_bytes()
+    except OSError as e:
+        return [ValidationResult(path=path, valid=False, error_type="io", message=str(e))]
+    results: list[ValidationResult] = []
+    try:
+        compiled = snapshot.documents(path, data)
+        for number, document in enumerate(load_documents(data) if compiled is None else compiled, start=1):
+            start = time.perf_counter()
+            try:
+                header = LazyContract(document).header
+            except ValidationError as e:
+                errors = [
+                    {"loc": list(err["loc"]), "msg": err["msg"], "type": err["type"]}
+                    for err in e.errors(include_url=False)
+                ]
+                result = ValidationResult(path=path, valid=False, error_type="contract", message=str(e), errors=errors)
+                if isinstance(document, Mapping):
+                    result.contract = {key: _scalar(document.get(key)) for key in ("id", "name", "version", "status")}
+            else:
+                result = ValidationResult(
+                    path=path, valid=True, contract=header.model_dump(mode="json", by_alias=True, exclude_none=True)
+                )
+            result.document = number
+            result.duration_ms = (time.perf_counter() - start) * 1000
+            results.append(result)
+    except yaml.YAMLError as e:
+        results.append(
+            ValidationResult(path=path, valid=False, error_type="yaml", message=str(e), document=len(results) + 1)
+        )
+    if len(results) == 1:
+        results[0].document = None
+    return results
+
+
+def _scalar(value: Any) -> Any:
+    return None if isinstance(value, Mapping | list) else value
@@ -0,0 +1,263 @@
+"""A long-lived validation process and the client the CLI uses to reach it.
+
+`datadoc serve` keeps the ODCS models, the compiled JSON schema, pyarrow, the result caches
+and, once a dataset needs it, a SparkSession loaded in one process and answers requests on a
+Unix socket. The protocol is one JSON object per line in each direction:
+
+    {"op": "ping"}
+    {"op": "validate", "paths": ["/abs/contract.yaml"], "engine": "pydantic", "cache": true}
+    {"op": "extract", "datasets": [{"name": "orders", "data_path": "/abs/orders", ...}], "engine": "auto"}
+    {"op": "shutdown"}
+
+Every response carries `ok` and the daemon's `version`; failed requests carry `error`. Each
+connection is served on its own thread, so a long request does not hold up other clients. The
+client side only imports the standard library, so trying the daemon costs nothing when none
+is running.
+"""
+
+import json
+import os
+import socket
+import socketserver
+import threading
+import time
+from dataclasses import asdict
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from datadoc import __version__
+from datadoc.cache import default_cache_dir
+from datadoc.spark import SharedSparkSession
+from datadoc.validation import ValidationResult
+
+if TYPE_CHECKING:
+    from datadoc.extraction.engine import DatasetSpec, ExtractionResult
+
+SOCKET_NAME = "daemon.sock"
+CONNECT_TIMEOUT = 0.2
+REQUEST_TIMEOUT = 600.0
+# Batches up to this size are validated in the daemon itself; larger ones use a process pool.
+IN_PROCESS_LIMIT = 256
+
+
+class DaemonError(RuntimeError):
+    """The daemon answered, but could not handle the request."""
+
+
+def default_socket_path() -> Path:
+    """Return the daemon socket, honouring `DATADOC_SOCKET` and then the cache directory."""
+    env = os.environ.get("DATADOC_SOCKET")
+    return Path(env) if env else default_cache_dir() / SOCKET_NAME
+
+
+def request(message: dict[str, Any], socket_path: Path | None = None, timeout: float = REQUEST_TIMEOUT) -> dict | None:
+    """Send one request to the daemon and return its response, or None if no daemon is listening.
+
+    Raises `DaemonError` when the daemon rejects the request.
+    """
+    socket_path = socket_path or default_socket_path()
+    if not socket_path.exists():
+        return None
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.settimeout(CONNECT_TIMEOUT)
+        try:
+            sock.connect(str(socket_path))
+        except OSError:
+            return None
+        sock.settimeout(timeout)
+        sock.sendall(json.dumps(message).encode() + b"\n")
+        with sock.makefile("rb") as reader:
+            line = reader.readline()
+    finally:
+        sock.close()
+    if not line:
+        return None
+    response = json.loads(line)
+    if not response.get("ok"):
+        raise DaemonError(response.get("error") or "The daemon could not handle the request")
+    return response
+
+
+def validate_remote(
+    paths: list[Path], engine: str, cache: bool = True, workers: int | None = None, socket_path: Path | None = None
+) -> list[ValidationResult] | None:
+    """Validate contracts through a running daemon of the same version, or return None."""
+    given = {str(Path(p).absolute()): str(p) for p in paths}
+    message = {
+        "op": "validate",
+        "paths": list(given),
+        "engine": engine,
+        "cache": cache,
+        "workers": workers,
+    }
+    try:
+        response = request(message, socket_path)
+    except (OSError, ValueError, DaemonError):
+        return None
+    if response is None or response.get("version") != __version__:
+        return None
+    # Report the paths as the caller gave them, like a local run would.
+    return [ValidationResult(**{**result, "path": given[result["path"]]}) for result in response["results"]]
+
+
+def extract_remote(
+    specs: list["DatasetSpec"],
+    engine: str,
+    parallelism: int = 1,
+    profile: bool = False,
+    cache: bool = True,
+    socket_path: Path | None = None,
+) -> list["ExtractionResult"] | None:
+    """Extract datasets through a running daemon of the same version, or return None."""
+    from datadoc.extraction.engine import ExtractionResult
+    from datadoc.extraction.sampling import SamplingReport
+
+    datasets = []
+    for spec in specs:
+        dataset = asdict(spec)
+        if "://" not in spec.data_path:
+            dataset["data_path"] = str(Path(spec.data_path).absolute())
+        datasets.append(dataset)
+    message = {
+        "op": "extract",
+        "datasets": datasets,
+        "engine": engine,
+        "parallelism": parallelism,
+        "profile": profile,
+        "cache": cache,
+    }
+    try:
+        response = request(message, socket_path)
+    except (OSError, ValueError, DaemonError):
+        return None
+    if response is None or response.get("version") != __version__:
+        return None
+    # Keep the specs as the caller gave them, like a local run would.
+    return [
+        ExtractionResult(spec, **{**result, "sampling": result["sampling"] and SamplingReport(**result["sampling"])})
+        for spec, result in zip(specs, response["results"], strict=True)
+    ]
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    server: "DaemonServer"
+
+    def handle(self) -> None:
+        for line in self.rfile:
+            try:
+                response = self.server.dispatch(json.loads(line))
+                response["ok"] = True
+            except Exception as e:
+                response = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+            response["version"] = __version__
+            self.wfile.write(json.dumps(response).encode() + b"\n")
+            self.wfile.flush()
+
+
+class DaemonServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Answers daemon requests with warm models and open caches, each connection on its own thread."""
+
+    timeout = 0.5
+    daemon_threads = True
+
+    def __init__(self, socket_path: Path, cache_dir: Path | None = None) -> None:
+        self.socket_path = socket_path
+        self.cache_dir = cache_dir
+        self.started = time.time()
+        self.requests = 0
+        self.stopping = False
+        self._caches: dict[str, Any] = {}
+        self._lock = threading.Lock()
+        self.spark = SharedSparkSession("datadoc-daemon")
+        super().__init__(str(socket_path), _Handler)
+        os.chmod(socket_path, 0o600)
+
+    def warm(self) -> None:
+        """Load everything a first request would otherwise pay for."""
+        from datadoc.validation import _warm_worker
+
+        for engine in ("pydantic", "jsonschema"):
+            _warm_worker(engine)
+        from datadoc.extraction import native
+
+        native.is_available()
+
+    def cache(self, kind: str) -> Any:
+        """Return the open validation or extraction cache."""
+        with self._lock:
+            if kind not in self._caches:
+                from datadoc.cache import ExtractionCache, ValidationCache
+
+                self._caches[kind] = (ValidationCache if kind == "validation" else ExtractionCache)(self.cache_dir)
+            return self._caches[kind]
+
+    def dispatch(self, message: dict[str, Any]) -> dict[str, Any]:
+        """Handle one decoded request."""
+        with self._lock:
+            self.requests += 1
+        op = message.get("op")
+        if op == "ping":
+            return {"pid": os.getpid(), "uptime": time.time() - self.started, "requests": self.requests}
+        if op == "validate":
+            return {"results": self._validate(message)}
+        if op == "extract":
+            return {"results": self._extract(message)}
+        if op == "shutdown":
+            self.stopping = True
+            return {}
+        raise ValueError(f"Unknown operation '{op}'")
+
+    def _validate(self, message: dict[str, Any]) -> list[dict[str, Any]]:
+        from datadoc.validation import validate_many
+
+        paths = [Path(p) for p in message["paths"]]
+        workers = message.get("workers") or (1 if len(paths) <= IN_PROCESS_LIMIT else None)
+        cache = self.cache("validation") if message.get("cache", True) else None
+        return [asdict(r) for r in validate_many(paths, workers=workers, cache=cache, engine=message["engine"])]
+
+    def _extract(self, message: dict[str, Any]) -> list[dict[str, Any]]:
+        from datadoc.extraction.engine import DatasetSpec, check_engine, extract_datasets
+        from datadoc.extraction.sampling import SamplingConfig
+
+        check_engine(message["engine"])
+        specs = [
+            DatasetSpec(**{**dataset, "sampling": dataset.get("sampling") and SamplingConfig(**dataset["sampling"])})
+            for dataset in message["datasets"]
+        ]
+        cache = self.cache("extraction") if message.get("cache", True) else None
+        parallelism = message.get("parallelism") or 1
+        results = extract_datasets(
+            specs, message["engine"], self.spark, parallelism, message.get("profile", False), cache
+        )
+        return [{key: value for key, value in asdict(result).items() if key != "spec"} for result in results]
+
+    def serve(self) -> None:
+        """Handle requests until a `shutdown` request or an interrupt, then remove the socket."""
+        try:
+            while not self.stopping:
+                self.handle_request()
+        finally:
+            self.server_close()
+            for cache in self._caches.values():
+                cache.close()
+            self.spark.stop()
+            self.socket_path.unlink(missing_ok=True)
+
+
+def start_server(socket_path: Path | None = None, cache_dir: Path | None = None) -> DaemonServer:
+    """Bind the daemon socket, replacing a stale one left by a daemon that died.
+
+    Raises `DaemonError` if another daemon is already answering on the socket.
+    """
+    socket_path = socket_path or default_socket_path()
+    socket_path.parent.mkdir(parents=True, exist_ok=True)
+    if socket_path.exists():
+        try:
+            running = request({"op": "ping"}, socket_path, timeout=CONNECT_TIMEOUT)
+        except (OSError, ValueError, DaemonError):
+            running = None
+        if running is not None:
+            raise DaemonError(f"A daemon (pid {running['pid']}) is already serving {socket_path}")
+        socket_path.unlink()
+    return DaemonServer(socket_path, cache_dir)
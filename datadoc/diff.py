@@ -0,0 +1,333 @@
+"""Compatibility diffs between contract versions.
+
+Schema objects and properties are matched level by level through dictionaries keyed by `name`,
+falling back to `physicalName` to recognise renames, so a diff costs time linear in the size of
+both schemas. Each change is classified as breaking or not from the point of view of the
+contract's consumers: anything that can make existing data or queries invalid is breaking.
+"""
+
+import re
+from collections import deque
+from collections.abc import Iterable, Iterator, Mapping
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from datadoc import snapshot
+from datadoc.contracts import load_documents
+from datadoc.validation import expand_path
+
+# Type changes that keep every existing value representable.
+LOGICAL_WIDENINGS = {("integer", "number")}
+PHYSICAL_WIDENINGS = {
+    ("tinyint", "smallint"),
+    ("tinyint", "int"),
+    ("tinyint", "integer"),
+    ("tinyint", "bigint"),
+    ("smallint", "int"),
+    ("smallint", "integer"),
+    ("smallint", "bigint"),
+    ("int", "bigint"),
+    ("integer", "bigint"),
+    ("float", "double"),
+    ("real", "double precision"),
+}
+# logicalTypeOptions bounds, by the direction that narrows them.
+UPPER_BOUNDS = ("maxLength", "maximum", "exclusiveMaximum", "maxItems", "maxProperties")
+LOWER_BOUNDS = ("minLength", "minimum", "exclusiveMinimum", "minItems", "minProperties")
+# Other options whose change can reject existing values.
+RESTRICTING_OPTIONS = ("pattern", "format", "enum", "timestampFormat")
+
+_DECIMAL_TYPES = {"decimal", "numeric", "number", "dec"}
+_PARAMETERISED = re.compile(r"^\s*([a-z ]+?)\s*\(\s*([\d\s,]+)\)\s*$")
+
+
+@dataclass
+class Change:
+    """One difference between two versions of a contract."""
+
+    kind: str
+    path: str
+    breaking: bool
+    old: Any = None
+    new: Any = None
+
+
+@dataclass
+class ContractDiff:
+    """The changes between two versions of one contract."""
+
+    id: str | None
+    old_file: str | None
+    new_file: str | None
+    old_version: str | None = None
+    new_version: str | None = None
+    changes: list[Change] = field(default_factory=list)
+
+    @property
+    def breaking(self) -> bool:
+        return any(change.breaking for change in self.changes)
+
+    @property
+    def needs_major_bump(self) -> bool:
+        """True if the changes are breaking but the major version was not increased."""
+        if not self.breaking or self.old_version is None or self.new_version is None:
+            return False
+        old, new = _major(self.old_version), _major(self.new_version)
+        return old is not None and (new is None or new <= old)
+
+
+def _major(version: str) -> int | None:
+    match = re.match(r"\s*v?(\d+)", str(version))
+    return int(match.group(1)) if match else None
+
+
+def _items(value: Any) -> list[Mapping]:
+    return [item for item in value if isinstance(item, Mapping)] if isinstance(value, list) else []
+
+
+def _match(old: list[Mapping], new: list[Mapping]) -> Iterator[tuple[Mapping | None, Mapping | None]]:
+    """Pair elements by `name`, then the leftovers by `physicalName`; unmatched ones pair with None."""
+    by_name = {item.get("name"): item for item in new if item.get("name") is not None}
+    paired: set[int] = set()
+    unmatched: list[Mapping] = []
+    for item in old:
+        other = by_name.get(item.get("name")) if item.get("name") is not None else None
+        if other is None or id(other) in paired:
+            unmatched.append(item)
+            continue
+        paired.add(id(other))
+        yield item, other
+    by_physical = {
+        item.get("physicalName"): item
+        for item in new
+        if id(item) not in paired and item.get("physicalName") is not None
+    }
+    for item in unmatched:
+        other = by_physical.pop(item.get("physicalName"), None) if item.get("physicalName") is not None else None
+        if other is not None:
+            paired.add(id(other))
+        yield item, other
+    for item in new:
+        if id(item) not in paired:
+            yield None, item
+
+
+def _is_widening(old: Any, new: Any, widenings: set[tuple[str, str]]) -> bool:
+    old, new = str(old).strip().lower(), str(new).strip().lower()
+    if (old, new) in widenings:
+        return True
+    old_match, new_match = _PARAMETERISED.match(old), _PARAMETERISED.match(new)
+    if old_match is None or new_match is None or old_match.group(1) != new_match.group(1):
+        return False
+    old_args = [int(arg) for arg in old_match.group(2).split(",") if arg.strip()]
+    new_args = [int(arg) for arg in new_match.group(2).split(",") if arg.strip()]
+    if old_match.group(1) in _DECIMAL_TYPES and 1 <= len(old_args) <= 2 and 1 <= len(new_args) <= 2:
+        # decimal(10,2) -> decimal(12,4) keeps both the integer digits and the scale;
+        # decimal(10,2) -> decimal(10,4) drops two integer digits. The scale defaults to 0.
+        (old_precision, old_scale), (new_precision, new_scale) = (old_args + [0])[:2], (new_args + [0])[:2]
+        return (
+            new_precision >= old_precision
+            and new_scale >= old_scale
+            and new_precision - new_scale >= old_precision - old_scale
+        )
+    # varchar(10) -> varchar(20)
+    return len(old_args) == len(new_args) and all(n >= o for o, n in zip(old_args, new_args, strict=True))
+
+
+def _option_changes(path: str, old: Any, new: Any) -> Iterator[Change]:
+    old = old if isinstance(old, Mapping) else {}
+    new = new if isinstance(new, Mapping) else {}
+    for key in dict.fromkeys([*old, *new]):
+        before, after = old.get(key), new.get(key)
+        if before == after:
+            continue
+        if key in UPPER_BOUNDS or key in LOWER_BOUNDS:
+            if after is None:
+                breaking = False
+            elif before is None:
+                breaking = True
+            else:
+                try:
+                    breaking = after < before if key in UPPER_BOUNDS else after > before
+                except TypeError:
+                    breaking = True
+        else:
+            breaking = key in RESTRICTING_OPTIONS
+        yield Change("type_option_changed", f"{path}:{key}", breaking, before, after)
+
+
+def _property_changes(path: str, old: Mapping, new: Mapping) -> Iterator[Change]:
+    """Compare the attributes of two matched properties (not their children)."""
+    if old.get("name") != new.get("name"):
+        yield Change("property_renamed", path, True, old.get("name"), new.get("name"))
+    if bool(old.get("required")) != bool(new.get("required")):
+        yield Change("required_changed", path, bool(new.get("required")), old.get("required"), new.get("required"))
+    if bool(old.get("unique")) != bool(new.get("unique")):
+        yield Change("unique_changed", path, bool(new.get("unique")), old.get("unique"), new.get("unique"))
+    for key, kind, widenings in (
+        ("logicalType", "logical_type_changed", LOGICAL_WIDENINGS),
+        ("physicalType", "physical_type_changed", PHYSICAL_WIDENINGS),
+    ):
+        before, after = old.get(key), new.get(key)
+        if before != after:
+            breaking = after is not None and (before is None or not _is_widening(before, after, widenings))
+            yield Change(kind, path, breaking, before, after)
+    yield from _option_changes(path, old.get("logicalTypeOptions"), new.get("logicalTypeOptions"))
+    for key in ("primaryKey", "primaryKeyPosition"):
+        before, after = old.get(key), new.get(key)
+        if (bool(before) if key == "primaryKey" else before) != (bool(after) if key == "primaryKey" else after):
+            yield Change("primary_key_changed", f"{path}:{key}", True, before, after)
+
+
+def _children(prop: Mapping) -> list[Mapping]:
+    return _items(prop.get("properties"))
+
+
+def diff_schemas(old: Any, new: Any) -> list[Change]:
+    """Compare two `schema` lists of schema objects."""
+    changes: list[Change] = []
+    # Pairs of property lists still to compare, with the path of their parent.
+    pending: deque[tuple[list[Mapping], list[Mapping], str]] = deque()
+    for before, after in _match(_items(old), _items(new)):
+        if after is None:
+            assert before is not None
+            changes.append(Change("object_removed", str(before.get("name")), True))
+            continue
+        name = str(after.get("name"))
+        if before is None:
+            changes.append(Change("object_added", name, False))
+            continue
+        if before == after:
+            continue
+        if before.get("name") != after.get("name"):
+            changes.append(Change("object_renamed", name, True, before.get("name"), after.get("name")))
+        pending.append((_children(before), _children(after), name))
+
+    while pending:
+        old_props, new_props, parent = pending.popleft()
+        for before, after in _match(old_props, new_props):
+            if after is None:
+                assert before is not None
+                changes.append(Change("property_removed", f"{parent}.{before.get('name')}", True))
+                continue
+            path = f"{parent}.{after.get('name')}"
+            if before is None:
+                # Existing data has no value for a new required property.
+                changes.append(Change("property_added", path, bool(after.get("required"))))
+                continue
+            if before == after:
+                # Equal mappings have equal subtrees too; the comparison runs in C.
+                continue
+            changes.extend(_property_changes(path, before, after))
+            pending.append((_children(before), _children(after), path))
+            old_items, new_items = before.get("items"), after.get("items")
+            if isinstance(old_items, Mapping) and isinstance(new_items, Mapping):
+                items = f"{path}[]"
+                changes.extend(
+                    c for c in _property_changes(items, old_items, new_items) if c.kind != "property_renamed"
+                )
+                pending.append((_children(old_items), _children(new_items), items))
+            elif isinstance(old_items, Mapping) or isinstance(new_items, Mapping):
+                changes.append(Change("items_changed", f"{path}[]", True))
+    return changes
+
+
+def diff_contracts(old: Mapping | None, new: Mapping | None) -> list[Change]:
+    """Compare two parsed contract documents; either may be None for an added or removed contract."""
+    if old is None:
+        return [Change("contract_added", "", False)]
+    if new is None:
+        return [Change("contract_removed", "", True)]
+    return diff_schemas(old.get("schema"), new.get("schema"))
+
+
+@dataclass
+class _Document:
+    file: str
+    label: str
+    content: Mapping
+    key: str
+
+
+def _documents(files: Iterable[tuple[Path, str]]) -> dict[str, _Document]:
+    """Index the documents of contract files by contract `id` (or location, without one)."""
+    found: list[_Document] = []
+    for path, label in files:
+        compiled = snapshot.documents(path)
+        contents = load_documents(path.read_bytes()) if compiled is None else compiled
+        for number, content in enumerate(contents, start=1):
+            if not isinstance(content, Mapping):
+                continue
+            key = content.get("id")
+            found.append(_Document(str(path), label, content, str(key) if key is not None else f"{label}#{number}"))
+    counts: dict[str, int] = {}
+    for document in found:
+        counts[document.key] = counts.get(document.key, 0) + 1
+    # A duplicated id is matched together with the file that declares it.
+    return {
+        (f"{document.label}:{document.key}" if counts[document.key] > 1 else document.key): document
+        for document in found
+    }
+
+
+def _diff_documents(old: dict[str, _Document], new: dict[str, _Document]) -> list[ContractDiff]:
+    diffs = []
+    for key in dict.fromkeys([*old, *new]):
+        before, after = old.get(key), new.get(key)
+        document = after or before
+        assert document is not None
+        diff = ContractDiff(
+            id=_text(document.content.get("id")),
+            old_file=before.file if before else None,
+            new_file=after.file if after else None,
+            old_version=_text(before.content.get("version")) if before else None,
+            new_version=_text(after.content.get("version")) if after else None,
+        )
+        diff.changes = diff_contracts(before.content if before else None, after.content if after else None)
+        if diff.changes or diff.old_version != diff.new_version:
+            diffs.append(diff)
+    return diffs
+
+
+def _text(value: Any) -> str | None:
+    return None if value is None else str(value)
+
+
+def diff_files(old: Path, new: Path) -> list[ContractDiff]:
+    """Compare the contracts of two files, matching their documents by `id`.
+
+    Two files of one document each are compared with each other whatever their ids, so a
+    contract whose `id` changed along with its version is still diffed property by property.
+    """
+    if old.read_bytes() == new.read_bytes():
+        return []
+    before, after = _documents([(old, old.name)]), _documents([(new, old.name)])
+    if len(before) == 1 and len(after) == 1:
+        after = {next(iter(before)): next(iter(after.values()))}
+    return _diff_documents(before, after)
+
+
+def diff_trees(old: Path, new: Path) -> list[ContractDiff]:
+    """Compare every contract below two directories, matching contracts by `id` across files.
+
+    Files with identical content at the same relative path are skipped without being parsed.
+    """
+    old_files = {p.relative_to(old).as_posix(): p for p in expand_path(old)}
+    new_files = {p.relative_to(new).as_posix(): p for p in expand_path(new)}
+    for relative in [r for r in old_files if r in new_files]:
+        if old_files[relative].read_bytes() == new_files[relative].read_bytes():
+            del old_files[relative], new_files[relative]
+    return _diff_documents(
+        _documents((p, r) for r, p in sorted(old_files.items())),
+        _documents((p, r) for r, p in sorted(new_files.items())),
+    )
+
+
+def diff_paths(old: Path, new: Path) -> list[ContractDiff]:
+    """Compare two contract files or two directories of contracts."""
+    if old.is_dir() and new.is_dir():
+        return diff_trees(old, new)
+    if old.is_dir() or new.is_dir():
+        raise ValueError("Compare two files or two directories, not a file with a directory")
+    return diff_files(old, new)
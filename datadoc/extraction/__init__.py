@@ -0,0 +1 @@
+"""Schema extraction engines used by the `extract` command."""
@@ -0,0 +1,126 @@
+"""Compare extracted schemas with the contract that is supposed to describe the data.
+
+Live columns are matched to contract properties by the contract's `physicalName`, falling back
+to its `name`, level by level through nested properties and array items. The contract is the
+reference: columns only found in the data are `added`, properties without a column `missing`,
+and matched ones whose `logicalType` differs `type_changed`.
+"""
+
+import copy
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass, field
+from typing import Any
+
+
+@dataclass
+class Drift:
+    """How a dataset differs from its schema object in the contract."""
+
+    dataset: str
+    object_name: str
+    added: list[str] = field(default_factory=list)
+    missing: list[str] = field(default_factory=list)
+    type_changed: list[tuple[str, str | None, str | None]] = field(default_factory=list)
+
+    @property
+    def drifted(self) -> bool:
+        return bool(self.added or self.missing or self.type_changed)
+
+
+def find_object(objects: list[Mapping], dataset: str, only: bool = False) -> int | None:
+    """Return the index of the schema object describing `dataset`, matched by `name` or `physicalName`.
+
+    With `only`, a contract with a single schema object matches whatever the dataset is called.
+    """
+    for index, obj in enumerate(objects):
+        if dataset in (obj.get("name"), obj.get("physicalName")):
+            return index
+    return 0 if only and len(objects) == 1 else None
+
+
+def _column(prop: Mapping) -> Any:
+    return prop.get("physicalName") or prop.get("name")
+
+
+def _children(prop: Mapping) -> list[Any]:
+    children = prop.get("properties")
+    return children if isinstance(children, list) else []
+
+
+def compare(dataset: str, schema_object: Mapping, extracted: Mapping) -> tuple[Drift, dict]:
+    """Diff an extracted schema against a contract schema object.
+
+    Returns the drift and a merged copy of the schema object: added columns are appended with
+    their extracted definitions and changed types are updated, while everything else the
+    contract says, including properties missing from the data, is kept.
+    """
+    drift = Drift(dataset, str(schema_object.get("name")))
+    merged = copy.deepcopy(dict(schema_object))
+    # (contract properties, merged copies, live properties, path of the parent)
+    pending = [(_children(schema_object), merged.setdefault("properties", []), _children(extracted), "")]
+    while pending:
+        expected, merged_props, live, parent = pending.pop()
+        by_column = {_column(prop): index for index, prop in enumerate(expected) if isinstance(prop, Mapping)}
+        seen = set()
+        for prop in live:
+            path = f"{parent}{prop['name']}"
+            index = by_column.get(prop["name"])
+            if index is None:
+                drift.added.append(path)
+                merged_props.append(copy.deepcopy(dict(prop)))
+                continue
+            seen.add(index)
+            declared, target = expected[index], merged_props[index]
+            if declared.get("logicalType") is not None and declared.get("logicalType") != prop.get("logicalType"):
+                drift.type_changed.append((path, declared.get("logicalType"), prop.get("logicalType")))
+                target["logicalType"] = prop.get("logicalType")
+                if prop.get("physicalType") is not None:
+                    target["physicalType"] = prop["physicalType"]
+            if _children(prop):
+                pending.append((_children(declared), target.setdefault("properties", []), _children(prop), f"{path}."))
+            items, live_items = declared.get("items"), prop.get("items")
+            if isinstance(items, Mapping) and isinstance(live_items, Mapping):
+                if items.get("logicalType") is not None and items.get("logicalType") != live_items.get("logicalType"):
+                    drift.type_changed.append((f"{path}[]", items.get("logicalType"), live_items.get("logicalType")))
+                    target["items"]["logicalType"] = live_items.get("logicalType")
+                if _children(items) or _children(live_items):
+                    pending.append(
+                        (
+                            _children(items),
+                            target["items"].setdefault("properties", []),
+                            _children(live_items),
+                            f"{path}[].",
+                        )
+                    )
+        drift.missing.extend(
+            f"{parent}{_column(prop)}"
+            for index, prop in enumerate(expected)
+            if isinstance(prop, Mapping) and index not in seen
+        )
+    if not merged["properties"]:
+        del merged["properties"]
+    return drift, merged
+
+
+def compare_contract(
+    contract: Mapping, extracted: Sequence[tuple[str, Mapping]]
+) -> tuple[list[Drift], list[str], dict]:
+    """Compare extracted `(dataset, schema)` pairs with the schema objects of a contract.
+
+    Returns the drift of every matched dataset, the datasets no schema object describes, and
+    the contract merged with the live schemas, where unmatched datasets become new objects.
+    """
+    merged = dict(contract)
+    objects = [obj for obj in contract.get("schema") or [] if isinstance(obj, Mapping)]
+    merged_objects: list[Any] = list(objects)
+    drifts, unmatched = [], []
+    for dataset, schema in extracted:
+        index = find_object(objects, dataset, only=len(extracted) == 1)
+        if index is None:
+            unmatched.append(dataset)
+            merged_objects.append(dict(schema))
+            continue
+        drift, merged_objects[index] = compare(dataset, objects[index], schema)
+        drifts.append(drift)
+    merged["schema"] = merged_objects
+    return drifts, unmatched, merged
@@ -0,0 +1,351 @@
+"""Schema extraction engines, independent of the command line.
+
+`extract_datasets` reads the schemas of datasets from file footers with pyarrow or through
+Spark, optionally fingerprinting local datasets to answer unchanged ones from a cache. Nothing
+here renders output or raises CLI exceptions: invalid arguments raise `ValueError`, failures
+of a dataset are reported in its `ExtractionResult.error`, and a footer read that fell back
+to Spark in its `ExtractionResult.fallback`.
+"""
+
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from datadoc.cache import ExtractionCache
+from datadoc.extraction import fingerprint, native
+from datadoc.extraction.nested import FieldInfo, Member, build_fields, ddl_type, to_properties
+from datadoc.extraction.profiling import DatasetProfile, apply_profile, profile_dataframe
+from datadoc.extraction.sampling import SAMPLED_FORMATS, SamplingConfig, SamplingReport, load_sample
+from datadoc.timing import span
+
+if TYPE_CHECKING:
+    from pyspark.sql import DataFrame, SparkSession
+    from pyspark.sql.types import DataType
+
+    from datadoc.models.odcs import LogicalType1
+
+ENGINES = ("auto", "native", "spark")
+DEFAULT_SCHEMA_NAME = "extracted_schema"
+
+
+@dataclass
+class DatasetSpec:
+    """One dataset to extract, as described in the configuration file."""
+
+    name: str
+    data_path: str
+    format: str = "csv"
+    options: dict[str, Any] = field(default_factory=dict)
+    engine: str | None = None
+    sampling: SamplingConfig | None = None
+
+
+@dataclass
+class ExtractionResult:
+    """The schema extracted for a dataset, or the error that prevented it.
+
+    `fallback` says why a footer read was given up for Spark, if it was.
+    """
+
+    spec: DatasetSpec
+    schema: dict | None = None
+    engine: str | None = None
+    error: str | None = None
+    sampling: SamplingReport | None = None
+    cache: str | None = None
+    fallback: str | None = None
+
+
+def schema_from_fields(fields: Iterable[FieldInfo], name: str = DEFAULT_SCHEMA_NAME) -> dict:
+    """Build an ODCS schema object dict from engine-neutral column descriptions.
+
+    Struct and map members become nested `properties` and array elements become `items`.
+    """
+    with span("type_mapping"):
+        properties = to_properties(fields, lambda type_name: map_spark_to_logical_type(type_name).value)
+    schema = {"name": name, "logicalType": "object", "properties": properties}
+    return schema
+
+
+def detect_schema(
+    spark: "SparkSession",
+    data_path: str | list[str],
+    format: str,
+    options: dict[str, Any] | None = None,
+) -> dict:
+    """Detect schema from data file using Spark and return a dict in ODCS shape."""
+    reader = spark.read.format(format)
+    if options:
+        reader = reader.options(**options)
+    with span("spark.read"):
+        df = reader.load(data_path)
+    return _schema_from_dataframe(df)
+
+
+def detect_schema_sampled(
+    spark: "SparkSession", data_path: str, format: str, options: dict[str, Any], sampling: SamplingConfig
+) -> tuple[dict, SamplingReport]:
+    """Detect a CSV or JSON schema from a bounded sample and report what was read."""
+    with span("spark.read"):
+        df, report = load_sample(spark, data_path, format, options, sampling)
+    return _schema_from_dataframe(df), report
+
+
+def _schema_from_dataframe(df: "DataFrame") -> dict:
+    """Convert the schema Spark resolved for a DataFrame."""
+    with span("spark.schema"):
+        columns = [(column.name, column.dataType, column.nullable) for column in df.schema.fields]
+    return schema_from_fields(build_fields(columns, _describe_spark_type))
+
+
+def _describe_spark_type(data_type: "DataType") -> tuple[str, str, list[Member]]:
+    """Describe a Spark type and its members for `nested.build_fields`."""
+    from pyspark.sql.types import ArrayType, MapType, StructType
+
+    if isinstance(data_type, StructType):
+        return "struct", "struct", [(child.name, child.dataType, child.nullable) for child in data_type.fields]
+    if isinstance(data_type, ArrayType):
+        return "array", "array", [("items", data_type.elementType, data_type.containsNull)]
+    if isinstance(data_type, MapType):
+        members = [("key", data_type.keyType, False), ("value", data_type.valueType, data_type.valueContainsNull)]
+        return "map", "map", members
+    return data_type.typeName(), data_type.simpleString(), []
+
+
+def detect_schema_native(data_path: str, format: str) -> dict:
+    """Detect schema from Parquet, ORC or Arrow IPC file footers without starting Spark."""
+    with span("footer.read"):
+        fields = native.read_fields(data_path, format)
+    return schema_from_fields(fields)
+
+
+def extract_schema(
+    data_path: str,
+    format: str,
+    engine: str,
+    spark_session: Callable[[], "SparkSession"],
+    options: dict[str, Any] | None = None,
+    sampling: SamplingConfig | None = None,
+) -> tuple[dict, str, SamplingReport | None, str | None]:
+    """Extract a schema with the requested engine.
+
+    Returns the schema, the engine actually used, for sampled CSV/JSON reads a report of the
+    data inspected and, when a footer read failed under `auto`, why it fell back to Spark.
+    `auto` reads file footers when the format and installed packages allow it and falls back
+    to Spark otherwise; `spark_session` is only called when Spark is needed. Raises
+    `ValueError` for an unknown engine, or a format the native engine cannot read.
+    """
+    check_engine(engine)
+    fallback = None
+    if engine != "spark":
+        if native.supports(format):
+            try:
+                return detect_schema_native(data_path, format), "native", None, None
+            except Exception as e:
+                if engine == "native":
+                    raise
+                fallback = f"Footer read failed ({e}), falling back to Spark"
+        elif engine == "native":
+            raise ValueError(
+                f"The native engine needs pyarrow and one of: {', '.join(native.NATIVE_FORMATS)} (got '{format}')"
+            )
+    if sampling is not None and format.lower() in SAMPLED_FORMATS:
+        schema, report = detect_schema_sampled(spark_session(), data_path, format, options or {}, sampling)
+        return schema, "spark", report, fallback
+    return detect_schema(spark_session(), data_path, format, options), "spark", None, fallback
+
+
+def check_engine(engine: str) -> None:
+    """Raise `ValueError` unless `engine` is one of `ENGINES`."""
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown engine '{engine}', expected one of: {', '.join(ENGINES)}")
+
+
+def ddl_schema(schema: dict) -> str:
+    """Render an extracted schema as a Spark DDL string so data can be re-read without inference."""
+    return ", ".join("`" + prop["name"].replace("`", "``") + "` " + ddl_type(prop) for prop in schema["properties"])
+
+
+def profile_dataset(spark: "SparkSession", spec: DatasetSpec, schema: dict) -> DatasetProfile:
+    """Profile every column of a dataset in a single aggregation over the full data.
+
+    CSV and JSON are read with the already extracted schema, so profiling does not repeat
+    schema inference.
+    """
+    reader = spark.read.format(spec.format)
+    if spec.options:
+        reader = reader.options(**spec.options)
+    if spec.format.lower() in SAMPLED_FORMATS:
+        reader = reader.schema(ddl_schema(schema))
+    with span("profile.aggregate"):
+        return profile_dataframe(reader.load(spec.data_path))
+
+
+def _extract(
+    spec: DatasetSpec, engine: str, spark_session: Callable[[], "SparkSession"], profile: bool
+) -> ExtractionResult:
+    """Extract (and optionally profile) one dataset from scratch."""
+    try:
+        schema, used, report, fallback = extract_schema(
+            spec.data_path, spec.format, engine, spark_session, spec.options, spec.sampling
+        )
+        if profile:
+            apply_profile(schema, profile_dataset(spark_session(), spec, schema))
+    except Exception as e:
+        return ExtractionResult(spec, error=str(e))
+    schema["name"] = spec.name
+    return ExtractionResult(spec, schema=schema, engine=used, sampling=report, fallback=fallback)
+
+
+def extract_incremental(
+    spec: DatasetSpec,
+    engine: str,
+    spark_session: Callable[[], "SparkSession"],
+    cache: ExtractionCache,
+    profile: bool = False,
+) -> ExtractionResult:
+    """Extract a local dataset, reusing the cached schema for files that have not changed.
+
+    Unchanged datasets are answered from `cache` without reading any data. For footer formats
+    the schema of every file is cached, so only added or modified files are read and the
+    result is the union of all files. With Spark, files added since the last run are read and
+    merged into the cached schema; modified or removed files, sampling and profiling need a
+    full read. Remote paths are always extracted from scratch.
+    """
+    fallback = None
+    try:
+        check_engine(engine)
+        key = fingerprint.dataset_key(spec.data_path, spec.format, spec.options, spec.sampling, engine, profile)
+        with span("cache.lookup"):
+            entry = cache.get_many([key]).get(key)
+        previous = {path: fingerprint.FileEntry(*value) for path, value in entry["files"].items()} if entry else {}
+        with span("fingerprint.scan"):
+            files = fingerprint.scan(spec.data_path, spec.format, previous)
+        if not files:
+            return _extract(spec, engine, spark_session, profile)
+        changes = fingerprint.diff(previous, files)
+        if entry is not None and not changes:
+            schema = {**entry["schema"], "name": spec.name}
+            return ExtractionResult(spec, schema=schema, engine=entry["engine"], cache="hit")
+
+        stored: dict[str, Any] = {"files": {path: list(value) for path, value in files.items()}}
+        if engine != "spark" and native.supports(spec.format):
+            cached_parts = entry.get("parts", {}) if entry else {}
+            reuse = {path for path in cached_parts if path in files and path not in changes.changed}
+            try:
+                parts = {
+                    path: cached_parts[path] if path in reuse else _file_properties(path, spec.format) for path in files
+                }
+            except Exception as e:
+                if engine == "native":
+                    raise
+                fallback = f"Footer read failed ({e}), falling back to Spark"
+            else:
+                properties = fingerprint.merge_properties(list(parts.values()))
+                names = {prop["name"] for prop in properties}
+                partitions = fingerprint.partition_fields(spec.data_path, list(files))
+                properties += schema_from_fields(f for f in partitions if f.name not in names)["properties"]
+                schema = {"name": spec.name, "logicalType": "object", "properties": properties}
+                if profile:
+                    apply_profile(schema, profile_dataset(spark_session(), spec, schema))
+                with span("cache.store"):
+                    cache.put_many([(key, {**stored, "engine": "native", "parts": parts, "schema": schema})])
+                return ExtractionResult(spec, schema=schema, engine="native", cache="incremental" if reuse else "miss")
+            engine = "spark"
+
+        if (
+            entry is not None
+            and entry["engine"] == "spark"
+            and not changes.modified
+            and not changes.removed
+            and spec.sampling is None
+            and not profile
+        ):
+            options = dict(spec.options)
+            if Path(spec.data_path).is_dir():
+                options.setdefault("basePath", spec.data_path)
+            added = detect_schema(spark_session(), changes.added, spec.format, options)
+            properties = fingerprint.merge_properties([entry["schema"]["properties"], added["properties"]])
+            schema = {**entry["schema"], "name": spec.name, "properties": properties}
+            with span("cache.store"):
+                cache.put_many([(key, {**stored, "engine": "spark", "schema": schema})])
+            return ExtractionResult(spec, schema=schema, engine="spark", cache="incremental", fallback=fallback)
+    except Exception as e:
+        return ExtractionResult(spec, error=str(e), fallback=fallback)
+
+    result = _extract(spec, engine, spark_session, profile)
+    result.fallback = result.fallback or fallback
+    if result.schema is not None and result.engine is not None:
+        with span("cache.store"):
+            cache.put_many([(key, {**stored, "engine": result.engine, "schema": result.schema})])
+        result.cache = "miss"
+    return result
+
+
+def _file_properties(path: str, format: str) -> list[dict]:
+    """Read the ODCS properties of a single file from its footer."""
+    with span("footer.read"):
+        fields = native.read_fields(path, format)
+    return schema_from_fields(fields)["properties"]
+
+
+def extract_datasets(
+    specs: list[DatasetSpec],
+    engine: str,
+    spark_session: Callable[[], "SparkSession"],
+    parallelism: int = 1,
+    profile: bool = False,
+    cache: ExtractionCache | None = None,
+) -> Iterator[ExtractionResult]:
+    """Extract every dataset, running up to `parallelism` schema reads at once.
+
+    A dataset's own `engine` overrides `engine`. With `profile`, each dataset is also profiled
+    with Spark and the statistics are written into its schema. With a `cache`, unchanged
+    datasets are not read again, see `extract_incremental`. Failures are reported per dataset
+    instead of aborting the run, and results are yielded in the order of `specs`.
+    """
+
+    def run(spec: DatasetSpec) -> ExtractionResult:
+        if cache is not None:
+            return extract_incremental(spec, spec.engine or engine, spark_session, cache, profile)
+        return _extract(spec, spec.engine or engine, spark_session, profile)
+
+    if parallelism <= 1 or len(specs) <= 1:
+        yield from map(run, specs)
+        return
+    with ThreadPoolExecutor(max_workers=parallelism, thread_name_prefix="datadoc-extract") as pool:
+        yield from pool.map(run, specs)
+
+
+@lru_cache(maxsize=1)
+def _type_mapping() -> dict[str, "LogicalType1"]:
+    """Build the Spark to ODCS type table on first use so the models load lazily."""
+    from datadoc.models.odcs import LogicalType1
+
+    return {
+        "string": LogicalType1.string,
+        "byte": LogicalType1.integer,
+        "short": LogicalType1.integer,
+        "integer": LogicalType1.integer,
+        "long": LogicalType1.integer,
+        "decimal": LogicalType1.number,
+        "double": LogicalType1.number,
+        "float": LogicalType1.number,
+        "boolean": LogicalType1.boolean,
+        "date": LogicalType1.date,
+        "timestamp": LogicalType1.date,
+        "timestamp_ntz": LogicalType1.date,
+        "array": LogicalType1.array,
+        "struct": LogicalType1.object,
+        "map": LogicalType1.object,
+    }
+
+
+def map_spark_to_logical_type(spark_type: str) -> "LogicalType1":
+    """Map Spark data type to ODCS logical type."""
+    from datadoc.models.odcs import LogicalType1
+
+    return _type_mapping().get(spark_type.lower(), LogicalType1.string)
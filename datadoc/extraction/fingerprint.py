@@ -0,0 +1,178 @@
+"""Cheap dataset fingerprints for incremental schema extraction.
+
+A dataset is fingerprinted by listing its files with their sizes and modification times.
+Parquet files also record a hash of their footer, so a file that was rewritten with the
+same content is not treated as changed. Comparing two fingerprints tells which files were
+added, modified or removed, and only those need to be inspected again.
+"""
+
+import hashlib
+import json
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, NamedTuple
+
+from datadoc import __version__
+from datadoc.extraction.nested import FieldInfo
+from datadoc.extraction.sampling import SamplingConfig, list_data_files
+
+PARQUET_MAGIC = b"PAR1"
+
+# Physical types a column may be widened through when files disagree, narrowest first.
+WIDENING = ("tinyint", "smallint", "int", "bigint", "float", "double")
+
+
+class FileEntry(NamedTuple):
+    """The fingerprint of one data file."""
+
+    size: int
+    mtime_ns: int
+    footer: str | None = None
+
+
+@dataclass
+class FileChanges:
+    """Files that differ between two fingerprints of a dataset."""
+
+    added: list[str] = field(default_factory=list)
+    modified: list[str] = field(default_factory=list)
+    removed: list[str] = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.modified or self.removed)
+
+    @property
+    def changed(self) -> list[str]:
+        """Files whose schema has to be read again."""
+        return self.added + self.modified
+
+
+def footer_hash(path: Path) -> str | None:
+    """Hash the footer of a Parquet file, or return None if it has no Parquet footer."""
+    with open(path, "rb") as f:
+        f.seek(0, 2)
+        size = f.tell()
+        if size < 12:
+            return None
+        f.seek(size - 8)
+        tail = f.read(8)
+        if tail[4:] != PARQUET_MAGIC:
+            return None
+        length = int.from_bytes(tail[:4], "little")
+        if length + 12 > size:
+            return None
+        f.seek(size - 8 - length)
+        return hashlib.sha256(f.read(length)).hexdigest()
+
+
+def scan(data_path: str, format: str, previous: dict[str, FileEntry] | None = None) -> dict[str, FileEntry] | None:
+    """Fingerprint the files of a local dataset, or return None for remote paths.
+
+    Footers are only hashed for Parquet files whose size or modification time differs from
+    `previous`, so scanning an unchanged dataset costs one `stat` per file.
+    """
+    files = list_data_files(data_path)
+    if files is None:
+        return None
+    previous = previous or {}
+    entries = {}
+    for path in files:
+        stat = path.stat()
+        key = str(path)
+        old = previous.get(key)
+        if old is not None and (old.size, old.mtime_ns) == (stat.st_size, stat.st_mtime_ns):
+            entries[key] = old
+            continue
+        footer = footer_hash(path) if format.lower() == "parquet" else None
+        entries[key] = FileEntry(stat.st_size, stat.st_mtime_ns, footer)
+    return entries
+
+
+def diff(previous: dict[str, FileEntry], current: dict[str, FileEntry]) -> FileChanges:
+    """Compare two fingerprints file by file."""
+    changes = FileChanges(removed=[path for path in previous if path not in current])
+    for path, entry in current.items():
+        old = previous.get(path)
+        if old is None:
+            changes.added.append(path)
+        elif old.size != entry.size or (
+            old.footer != entry.footer if entry.footer is not None else old.mtime_ns != entry.mtime_ns
+        ):
+            changes.modified.append(path)
+    return changes
+
+
+def dataset_key(
+    data_path: str,
+    format: str,
+    options: dict[str, Any],
+    sampling: SamplingConfig | None,
+    engine: str,
+    profile: bool,
+) -> str:
+    """Build the cache key for everything that shapes an extracted schema except the data itself."""
+    if "://" not in data_path:
+        data_path = str(Path(data_path).absolute())
+    description = [
+        __version__,
+        data_path,
+        format.lower(),
+        sorted((str(k), str(v)) for k, v in options.items()),
+        asdict(sampling) if sampling else None,
+        engine,
+        profile,
+    ]
+    return hashlib.sha256(json.dumps(description).encode()).hexdigest()
+
+
+def partition_fields(data_path: str, files: list[str]) -> list[FieldInfo]:
+    """Infer hive partition columns (`key=value` directories) below a dataset directory."""
+    root = Path(data_path)
+    if not root.is_dir():
+        return []
+    values: dict[str, list[str]] = {}
+    for path in files:
+        for part in Path(path).relative_to(root).parent.parts:
+            key, sep, value = part.partition("=")
+            if sep and key:
+                values.setdefault(key, []).append(value)
+    fields = []
+    for key, seen in values.items():
+        if all(value.lstrip("-").isdigit() for value in seen):
+            fields.append(FieldInfo(key, "integer", "int", True))
+        else:
+            fields.append(FieldInfo(key, "string", "string", True))
+    return fields
+
+
+def _widen(left: dict, right: dict) -> dict:
+    """Pick a property type both sides can be read as."""
+    if left["physicalType"] == right["physicalType"]:
+        return dict(left)
+    if left["physicalType"] in WIDENING and right["physicalType"] in WIDENING:
+        wider = max(left, right, key=lambda prop: WIDENING.index(prop["physicalType"]))
+        return {**left, "logicalType": wider["logicalType"], "physicalType": wider["physicalType"]}
+    return {**left, "logicalType": "string", "physicalType": "string"}
+
+
+def merge_properties(groups: list[list[dict]]) -> list[dict]:
+    """Union the ODCS properties of several files or partial reads, in first-seen order.
+
+    A property is required only if every group has it and requires it. Conflicting types are
+    widened along integer and floating point sizes, and anything else becomes a string.
+    """
+    merged: dict[str, dict] = {}
+    seen_in: dict[str, int] = {}
+    for properties in groups:
+        for prop in properties:
+            name = prop["name"]
+            if name in merged:
+                merged[name] = _widen(merged[name], prop)
+                merged[name]["required"] = merged[name]["required"] and prop["required"]
+            else:
+                merged[name] = dict(prop)
+            seen_in[name] = seen_in.get(name, 0) + 1
+    for name, prop in merged.items():
+        if seen_in[name] < len(groups):
+            prop["required"] = False
+    return list(merged.values())
@@ -0,0 +1,137 @@
+"""Footer-only schema extraction for columnar formats using pyarrow.
+
+Parquet, ORC and Arrow IPC files carry their schema in the file footer, so the
+schema can be read without starting Spark or scanning any data. Arrow types are
+translated to Spark type names so the result goes through the same ODCS type
+mapping as the Spark engine.
+"""
+
+import glob
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from datadoc.extraction.nested import FieldInfo, Member, build_fields
+
+if TYPE_CHECKING:
+    import pyarrow as pa
+
+NATIVE_FORMATS = {"parquet": "parquet", "orc": "orc", "arrow": "ipc", "ipc": "ipc", "feather": "ipc"}
+
+
+def is_available() -> bool:
+    """Return True if pyarrow can be imported."""
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def supports(format: str) -> bool:
+    """Return True if the schema of `format` can be read from file footers."""
+    return format.lower() in NATIVE_FORMATS and is_available()
+
+
+def read_arrow_schema(data_path: str, format: str) -> "pa.Schema":
+    """Read the Arrow schema of a file, directory or glob from its footer only."""
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+
+    arrow_format = NATIVE_FORMATS[format.lower()]
+    if glob.has_magic(data_path):
+        files = sorted(glob.glob(data_path, recursive=True))
+        if not files:
+            raise FileNotFoundError(f"No files match pattern: {data_path}")
+        return ds.dataset(files, format=arrow_format).schema
+
+    path = Path(data_path)
+    if path.is_dir():
+        return ds.dataset(path, format=arrow_format, partitioning="hive").schema
+    if arrow_format == "parquet":
+        import pyarrow.parquet as pq
+
+        return pq.read_schema(path, memory_map=True)
+    if arrow_format == "orc":
+        import pyarrow.orc as orc
+
+        return orc.ORCFile(pa.memory_map(str(path))).schema
+    source = pa.memory_map(str(path))
+    try:
+        return pa.ipc.open_file(source).schema
+    except pa.ArrowInvalid:
+        source.seek(0)
+        return pa.ipc.open_stream(source).schema
+
+
+def spark_type(arrow_type: Any) -> tuple[str, str]:
+    """Translate an Arrow type into the Spark `(typeName, simpleString)` it is read as.
+
+    Nested types are named by their kind only; their members are described by `describe`.
+    """
+    import pyarrow as pa
+    import pyarrow.types as t
+
+    if t.is_dictionary(arrow_type):
+        return spark_type(arrow_type.value_type)
+    if t.is_boolean(arrow_type):
+        return "boolean", "boolean"
+    if t.is_int8(arrow_type):
+        return "byte", "tinyint"
+    if t.is_int16(arrow_type) or t.is_uint8(arrow_type):
+        return "short", "smallint"
+    if t.is_int32(arrow_type) or t.is_uint16(arrow_type):
+        return "integer", "int"
+    if t.is_int64(arrow_type) or t.is_uint32(arrow_type):
+        return "long", "bigint"
+    if t.is_uint64(arrow_type):
+        return "decimal", "decimal(20,0)"
+    if t.is_float16(arrow_type) or t.is_float32(arrow_type):
+        return "float", "float"
+    if t.is_float64(arrow_type):
+        return "double", "double"
+    if t.is_decimal(arrow_type):
+        return "decimal", f"decimal({arrow_type.precision},{arrow_type.scale})"
+    if t.is_string(arrow_type) or t.is_large_string(arrow_type):
+        return "string", "string"
+    if t.is_binary(arrow_type) or t.is_large_binary(arrow_type) or t.is_fixed_size_binary(arrow_type):
+        return "binary", "binary"
+    if t.is_date(arrow_type):
+        return "date", "date"
+    if t.is_timestamp(arrow_type):
+        return "timestamp", "timestamp"
+    if t.is_null(arrow_type):
+        return "void", "void"
+    if t.is_list(arrow_type) or t.is_large_list(arrow_type) or t.is_fixed_size_list(arrow_type):
+        return "array", "array"
+    if t.is_map(arrow_type):
+        return "map", "map"
+    if t.is_struct(arrow_type):
+        return "struct", "struct"
+    if isinstance(arrow_type, pa.DataType):
+        return "string", str(arrow_type)
+    raise TypeError(f"Not an Arrow type: {arrow_type!r}")
+
+
+def describe(arrow_type: Any) -> tuple[str, str, list[Member]]:
+    """Describe an Arrow type and its members for `nested.build_fields`."""
+    import pyarrow.types as t
+
+    if t.is_dictionary(arrow_type):
+        return describe(arrow_type.value_type)
+    type_name, physical_type = spark_type(arrow_type)
+    if type_name == "array":
+        element = arrow_type.value_field
+        return type_name, physical_type, [("items", element.type, element.nullable)]
+    if type_name == "map":
+        item = arrow_type.item_field
+        return type_name, physical_type, [("key", arrow_type.key_type, False), ("value", item.type, item.nullable)]
+    if type_name == "struct":
+        children = (arrow_type.field(i) for i in range(arrow_type.num_fields))
+        return type_name, physical_type, [(child.name, child.type, child.nullable) for child in children]
+    return type_name, physical_type, []
+
+
+def read_fields(data_path: str, format: str) -> list[FieldInfo]:
+    """Return the columns of a dataset, with their nested members, read from its footers."""
+    schema = read_arrow_schema(data_path, format)
+    return build_fields(((field.name, field.type, field.nullable) for field in schema), describe)
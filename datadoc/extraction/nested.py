@@ -0,0 +1,147 @@
+"""Nested column types (structs, arrays and maps) as engine-neutral trees.
+
+Both engines describe a type as its Spark type name, a short physical type and its member
+types. `build_fields` turns those descriptions into `FieldInfo` trees and `to_properties`
+turns the trees into nested ODCS `properties` and `items`. Both walk the types with an
+explicit stack, so deeply nested schemas cannot exhaust the interpreter's recursion limit.
+
+Identical sub-trees are interned: a struct that appears in many places is built once and
+shared, so memory follows the number of distinct sub-schemas rather than the number of leaf
+fields. Shared ODCS dicts must be copied before they are modified.
+"""
+
+from collections.abc import Callable, Iterable
+from typing import Any, NamedTuple
+
+
+class FieldInfo(NamedTuple):
+    """A column as seen by an extraction engine, described with Spark type names.
+
+    Structs, arrays and maps carry their members in `children`: struct fields, one `items`
+    element, or a `key` and a `value`.
+    """
+
+    name: str
+    type_name: str
+    physical_type: str
+    nullable: bool
+    children: tuple["FieldInfo", ...] = ()
+
+
+Member = tuple[str, Any, bool]
+"""A member of a type: its name, its engine type and whether it may be null."""
+
+Describe = Callable[[Any], tuple[str, str, list[Member]]]
+"""Describe an engine type as `(typeName, physicalType, members)`.
+
+Arrays have one member named `items`, maps have `key` and `value`, and leaf types have none.
+"""
+
+
+def build_fields(members: Iterable[Member], describe: Describe) -> list[FieldInfo]:
+    """Build interned `FieldInfo` trees for the top-level columns of a schema."""
+    interned: dict[tuple, FieldInfo] = {}
+    member_lists: dict[tuple[int, ...], tuple[FieldInfo, ...]] = {}
+
+    def intern(name: str, type_name: str, physical_type: str, nullable: bool, children: list) -> FieldInfo:
+        ids = tuple(id(child) for child in children)
+        members = member_lists.setdefault(ids, tuple(children))
+        key = (name, type_name, physical_type, nullable, ids)
+        node = interned.get(key)
+        if node is None:
+            node = interned[key] = FieldInfo(name, type_name, physical_type, nullable, members)
+        return node
+
+    # Each frame is (name, nullable, typeName, physicalType, pending members, built children).
+    root: list[Any] = ["", False, "struct", "struct", list(members), []]
+    stack = [root]
+    while True:
+        frame = stack[-1]
+        pending, built = frame[4], frame[5]
+        if len(built) < len(pending):
+            name, data_type, nullable = pending[len(built)]
+            type_name, physical_type, children = describe(data_type)
+            if children:
+                stack.append([name, nullable, type_name, physical_type, children, []])
+            else:
+                built.append(intern(name, type_name, physical_type, nullable, []))
+            continue
+        stack.pop()
+        if not stack:
+            return built
+        stack[-1][5].append(intern(frame[0], frame[2], frame[3], frame[1], built))
+
+
+def to_properties(fields: Iterable[FieldInfo], logical_type: Callable[[str], str]) -> list[dict]:
+    """Convert `FieldInfo` trees into ODCS properties with nested `properties` and `items`.
+
+    Array elements become `items`; struct fields and map keys and values become `properties`.
+    Top-level properties are always fresh dicts, nested ones may be shared.
+    """
+    fields = list(fields)
+    converted: dict[int, dict] = {}
+    member_lists: dict[int, list[dict]] = {}
+    for node in _post_order(fields):
+        prop: dict[str, Any] = {
+            "name": node.name,
+            "logicalType": logical_type(node.type_name),
+            "physicalType": node.physical_type,
+            "required": not node.nullable,
+        }
+        if node.type_name == "array" and node.children:
+            prop["items"] = {k: v for k, v in converted[id(node.children[0])].items() if k != "name"}
+        elif node.children:
+            if id(node.children) not in member_lists:
+                member_lists[id(node.children)] = [converted[id(child)] for child in node.children]
+            prop["properties"] = member_lists[id(node.children)]
+        converted[id(node)] = prop
+    return [dict(converted[id(field)]) for field in fields]
+
+
+def _post_order(fields: list[FieldInfo]) -> list[FieldInfo]:
+    """List every distinct node once, each after all of its children."""
+    order = []
+    done = set()
+    stack = [(field, False) for field in reversed(fields)]
+    while stack:
+        node, expanded = stack.pop()
+        if id(node) in done:
+            continue
+        if expanded:
+            done.add(id(node))
+            order.append(node)
+            continue
+        stack.append((node, True))
+        stack.extend((child, False) for child in reversed(node.children) if id(child) not in done)
+    return order
+
+
+def ddl_type(prop: dict) -> str:
+    """Render the Spark DDL type of an ODCS property, including its nested members."""
+    parts: list[str] = []
+    # Work items are either a property to render or a literal piece of text.
+    stack: list[Any] = [prop]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, str):
+            parts.append(item)
+            continue
+        physical = item.get("physicalType") or "string"
+        if physical == "array" and "items" in item:
+            stack.extend([">", item["items"]])
+            parts.append("array<")
+        elif physical == "map" and len(item.get("properties") or []) == 2:
+            key, value = item["properties"]
+            stack.extend([">", value, ",", key])
+            parts.append("map<")
+        elif physical == "struct" and item.get("properties"):
+            pending: list[Any] = [">"]
+            for index, child in enumerate(reversed(item["properties"])):
+                pending.extend([child, "`" + child["name"].replace("`", "``") + "`:"])
+                if index < len(item["properties"]) - 1:
+                    pending.append(",")
+            stack.extend(pending)
+            parts.append("struct<")
+        else:
+            parts.append(physical)
+    return "".join(parts)
@@ -0,0 +1,168 @@
+"""Single-pass column profiling used to seed contract quality rules.
+
+All statistics for all columns come from one `DataFrame.agg` call, so the data is scanned
+once no matter how wide the table is. Distinct counts use HyperLogLog
+(`approx_count_distinct`) and quantiles use `percentile_approx`; the pass holds no exact
+distinct aggregate, which Spark would plan as a copy of every row per column. An estimate
+alone cannot tell a key from a column with a few percent duplicates, so the few key-typed
+columns without nulls whose estimate is within error of the row count are confirmed with
+an exact `countDistinct` in a second pass that reads only those columns.
+"""
+
+import datetime
+import decimal
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from pyspark.sql import DataFrame
+
+NUMERIC_TYPES = {"byte", "short", "integer", "long", "float", "double", "decimal"}
+ORDERED_TYPES = NUMERIC_TYPES | {"string", "boolean", "date", "timestamp", "timestamp_ntz"}
+KEY_TYPES = {"byte", "short", "integer", "long", "decimal", "string", "date", "timestamp", "timestamp_ntz"}
+QUANTILES = (0.01, 0.5, 0.99)
+DEFAULT_RELATIVE_ERROR = 0.02
+# How many standard errors an HLL estimate may fall below the row count for a column to be confirmed.
+UNIQUE_TOLERANCE = 3
+
+
+@dataclass
+class ColumnProfile:
+    """Statistics for one column."""
+
+    non_null_count: int
+    distinct_count: int | None = None
+    exact_distinct_count: int | None = None
+    min: Any = None
+    max: Any = None
+    quantiles: dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class DatasetProfile:
+    """Statistics for a dataset, keyed by column name."""
+
+    row_count: int
+    columns: dict[str, ColumnProfile]
+    relative_error: float = DEFAULT_RELATIVE_ERROR
+
+
+def unique_candidates(profile: DatasetProfile, names: Iterable[str]) -> list[str]:
+    """Return the columns among `names` that may be unique: no nulls and an estimate within error of the row count."""
+    rows = profile.row_count
+    floor = rows * (1 - UNIQUE_TOLERANCE * profile.relative_error)
+    return [
+        name
+        for name in names
+        if rows > 0
+        and profile.columns[name].non_null_count == rows
+        and (profile.columns[name].distinct_count or 0) >= floor
+    ]
+
+
+def profile_dataframe(df: "DataFrame", relative_error: float = DEFAULT_RELATIVE_ERROR) -> DatasetProfile:
+    """Compute row count, null counts, distinct counts, min/max and quantiles in one pass.
+
+    Columns that `unique_candidates` picks get their exact distinct count from a second, narrow pass.
+    """
+    from pyspark.sql import functions as F
+
+    accuracy = max(1, int(1 / relative_error))
+    exprs = [F.count(F.lit(1)).alias("rows")]
+    for i, column in enumerate(df.schema.fields):
+        col = F.col("`" + column.name.replace("`", "``") + "`")
+        type_name = column.dataType.typeName()
+        exprs.append(F.count(col).alias(f"c{i}_count"))
+        if type_name in ORDERED_TYPES:
+            exprs.append(F.approx_count_distinct(col, relative_error).alias(f"c{i}_distinct"))
+            exprs.append(F.min(col).alias(f"c{i}_min"))
+            exprs.append(F.max(col).alias(f"c{i}_max"))
+        if type_name in NUMERIC_TYPES:
+            exprs.append(F.percentile_approx(col, list(QUANTILES), accuracy).alias(f"c{i}_quantiles"))
+
+    row = df.agg(*exprs).collect()[0].asDict()
+    columns = {}
+    for i, column in enumerate(df.schema.fields):
+        quantiles = row.get(f"c{i}_quantiles") or []
+        columns[column.name] = ColumnProfile(
+            non_null_count=row[f"c{i}_count"],
+            distinct_count=row.get(f"c{i}_distinct"),
+            min=row.get(f"c{i}_min"),
+            max=row.get(f"c{i}_max"),
+            quantiles={f"p{int(q * 100):02d}": value for q, value in zip(QUANTILES, quantiles)},
+        )
+    profile = DatasetProfile(row_count=row["rows"], columns=columns, relative_error=relative_error)
+
+    keys = [column.name for column in df.schema.fields if column.dataType.typeName() in KEY_TYPES]
+    candidates = unique_candidates(profile, keys)
+    if candidates:
+        cols = [F.col("`" + name.replace("`", "``") + "`") for name in candidates]
+        exact = df.select(*cols).agg(*[F.countDistinct(col).alias(f"e{i}") for i, col in enumerate(cols)])
+        counts = exact.collect()[0]
+        for i, name in enumerate(candidates):
+            columns[name].exact_distinct_count = counts[f"e{i}"]
+    return profile
+
+
+def _plain(value: Any) -> Any:
+    """Convert Spark result values into YAML-friendly scalars."""
+    if isinstance(value, decimal.Decimal):
+        return float(value)
+    if isinstance(value, datetime.date | datetime.datetime):
+        return value.isoformat()
+    return value
+
+
+def apply_profile(schema: dict, profile: DatasetProfile) -> dict:
+    """Fill `required`, `unique` and ODCS library quality rules on an extracted schema from a profile.
+
+    The schema object gets a `rowCount` rule. Each profiled property records its statistics in
+    `customProperties`; columns without nulls become required, columns whose exact distinct count
+    (see `unique_candidates`) covers every row become unique with a `duplicateCount` rule, and numeric columns get a
+    `validValues` rule with `mustBeBetween` set to the observed range. The approximate distinct
+    count is only recorded, never used to decide uniqueness.
+    """
+    rows = profile.row_count
+    schema["quality"] = [
+        {
+            "type": "library",
+            "rule": "rowCount",
+            "mustBeGreaterThan": 0,
+            "description": f"{rows} rows when profiled",
+        }
+    ]
+    for prop in schema["properties"]:
+        column = profile.columns.get(prop["name"])
+        if column is None:
+            continue
+        nulls = rows - column.non_null_count
+        stats: dict[str, Any] = {"nullCount": nulls, "nullRate": round(nulls / rows, 6) if rows else 0.0}
+        if column.distinct_count is not None:
+            stats["approxDistinctCount"] = column.distinct_count
+        if column.exact_distinct_count is not None:
+            stats["distinctCount"] = column.exact_distinct_count
+        if column.min is not None:
+            stats["min"], stats["max"] = _plain(column.min), _plain(column.max)
+        stats.update({name: _plain(value) for name, value in column.quantiles.items()})
+        prop["customProperties"] = [{"property": "profile", "value": stats}]
+
+        quality = []
+        if rows:
+            prop["required"] = nulls == 0
+        if rows > 0 and nulls == 0 and column.exact_distinct_count == rows:
+            prop["unique"] = True
+            quality.append({"type": "library", "rule": "duplicateCount", "mustBe": 0, "dimension": "uniqueness"})
+        is_number = isinstance(column.min, int | float | decimal.Decimal) and not isinstance(column.min, bool)
+        if is_number and column.max is not None:
+            quality.append(
+                {
+                    "type": "library",
+                    "rule": "validValues",
+                    "mustBeBetween": [float(column.min), float(column.max)],
+                    "dimension": "conformity",
+                }
+            )
+        if quality:
+            prop["quality"] = quality
+    return schema
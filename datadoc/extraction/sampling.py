@@ -0,0 +1,172 @@
+"""Bounded schema inference for row-oriented formats.
+
+Spark infers CSV and JSON schemas by scanning the input, which on large landing zones
+means reading everything. A `SamplingConfig` caps that work by restricting the files
+handed to Spark, asking Spark to sample rows, and limiting the number of lines parsed.
+"""
+
+import glob
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from pyspark.sql import DataFrame, SparkSession
+
+SAMPLED_FORMATS = ("csv", "json")
+
+_SIZE_UNITS = {"": 1, "b": 1, "kb": 1024, "mb": 1024**2, "gb": 1024**3, "tb": 1024**4}
+_SIZE_PATTERN = re.compile(r"^\s*(\d+(?:\.\d+)?)\s*([kmgt]?b?)\s*$", re.IGNORECASE)
+
+
+def parse_size(value: int | str) -> int:
+    """Parse a byte count such as `1048576`, `"512KB"` or `"1.5GB"`."""
+    if isinstance(value, int):
+        return value
+    match = _SIZE_PATTERN.match(value)
+    if not match:
+        raise ValueError(f"Invalid size: {value!r}")
+    number, unit = match.groups()
+    unit = unit.lower()
+    if unit and not unit.endswith("b"):
+        unit += "b"
+    return int(float(number) * _SIZE_UNITS[unit])
+
+
+def format_size(size: int) -> str:
+    """Render a byte count for humans."""
+    amount = float(size)
+    for unit in ("B", "KB", "MB", "GB"):
+        if amount < 1024:
+            return f"{amount:.0f} {unit}" if unit == "B" else f"{amount:.1f} {unit}"
+        amount /= 1024
+    return f"{amount:.1f} TB"
+
+
+@dataclass
+class SamplingConfig:
+    """Limits on how much data schema inference may read."""
+
+    ratio: float | None = None
+    max_rows: int | None = None
+    max_bytes: int | None = None
+    max_files: int | None = None
+
+    @classmethod
+    def from_config(cls, raw: dict[str, Any] | None) -> "SamplingConfig | None":
+        """Build a sampling config from the `sampling` section of an extract config."""
+        if not raw:
+            return None
+        unknown = set(raw) - {"ratio", "max_rows", "max_bytes", "max_files"}
+        if unknown:
+            raise ValueError(f"Unknown sampling settings: {', '.join(sorted(unknown))}")
+        config = cls(
+            ratio=float(raw["ratio"]) if raw.get("ratio") is not None else None,
+            max_rows=int(raw["max_rows"]) if raw.get("max_rows") is not None else None,
+            max_bytes=parse_size(raw["max_bytes"]) if raw.get("max_bytes") is not None else None,
+            max_files=int(raw["max_files"]) if raw.get("max_files") is not None else None,
+        )
+        if config.ratio is not None and not 0 < config.ratio <= 1:
+            raise ValueError("sampling.ratio must be in (0, 1]")
+        for name in ("max_rows", "max_bytes", "max_files"):
+            if (getattr(config, name) or 1) < 1:
+                raise ValueError(f"sampling.{name} must be positive")
+        return config
+
+
+@dataclass
+class SamplingReport:
+    """What a sampled read actually looked at."""
+
+    strategy: list[str] = field(default_factory=list)
+    files_read: int | None = None
+    bytes_read: int | None = None
+    total_files: int | None = None
+    total_bytes: int | None = None
+
+    def describe(self) -> str:
+        """Summarise the sample in one line."""
+        parts = []
+        if self.files_read is not None and self.total_files is not None:
+            size = ""
+            if self.bytes_read is not None and self.total_bytes is not None:
+                size = f" ({format_size(self.bytes_read)} of {format_size(self.total_bytes)})"
+            parts.append(f"{self.files_read} of {self.total_files} files{size}")
+        parts.extend(self.strategy)
+        return ", ".join(parts) if parts else "full scan"
+
+
+def list_data_files(data_path: str) -> list[Path] | None:
+    """List the data files behind a local path, directory or glob in a stable order.
+
+    Hidden and underscore-prefixed files (`_SUCCESS`, `.crc`) are skipped as Spark does.
+    Returns None for paths that are not on the local filesystem.
+    """
+    if "://" in data_path and not data_path.startswith("file://"):
+        return None
+    data_path = data_path.removeprefix("file://")
+    if glob.has_magic(data_path):
+        candidates = [Path(p) for p in glob.glob(data_path, recursive=True)]
+    else:
+        root = Path(data_path)
+        if not root.exists():
+            return None
+        candidates = sorted(root.rglob("*")) if root.is_dir() else [root]
+    return sorted(p for p in candidates if p.is_file() and not p.name.startswith(("_", ".")))
+
+
+def select_files(files: list[Path], config: SamplingConfig) -> list[Path]:
+    """Pick the leading files that fit in `max_files` and `max_bytes`, always keeping one."""
+    selected: list[Path] = []
+    total = 0
+    for path in files:
+        if config.max_files is not None and len(selected) >= config.max_files:
+            break
+        size = path.stat().st_size
+        if selected and config.max_bytes is not None and total + size > config.max_bytes:
+            break
+        selected.append(path)
+        total += size
+    return selected
+
+
+def load_sample(
+    spark: "SparkSession",
+    data_path: str,
+    format: str,
+    options: dict[str, Any],
+    config: SamplingConfig,
+) -> tuple["DataFrame", SamplingReport]:
+    """Load a CSV or JSON dataset for schema inference within the limits of `config`."""
+    report = SamplingReport()
+    options = dict(options)
+    paths: str | list[str] = data_path
+
+    if config.max_files is not None or config.max_bytes is not None:
+        files = list_data_files(data_path)
+        if files is None:
+            report.strategy.append("file limits skipped for non-local path")
+        elif files:
+            selected = select_files(files, config)
+            paths = [str(p) for p in selected]
+            report.files_read, report.total_files = len(selected), len(files)
+            report.bytes_read = sum(p.stat().st_size for p in selected)
+            report.total_bytes = sum(p.stat().st_size for p in files)
+
+    if config.ratio is not None:
+        options["samplingRatio"] = str(config.ratio)
+        report.strategy.append(f"samplingRatio={config.ratio}")
+
+    multiline = str(options.get("multiLine", options.get("multiline", "false"))).lower() == "true"
+    if config.max_rows is not None and multiline:
+        report.strategy.append("max_rows skipped for multiLine input")
+    elif config.max_rows is not None:
+        lines = spark.read.text(paths).limit(config.max_rows).rdd.map(lambda row: row[0])
+        reader = spark.read.options(**options)
+        report.strategy.append(f"first {config.max_rows} lines")
+        if format.lower() == "csv":
+            return reader.csv(lines), report  # type: ignore[arg-type]  # csv() accepts an RDD of lines
+        return reader.json(lines), report
+
+    return spark.read.format(format).options(**options).load(paths), report
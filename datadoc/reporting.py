@@ -0,0 +1,128 @@
+"""Machine-readable validation output.
+
+`jsonl` writes one JSON object per contract as soon as its result is known. `sarif` writes a
+SARIF 2.1.0 log for code scanning tools, streaming its results as they arrive and listing the
+rules that fired once the run is over. Neither imports rich, so output cost stays flat however
+many contracts are validated.
+"""
+
+import json
+from collections.abc import Iterable
+from pathlib import Path
+from typing import IO, TYPE_CHECKING, Any
+
+from datadoc import __version__
+from datadoc.timing import span
+from datadoc.validation import ValidationResult
+
+if TYPE_CHECKING:
+    from datadoc.watch import Update
+
+FORMATS = ("text", "jsonl", "sarif")
+SARIF_SCHEMA = "https://json.schemastore.org/sarif-2.1.0.json"
+
+
+def record(result: ValidationResult, engine: str) -> dict[str, Any]:
+    """Describe one contract's result as a flat JSON record."""
+    if result.valid:
+        status = "valid"
+    elif result.error_type == "contract":
+        status = "invalid"
+    else:
+        status = "error"
+    return {
+        "file": result.path,
+        "document": result.document,
+        "id": (result.contract or {}).get("id"),
+        "status": status,
+        "engine": engine,
+        "cached": result.cached,
+        "duration_ms": None if result.duration_ms is None else round(result.duration_ms, 3),
+        "error_type": result.error_type,
+        "errors": result.errors,
+        "message": None if result.valid or result.errors else result.message,
+    }
+
+
+def write_jsonl(results: Iterable[ValidationResult], engine: str, out: IO[str]) -> int:
+    """Write one line per result, flushing each so consumers see it immediately.
+
+    Returns the number of contracts that did not validate.
+    """
+    failed = 0
+    dumps = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+    for result in results:
+        failed += not result.valid
+        with span("render"):
+            out.write(dumps(record(result, engine)) + "\n")
+            out.flush()
+    return failed
+
+
+def _sarif_results(result: ValidationResult, rules: dict[str, dict[str, Any]]) -> list[dict[str, Any]]:
+    """Turn a failed result into SARIF results, one per reported error."""
+    path = Path(result.path)
+    uri = path.as_uri() if path.is_absolute() else path.as_posix()
+    properties: dict[str, Any] = {"contractId": (result.contract or {}).get("id")}
+    if result.document is not None:
+        properties["document"] = result.document
+    location = {"physicalLocation": {"artifactLocation": {"uri": uri}}}
+    errors = result.errors or [{"loc": [], "msg": result.message or "", "type": result.error_type or "error"}]
+    found = []
+    for error in errors:
+        rule_id = f"odcs/{error['type']}" if result.error_type == "contract" else str(result.error_type)
+        rules.setdefault(rule_id, {"id": rule_id, "shortDescription": {"text": f"ODCS check failed: {error['type']}"}})
+        loc = ".".join(str(key) for key in error["loc"])
+        found.append(
+            {
+                "ruleId": rule_id,
+                "level": "error",
+                "message": {"text": f"{loc}: {error['msg']}" if loc else error["msg"]},
+                "locations": [{**location, "logicalLocations": [{"fullyQualifiedName": loc}]} if loc else location],
+                "properties": properties,
+            }
+        )
+    return found
+
+
+def write_sarif(results: Iterable[ValidationResult], engine: str, out: IO[str]) -> int:
+    """Write a SARIF log with one result per validation error.
+
+    Returns the number of contracts that did not validate.
+    """
+    failed = 0
+    rules: dict[str, dict[str, Any]] = {}
+    out.write(f'{{"$schema":"{SARIF_SCHEMA}","version":"2.1.0","runs":[{{"results":[')
+    separator = ""
+    for result in results:
+        if result.valid:
+            continue
+        failed += 1
+        with span("render"):
+            for item in _sarif_results(result, rules):
+                out.write(separator + json.dumps(item, ensure_ascii=False))
+                separator = ","
+            out.flush()
+    driver = {
+        "name": "datadoc",
+        "version": __version__,
+        "rules": list(rules.values()),
+        "properties": {"engine": engine},
+    }
+    out.write(f'],"tool":{json.dumps({"driver": driver})}}}]}}\n')
+    out.flush()
+    return failed
+
+
+def write_update_jsonl(update: "Update", engine: str, out: IO[str]) -> None:
+    """Write the records of a watch update, followed by removal and duplicate `id` events."""
+    write_jsonl(update.results, engine, out)
+    events: list[dict[str, Any]] = [{"event": "removed", "file": path} for path in update.removed]
+    events += [{"event": "duplicate_id", "id": key, "files": files} for key, files in update.duplicates.items()]
+    events += [{"event": "duplicate_id_resolved", "id": key} for key in update.resolved]
+    for event in events:
+        out.write(json.dumps(event, ensure_ascii=False) + "\n")
+    out.flush()
+
+
+WRITERS = {"jsonl": write_jsonl, "sarif": write_sarif}
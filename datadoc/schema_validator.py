@@ -0,0 +1,544 @@
+"""Compile a JSON schema into nested Python closures for fast validation.
+
+General-purpose validators interpret the schema on every call: they look up keywords,
+resolve `$ref`s and create a child validator per subschema and per instance location.
+`CompiledSchema` does that work once. Every subschema becomes a closure that only runs the
+keyword checks it actually has, `$ref`s are resolved ahead of time, and instance paths are
+only materialised when an error is reported. Subschemas that are only probed (`if`, `anyOf`,
+`oneOf`, `not`) stop at their first failure without building any error.
+
+The supported vocabulary covers what the ODCS schema uses (draft 2019-09, including
+`unevaluatedProperties` and `if`/`then`/`else`). Any other assertion keyword raises
+`UnsupportedSchema` at compile time rather than being silently ignored. `format` is an
+annotation, as it is by default in draft 2019-09.
+"""
+
+import re
+from collections.abc import Callable
+from typing import Any, NamedTuple
+
+# A check validates `instance` at `path` and returns whether it is valid. Problems are
+# appended to `errors`, or the check stops at the first one when `errors` is None. When
+# `evaluated` is a set, it records the property names it evaluated (`unevaluatedProperties`).
+Check = Callable[[Any, Any, "list | None", "set[str] | None"], bool]
+
+ANNOTATIONS = frozenset(
+    {
+        "$schema",
+        "$id",
+        "$anchor",
+        "$comment",
+        "$defs",
+        "definitions",
+        "title",
+        "description",
+        "default",
+        "examples",
+        "format",
+        "deprecated",
+        "readOnly",
+        "writeOnly",
+        "contentEncoding",
+        "contentMediaType",
+    }
+)
+
+TYPES: dict[str, Callable[[Any], bool]] = {
+    "object": lambda v: isinstance(v, dict),
+    "array": lambda v: isinstance(v, list),
+    "string": lambda v: isinstance(v, str),
+    "boolean": lambda v: isinstance(v, bool),
+    "null": lambda v: v is None,
+    "number": lambda v: isinstance(v, int | float) and not isinstance(v, bool),
+    "integer": lambda v: (isinstance(v, int) and not isinstance(v, bool)) or (isinstance(v, float) and v.is_integer()),
+}
+
+
+class UnsupportedSchema(ValueError):
+    """The schema uses a keyword or reference the compiler does not implement."""
+
+
+class SchemaError(NamedTuple):
+    """One validation failure: where it happened, what is wrong and which keyword failed."""
+
+    loc: list[str | int]
+    msg: str
+    type: str
+
+
+class CompiledSchema:
+    """A JSON schema compiled once into a reusable validator."""
+
+    def __init__(self, schema: dict[str, Any] | bool) -> None:
+        self.schema = schema
+        self._check = _Compiler(schema).compile(schema)
+
+    def iter_errors(self, instance: Any) -> list[SchemaError]:
+        """Return every error for `instance`; an empty list means it is valid."""
+        errors: list[SchemaError] = []
+        self._check(instance, None, errors, None)
+        return errors
+
+    def is_valid(self, instance: Any) -> bool:
+        """Return True if `instance` satisfies the schema, stopping at the first error."""
+        return self._check(instance, None, None, None)
+
+
+def _loc(path: Any) -> list[str | int]:
+    """Flatten a `(parent, key)` linked path into a list of keys."""
+    keys = []
+    while path is not None:
+        path, key = path
+        keys.append(key)
+    keys.reverse()
+    return keys
+
+
+def _error(path: Any, message: str, keyword: str) -> SchemaError:
+    return SchemaError(_loc(path), message, keyword)
+
+
+def _equal(left: Any, right: Any) -> bool:
+    """Compare two JSON values; unlike `==`, booleans never equal numbers."""
+    if isinstance(left, bool) or isinstance(right, bool):
+        return isinstance(left, bool) and isinstance(right, bool) and left == right
+    if isinstance(left, list) and isinstance(right, list):
+        return len(left) == len(right) and all(_equal(a, b) for a, b in zip(left, right))
+    if isinstance(left, dict) and isinstance(right, dict):
+        return left.keys() == right.keys() and all(_equal(left[k], right[k]) for k in left)
+    return bool(left == right)
+
+
+def _freeze(value: Any) -> Any:
+    """Make a JSON value hashable with the equality of `_equal`."""
+    if isinstance(value, dict):
+        return ("object", frozenset((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, list):
+        return ("array", tuple(_freeze(v) for v in value))
+    if isinstance(value, bool):
+        return ("boolean", value)
+    return ("value", value)
+
+
+def _unexpected(keys: list[str]) -> str:
+    names = ", ".join(repr(k) for k in keys)
+    return f"{names} {'was' if len(keys) == 1 else 'were'} unexpected"
+
+
+def _accept(instance: Any, path: Any, errors: list | None, evaluated: set[str] | None) -> bool:
+    return True
+
+
+def _reject(instance: Any, path: Any, errors: list | None, evaluated: set[str] | None) -> bool:
+    if errors is not None:
+        errors.append(_error(path, f"False schema does not allow {instance!r}", "false"))
+    return False
+
+
+def _sequence(checks: list[Check]) -> Check:
+    """Run several checks on the same instance, all of which must pass."""
+
+    def check(instance: Any, path: Any, errors: list | None, evaluated: set[str] | None) -> bool:
+        valid = True
+        for keyword_check in checks:
+            if not keyword_check(instance, path, errors, evaluated):
+                if errors is None:
+                    return False
+                valid = False
+        return valid
+
+    return check
+
+
+class _Compiler:
+    """Compiles the subschemas of one root schema, sharing compiled `$ref` targets."""
+
+    def __init__(self, root: dict[str, Any] | bool) -> None:
+        self.root = root
+        self.refs: dict[str, Check] = {}
+
+    def compile(self, node: Any) -> Check:
+        if node is True:
+            return _accept
+        if node is False:
+            return _reject
+        if not isinstance(node, dict):
+            raise UnsupportedSchema(f"Not a schema: {node!r}")
+        unknown = set(node) - ANNOTATIONS - set(KEYWORDS) - {"unevaluatedProperties", "then", "else"}
+        if unknown:
+            raise UnsupportedSchema(f"Unsupported keywords: {', '.join(sorted(unknown))}")
+
+        checks = [KEYWORDS[keyword](self, node) for keyword in KEYWORDS if keyword in node]
+        if "unevaluatedProperties" in node:
+            return self._unevaluated(checks, node["unevaluatedProperties"])
+        if not checks:
+            return _accept
+        if len(checks) == 1:
+            return checks[0]
+        return _sequence(checks)
+
+    def ref(self, pointer: str) -> Check:
+        """Compile the target of a local `$ref`, once, allowing recursive references."""
+        compiled = self.refs.get(pointer)
+        if compiled is not None:
+            return compiled
+        slot: list[Check] = []
+
+        def trampoline(instance: Any, path: Any, errors: list | None, evaluated: set[str] | None) -> bool:
+            return slot[0](instance, path, errors, evaluated)
+
+        self.refs[pointer] = trampoline
+        slot.append(self.compile(self._resolve(pointer)))
+        self.refs[pointer] = slot[0]
+        return slot[0]
+
+    def _resolve(self, pointer: str) -> Any:
+        if not pointer.startswith("#"):
+            raise UnsupportedSchema(f"Only local references are supported, got {pointer!r}")
+        target: Any = self.root
+        for part in pointer[1:].lstrip("/").split("/") if pointer != "#" else []:
+            part = part.replace("~1", "/").replace("~0", "~")
+            try:
+                target = target[int(part)] if isinstance(target, list) else target[part]
+            except (KeyError, IndexError, ValueError):
+                raise UnsupportedSchema(f"Unresolvable reference {pointer!r}")
+        return target
+
+    def _unevaluated(self, checks: list[Check], schema: Any) -> Check:
+        sub = None if schema is False else self.compile(schema)
+        others = _sequence(checks)
+
+        def check(instance: Any, path: Any, errors: list | None, evaluated: set[str] | None) -> bool:
+            if not isinstance(instance, dict):
+                return others(instance, path, errors, None)
+            seen: set[str] = set()
+            valid = others(instance, path, errors, seen)
+            if not valid and errors is None:
+                return False
+            extra = [key for key in instance if key not in seen]
+            if extra and sub is None:
+                if errors is not None:
+                    message = f"Unevaluated properties are not allowed ({_unexpected(extra)})"
+                    errors.append(_error(path, message, "unevaluatedProperties"))
+                return False
+            if sub is not None:
+                for key in extra:
+                    if not sub(instance[key], (path, key), errors, None):
+                        if errors is None:
+                            return False
+                        valid = False
+            if evaluated is not None:
+                evaluated.update(instance)
+            return valid
+
+        return check
+
+
+def _type(compiler: _Compiler, node: dict) -> Check:
+    names = [node["type"]] if isinstance(node["type"], str) else list(node["type"])
+    if any(name not in TYPES for name in names):
+        raise UnsupportedSchema(f"Unknown type in {names!r}")
+    predicates = [TYPES[name] for name in names]
+    expected = ", ".join(repr(name) for name in names)
+
+    def check(instance: Any, path: Any, errors: list | None, evaluated: set[str] | None) -> bool:
+        for predicate in predicates:
+            if predicate(instance):
+                return True
+        if errors is not None:
+            errors.append(_error(path, f"{instance!r} is not of type {expected}", "type"))
+        return False
+
+    return check
+
+
+def _enum(compiler: _Compiler, node: dict) -> Check:
+    options = list(node["enum"])
+    strings = frozenset(options) if all(isinstance(o, str) for o in options) else None
+
+    def check(instance: Any, path: Any, errors: list | None, evaluated: set[str] | None) -> bool:
+        if strings is not None:
+            if isinstance(instance, str) and instance in strings:
+                return True
+        elif any(_equal(instance, option) for option in options):
+            return True
+        if errors is not None:
+            errors.append(_error(path, f"{instance!r} is not one of {options!r}", "enum"))
+        return False
+
+    return check
+
+
+def _const(compiler: _Compiler, node: dict) -> Check:
+    expected = node["const"]
+
+    def check(instance: Any, path: Any, errors: list | None, evaluated: set[str] | None) -> bool:
+        if isinstance(expected, str) and isinstance(instance, str):
+            valid = instance == expected
+        else:
+            valid = _equal(instance, expected)
+        if not valid and errors is not None:
+            errors.append(_error(path, f"{expected!r} was expected", "const"))
+        return valid
+
+    return check
+
+
+def _required(compiler: _Compiler, node: dict) -> Check:
+    names = list(node["required"])
+
+    def check(instance: Any, path: Any, errors: list | None, evaluated: set[str] | None) -> bool:
+        if not isinstance(instance, dict):
+            return True
+        valid = True
+        for name in names:
+            if name not in instance:
+                if errors is None:
+                    return False
+                errors.append(_error(path, f"{name!r} is a required property", "required"))
+                valid = False
+        return valid
+
+    return check
+
+
+def _properties(compiler: _Compiler, node: dict) -> Check:
+    subs = {name: compiler.compile(schema) for name, schema in node["properties"].items()}
+
+    def check(instance: Any, path: Any, errors: list | None, evaluated: set[str] | None) -> bool:
+        if not isinstance(instance, dict):
+            return True
+        valid = True
+        for key, value in instance.items():
+            sub = subs.get(key)
+            if sub is None:
+                continue
+            if evaluated is not None:
+                evaluated.add(key)
+            if not sub(value, (path, key), errors, None):
+                if errors is None:
+                    return False
+                valid = False
+        return valid
+
+    return check
+
+
+def _additional_properties(compiler: _Compiler, node: dict) -> Check:
+    known = frozenset(node.get("properties") or ())
+    schema = node["additionalProperties"]
+    sub = None if schema is False else compiler.compile(schema)
+
+    def check(instance: Any, path: Any, errors: list | None, evaluated: set[str] | None) -> bool:
+        if not isinstance(instance, dict):
+            return True
+        extra = [key for key in instance if key not in known]
+        if not extra:
+            return True
+        if sub is None:
+            if errors is not None:
+                message = f"Additional properties are not allowed ({_unexpected(extra)})"
+                errors.append(_error(path, message, "additionalProperties"))
+            return False
+        if evaluated is not None:
+            evaluated.update(extra)
+        valid = True
+        for key in extra:
+            if not sub(instance[key], (path, key), errors, None):
+                if errors is None:
+                    return False
+                valid = False
+        return valid
+
+    return check
+
+
+def _items(compiler: _Compiler, node: dict) -> Check:
+    if isinstance(node["items"], list):
+        raise UnsupportedSchema("Tuple validation with an array of items is not supported")
+    sub = compiler.compile(node["items"])
+
+    def check(instance: Any, path: Any, errors: list | None, evaluated: set[str] | None) -> bool:
+        if not isinstance(instance, list):
+            return True
+        valid = True
+        for index, item in enumerate(instance):
+            if not sub(item, (path, index), errors, None):
+                if errors is None:
+                    return False
+                valid = False
+        return valid
+
+    return check
+
+
+def _bound(
+    keyword: str,
+    applies: Callable[[Any], bool],
+    measure: Callable[[Any], Any],
+    fails: Callable[[Any, Any], bool],
+    text: str,
+) -> Callable[[_Compiler, dict], Check]:
+    """Build a compiler for a keyword that compares a measure of the instance to a limit."""
+
+    def compile_bound(compiler: _Compiler, node: dict) -> Check:
+        limit = node[keyword]
+
+        def check(instance: Any, path: Any, errors: list | None, evaluated: set[str] | None) -> bool:
+            if not applies(instance) or not fails(measure(instance), limit):
+                return True
+            if errors is not None:
+                errors.append(_error(path, f"{instance!r} {text.format(limit=limit)}", keyword))
+            return False
+
+        return check
+
+    return compile_bound
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, int | float) and not isinstance(value, bool)
+
+
+def _same(value: Any) -> Any:
+    return value
+
+
+def _unique_items(compiler: _Compiler, node: dict) -> Check:
+    if not node["uniqueItems"]:
+        return _accept
+
+    def check(instance: Any, path: Any, errors: list | None, evaluated: set[str] | None) -> bool:
+        if not isinstance(instance, list) or len({_freeze(item) for item in instance}) == len(instance):
+            return True
+        if errors is not None:
+            errors.append(_error(path, f"{instance!r} has non-unique elements", "uniqueItems"))
+        return False
+
+    return check
+
+
+def _pattern(compiler: _Compiler, node: dict) -> Check:
+    pattern = re.compile(node["pattern"])
+
+    def check(instance: Any, path: Any, errors: list | None, evaluated: set[str] | None) -> bool:
+        if not isinstance(instance, str) or pattern.search(instance):
+            return True
+        if errors is not None:
+            errors.append(_error(path, f"{instance!r} does not match {pattern.pattern!r}", "pattern"))
+        return False
+
+    return check
+
+
+def _ref(compiler: _Compiler, node: dict) -> Check:
+    return compiler.ref(node["$ref"])
+
+
+def _all_of(compiler: _Compiler, node: dict) -> Check:
+    return _sequence([compiler.compile(schema) for schema in node["allOf"]])
+
+
+def _any_of(compiler: _Compiler, node: dict) -> Check:
+    subs = [compiler.compile(schema) for schema in node["anyOf"]]
+
+    def check(instance: Any, path: Any, errors: list | None, evaluated: set[str] | None) -> bool:
+        matched = False
+        for sub in subs:
+            seen: set[str] | None = set() if evaluated is not None else None
+            if sub(instance, path, None, seen):
+                matched = True
+                if evaluated is None:
+                    break
+                evaluated.update(seen or ())
+        if not matched and errors is not None:
+            errors.append(_error(path, f"{instance!r} is not valid under any of the given schemas", "anyOf"))
+        return matched
+
+    return check
+
+
+def _one_of(compiler: _Compiler, node: dict) -> Check:
+    subs = [compiler.compile(schema) for schema in node["oneOf"]]
+
+    def check(instance: Any, path: Any, errors: list | None, evaluated: set[str] | None) -> bool:
+        matches = []
+        for sub in subs:
+            seen: set[str] = set()
+            if sub(instance, path, None, seen):
+                matches.append(seen)
+        if len(matches) == 1:
+            if evaluated is not None:
+                evaluated.update(matches[0])
+            return True
+        if errors is not None:
+            problem = "is not valid under any" if not matches else "is valid under more than one"
+            errors.append(_error(path, f"{instance!r} {problem} of the given schemas", "oneOf"))
+        return False
+
+    return check
+
+
+def _not(compiler: _Compiler, node: dict) -> Check:
+    sub = compiler.compile(node["not"])
+
+    def check(instance: Any, path: Any, errors: list | None, evaluated: set[str] | None) -> bool:
+        if not sub(instance, path, None, None):
+            return True
+        if errors is not None:
+            errors.append(_error(path, f"{instance!r} should not be valid under {node['not']!r}", "not"))
+        return False
+
+    return check
+
+
+def _if(compiler: _Compiler, node: dict) -> Check:
+    condition = compiler.compile(node["if"])
+    then = compiler.compile(node["then"]) if "then" in node else _accept
+    otherwise = compiler.compile(node["else"]) if "else" in node else _accept
+
+    def check(instance: Any, path: Any, errors: list | None, evaluated: set[str] | None) -> bool:
+        seen: set[str] | None = set() if evaluated is not None else None
+        if condition(instance, path, None, seen):
+            if evaluated is not None and seen:
+                evaluated.update(seen)
+            return then(instance, path, errors, evaluated)
+        return otherwise(instance, path, errors, evaluated)
+
+    return check
+
+
+# Keyword compilers, in evaluation order. `unevaluatedProperties` always runs last.
+KEYWORDS: dict[str, Callable[[_Compiler, dict], Check]] = {
+    "$ref": _ref,
+    "type": _type,
+    "enum": _enum,
+    "const": _const,
+    "required": _required,
+    "properties": _properties,
+    "additionalProperties": _additional_properties,
+    "items": _items,
+    "minItems": _bound("minItems", lambda v: isinstance(v, list), len, lambda n, m: n < m, "is too short"),
+    "maxItems": _bound("maxItems", lambda v: isinstance(v, list), len, lambda n, m: n > m, "is too long"),
+    "uniqueItems": _unique_items,
+    "minLength": _bound("minLength", lambda v: isinstance(v, str), len, lambda n, m: n < m, "is too short"),
+    "maxLength": _bound("maxLength", lambda v: isinstance(v, str), len, lambda n, m: n > m, "is too long"),
+    "pattern": _pattern,
+    "minimum": _bound("minimum", _is_number, _same, lambda n, m: n < m, "is less than the minimum of {limit!r}"),
+    "maximum": _bound("maximum", _is_number, _same, lambda n, m: n > m, "is greater than the maximum of {limit!r}"),
+    "exclusiveMinimum": _bound(
+        "exclusiveMinimum", _is_number, _same, lambda n, m: n <= m, "is less than or equal to the minimum of {limit!r}"
+    ),
+    "exclusiveMaximum": _bound(
+        "exclusiveMaximum",
+        _is_number,
+        _same,
+        lambda n, m: n >= m,
+        "is greater than or equal to the maximum of {limit!r}",
+    ),
+    "allOf": _all_of,
+    "anyOf": _any_of,
+    "oneOf": _one_of,
+    "not": _not,
+    "if": _if,
+}
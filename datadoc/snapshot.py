@@ -0,0 +1,289 @@
+"""Compiled contract snapshots that reload without parsing YAML.
+
+`datadoc compile` validates contract files and writes a snapshot next to each one
+(`orders.yaml` → `orders.yaml.snapshot`): a length-prefixed binary file holding a JSON header
+and the trusted form (see `datadoc.trusted`) of every document in the file. The header records
+the datadoc version, a fingerprint of the ODCS models, and the size, modification time and hash
+of the YAML it was compiled from. The commands and `datadoc.api` ask `documents` first and only
+parse YAML when a file has no snapshot or its snapshot is stale, i.e. the source was modified
+since or the models changed.
+
+Records are JSON, so the header also lists where each document holds a YAML date or
+timestamp, and `documents` turns those back into `date` and `datetime` objects: a document
+reloads exactly as YAML parsed it. Files holding other values JSON cannot keep (binary
+scalars, sets, non-string keys, NaN) are not compiled and keep being read from YAML.
+
+A set of contracts can instead be packed into a single bundle whose header indexes every
+contract by `id` with the offset and length of its record. `Bundle` memory-maps the file and
+decodes only the contracts it is asked for.
+
+Both files are laid out as
+
+    magic (8 bytes) | header length (uint32, big-endian) | header (JSON) | records
+
+where a snapshot's records are each prefixed with their length and a bundle's sit back to back
+at the offsets of its index.
+"""
+
+import hashlib
+import json
+import math
+import mmap
+import os
+import struct
+from collections.abc import Iterator, Mapping, Sequence
+from datetime import date, datetime
+from pathlib import Path
+from types import TracebackType
+from typing import TYPE_CHECKING, Any, Self
+
+from datadoc import __version__, trusted
+from datadoc.cache import model_fingerprint
+
+if TYPE_CHECKING:
+    from datadoc.models.odcs import OpenDataContractStandardODCS
+
+SUFFIX = ".snapshot"
+FORMAT = 2
+_SNAPSHOT_MAGIC = b"DDSNAP\x00\x01"
+_BUNDLE_MAGIC = b"DDBNDL\x00\x01"
+_LENGTH = struct.Struct(">I")
+
+
+class SnapshotError(ValueError):
+    """A snapshot or bundle is malformed, was compiled for other ODCS models, or cannot hold a document."""
+
+
+# A path into a document and the type of the value it leads to, "date" or "datetime".
+TypedValue = tuple[list[str | int], str]
+
+
+def snapshot_path(source: str | os.PathLike[str]) -> Path:
+    """Where the snapshot of a contract file is written."""
+    source = Path(source)
+    return source.with_name(source.name + SUFFIX)
+
+
+def source_info(stat: os.stat_result, data: bytes) -> dict[str, Any]:
+    """Identify the version of a contract file a snapshot is compiled from.
+
+    Take `stat` before reading `data`, so a file modified in between makes the snapshot stale.
+    """
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": hashlib.sha256(data).hexdigest()}
+
+
+def _typed_values(value: Any, path: list[str | int]) -> Iterator[TypedValue]:
+    """Find the dates and timestamps in a document, raising `SnapshotError` for values JSON cannot keep."""
+    if isinstance(value, dict):
+        for key, item in value.items():
+            if not isinstance(key, str):
+                raise SnapshotError(f"{'.'.join(map(str, path)) or 'The document'} has a non-string key {key!r}")
+            yield from _typed_values(item, [*path, key])
+    elif isinstance(value, list):
+        for index, item in enumerate(value):
+            yield from _typed_values(item, [*path, index])
+    elif isinstance(value, datetime):
+        yield path, "datetime"
+    elif isinstance(value, date):
+        yield path, "date"
+    elif not isinstance(value, str | int | float | None) or (isinstance(value, float) and not math.isfinite(value)):
+        raise SnapshotError(f"{'.'.join(map(str, path))} holds {value!r}, which a snapshot cannot keep")
+
+
+def _encode(document: Any) -> tuple[bytes, list[TypedValue]]:
+    """Return the record of a document and where it holds dates and timestamps."""
+    typed = list(_typed_values(document, []))
+    return trusted.dump(document), typed
+
+
+def _decode(record: bytes, typed: Sequence[TypedValue]) -> Any:
+    """Load a record, restoring its dates and timestamps."""
+    document = trusted.load_document(record)
+    for path, kind in typed:
+        parent = document
+        for key in path[:-1]:
+            parent = parent[key]
+        convert = datetime.fromisoformat if kind == "datetime" else date.fromisoformat
+        if path:
+            parent[path[-1]] = convert(parent[path[-1]])
+        else:
+            document = convert(document)
+    return document
+
+
+def _header() -> dict[str, Any]:
+    return {"format": FORMAT, "datadoc": __version__, "models": model_fingerprint("pydantic")}
+
+
+def _pack(magic: bytes, header: Mapping[str, Any]) -> bytes:
+    encoded = json.dumps(header, separators=(",", ":")).encode()
+    return magic + _LENGTH.pack(len(encoded)) + encoded
+
+
+def _unpack(buffer: bytes | mmap.mmap, magic: bytes) -> tuple[dict[str, Any], int]:
+    """Read the header of a snapshot or bundle, returning it and the offset of the records."""
+    start = len(magic) + _LENGTH.size
+    if len(buffer) < start or buffer[: len(magic)] != magic:
+        raise SnapshotError("Not a datadoc snapshot" if magic == _SNAPSHOT_MAGIC else "Not a datadoc bundle")
+    (length,) = _LENGTH.unpack_from(buffer, len(magic))
+    header = json.loads(buffer[start : start + length])
+    if header.get("format") != FORMAT:
+        raise SnapshotError(f"Unsupported snapshot format {header.get('format')!r}")
+    return header, start + length
+
+
+def _write_atomic(path: Path, chunks: Sequence[bytes]) -> None:
+    partial = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        with open(partial, "wb") as f:
+            f.writelines(chunks)
+        os.replace(partial, path)
+    finally:
+        partial.unlink(missing_ok=True)
+
+
+def write(source: str | os.PathLike[str], documents: Sequence[Any], info: Mapping[str, Any]) -> Path:
+    """Write the snapshot of a contract file's validated `documents`; `info` comes from `source_info`.
+
+    Raises `SnapshotError`, writing nothing, if a document holds values a snapshot cannot keep.
+    """
+    records, typed = zip(*map(_encode, documents)) if documents else ((), ())
+    header = {**_header(), "source": dict(info), "documents": len(records), "typed": list(typed)}
+    chunks = [_pack(_SNAPSHOT_MAGIC, header)]
+    for record in records:
+        chunks += [_LENGTH.pack(len(record)), record]
+    path = snapshot_path(source)
+    _write_atomic(path, chunks)
+    return path
+
+
+def documents(source: str | os.PathLike[str], data: bytes | None = None) -> list[Any] | None:
+    """Return the documents of a contract file from its snapshot, or None without a fresh one.
+
+    The snapshot is fresh when it was compiled for the current models and the file still has the
+    size and modification time it was compiled from or, when its content `data` has been read
+    already, the same hash. Unreadable or malformed snapshots are ignored.
+    """
+    try:
+        with open(snapshot_path(source), "rb") as f:
+            snapshot = f.read()
+        stat = os.stat(source) if data is None else None
+        header, offset = _unpack(snapshot, _SNAPSHOT_MAGIC)
+    except (OSError, ValueError):
+        return None
+    recorded = header.get("source") or {}
+    if header.get("models") != model_fingerprint("pydantic"):
+        return None
+    if stat is not None:
+        if (stat.st_size, stat.st_mtime_ns) != (recorded.get("size"), recorded.get("mtime_ns")):
+            return None
+    elif hashlib.sha256(data or b"").hexdigest() != recorded.get("sha256"):
+        return None
+    found = []
+    try:
+        for number in range(header["documents"]):
+            (length,) = _LENGTH.unpack_from(snapshot, offset)
+            offset += _LENGTH.size
+            found.append(_decode(snapshot[offset : offset + length], header["typed"][number]))
+            offset += length
+    except (KeyError, IndexError, TypeError, ValueError, struct.error):
+        return None
+    return found
+
+
+def load(source: str | os.PathLike[str]) -> Any:
+    """Return the first document of a contract file, from its snapshot when fresh, else from YAML."""
+    found = documents(source)
+    if found is not None:
+        return found[0] if found else None
+    from datadoc import yaml_io
+
+    with open(source, "rb") as f:
+        return yaml_io.load(f)
+
+
+def write_bundle(path: str | os.PathLike[str], contracts: Mapping[str, tuple[str, Any]]) -> Path:
+    """Pack validated documents, keyed by contract `id` with the file each came from, into a bundle.
+
+    Raises `SnapshotError`, writing nothing, if a document holds values a bundle cannot keep.
+    """
+    index: dict[str, dict[str, Any]] = {}
+    records: list[bytes] = []
+    offset = 0
+    for key, (source, document) in contracts.items():
+        try:
+            record, typed = _encode(document)
+        except SnapshotError as e:
+            raise SnapshotError(f"{source}: {e}") from e
+        index[key] = {"source": source, "offset": offset, "length": len(record)}
+        if typed:
+            index[key]["typed"] = typed
+        records.append(record)
+        offset += len(record)
+    path = Path(path)
+    _write_atomic(path, [_pack(_BUNDLE_MAGIC, {**_header(), "contracts": index}), *records])
+    return path
+
+
+class Bundle(Mapping[str, Any]):
+    """A memory-mapped bundle of compiled contracts, mapping each `id` to its document.
+
+    Only the index is read on opening; each lookup decodes one contract's record. `load` builds
+    the ODCS models of a contract instead of returning its raw document.
+    """
+
+    def __init__(self, path: str | os.PathLike[str]) -> None:
+        with open(path, "rb") as f:
+            try:
+                self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError as e:
+                raise SnapshotError(f"{path} is empty") from e
+        try:
+            header, self._start = _unpack(self._map, _BUNDLE_MAGIC)
+            if header.get("models") != model_fingerprint("pydantic"):
+                raise SnapshotError(f"{path} was compiled for other ODCS models, run `datadoc compile` again")
+        except BaseException:
+            self._map.close()
+            raise
+        self.index: dict[str, dict[str, Any]] = header["contracts"]
+
+    def record(self, key: str) -> bytes:
+        """Return the trusted form of a contract, see `datadoc.trusted`."""
+        entry = self.index[key]
+        start = self._start + entry["offset"]
+        return self._map[start : start + entry["length"]]
+
+    def __getitem__(self, key: str) -> Any:
+        return _decode(self.record(key), self.index[key].get("typed", ()))
+
+    def load(self, key: str) -> "OpenDataContractStandardODCS":
+        """Build the ODCS models of a contract, from its record in one pass unless it holds dates."""
+        if not self.index[key].get("typed"):
+            return trusted.load(self.record(key))
+        from datadoc.models.odcs import OpenDataContractStandardODCS
+
+        return OpenDataContractStandardODCS.model_validate(self[key])
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.index)
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self.index
+
+    def close(self) -> None:
+        """Unmap the bundle."""
+        self._map.close()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self.close()
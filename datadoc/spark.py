@@ -0,0 +1,40 @@
+"""Shared SparkSession management."""
+
+import threading
+from typing import TYPE_CHECKING
+
+from datadoc.timing import span
+
+if TYPE_CHECKING:
+    from pyspark.sql import SparkSession
+
+
+class SharedSparkSession:
+    """Start one SparkSession on first use and share it between worker threads.
+
+    The session uses FAIR scheduling and every calling thread is put in its own scheduler
+    pool, so jobs submitted concurrently share the cluster instead of queueing.
+    """
+
+    def __init__(self, app_name: str = "SchemaExtractor") -> None:
+        self.app_name = app_name
+        self._spark: SparkSession | None = None
+        self._lock = threading.Lock()
+
+    def __call__(self) -> "SparkSession":
+        with self._lock:
+            if self._spark is None:
+                with span("spark.session"):
+                    from pyspark.sql import SparkSession
+
+                    self._spark = (
+                        SparkSession.builder.appName(self.app_name).config("spark.scheduler.mode", "FAIR").getOrCreate()
+                    )
+        self._spark.sparkContext.setLocalProperty("spark.scheduler.pool", threading.current_thread().name)
+        return self._spark
+
+    def stop(self) -> None:
+        """Stop the session if one was started."""
+        if self._spark is not None:
+            self._spark.stop()
+            self._spark = None
@@ -0,0 +1,172 @@
+"""Per-phase timing for `--profile`.
+
+Code marks its phases with `span`:
+
+    with span("yaml.parse"):
+        content = yaml_io.load(data)
+
+Spans cost one global lookup while no `Recorder` is active, so they stay in hot paths. Once
+`enable` is called, every span records its start and duration on the calling thread; nested
+spans are subtracted from their parent's self time. Spans opened in worker processes are not
+recorded.
+"""
+
+import functools
+import json
+import os
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, TypeVar
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+@dataclass
+class Span:
+    """One timed phase."""
+
+    name: str
+    start_ns: int
+    duration_ns: int
+    self_ns: int
+    thread: int
+
+
+@dataclass
+class Phase:
+    """All spans of one name."""
+
+    name: str
+    calls: int = 0
+    total_ns: int = 0
+    self_ns: int = 0
+
+
+class Recorder:
+    """Collects the spans of a run."""
+
+    def __init__(self) -> None:
+        self.started_ns = time.perf_counter_ns()
+        self.thread = threading.get_ident()
+        self.spans: list[Span] = []
+        self._local = threading.local()
+
+    def _stack(self) -> list["_ActiveSpan"]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def elapsed_ns(self) -> int:
+        return time.perf_counter_ns() - self.started_ns
+
+    def unattributed_ns(self) -> int:
+        """Time the main thread spent outside any span."""
+        covered = sum(span.self_ns for span in self.spans if span.thread == self.thread)
+        return max(0, self.elapsed_ns() - covered)
+
+    def phases(self) -> list[Phase]:
+        """Aggregate spans by name, largest self time first."""
+        phases: dict[str, Phase] = {}
+        for span in self.spans:
+            phase = phases.setdefault(span.name, Phase(span.name))
+            phase.calls += 1
+            phase.total_ns += span.duration_ns
+            phase.self_ns += span.self_ns
+        return sorted(phases.values(), key=lambda p: p.self_ns, reverse=True)
+
+    def write_chrome_trace(self, path: Path) -> None:
+        """Write the spans as Chrome trace events, viewable in chrome://tracing or Perfetto."""
+        pid = os.getpid()
+        events = [
+            {
+                "name": span.name,
+                "ph": "X",
+                "ts": (span.start_ns - self.started_ns) / 1000,
+                "dur": span.duration_ns / 1000,
+                "pid": pid,
+                "tid": span.thread,
+            }
+            for span in self.spans
+        ]
+        path.write_text(json.dumps({"traceEvents": events, "displayTimeUnit": "ms"}))
+
+
+class _ActiveSpan:
+    __slots__ = ("recorder", "name", "start", "children")
+
+    def __init__(self, recorder: Recorder, name: str) -> None:
+        self.recorder = recorder
+        self.name = name
+
+    def __enter__(self) -> "_ActiveSpan":
+        self.children = 0
+        self.recorder._stack().append(self)
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        duration = time.perf_counter_ns() - self.start
+        stack = self.recorder._stack()
+        stack.pop()
+        if stack:
+            stack[-1].children += duration
+        self.recorder.spans.append(
+            Span(self.name, self.start, duration, duration - self.children, threading.get_ident())
+        )
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self) -> "_NullSpan":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        return None
+
+
+_NULL_SPAN = _NullSpan()
+_recorder: Recorder | None = None
+
+
+def span(name: str) -> "_ActiveSpan | _NullSpan":
+    """Time the enclosed block as phase `name` when profiling is enabled."""
+    recorder = _recorder
+    if recorder is None:
+        return _NULL_SPAN
+    return _ActiveSpan(recorder, name)
+
+
+def traced(name: str) -> Callable[[F], F]:
+    """Decorate a function so each call is timed as phase `name`."""
+
+    def decorate(func: F) -> F:
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            recorder = _recorder
+            if recorder is None:
+                return func(*args, **kwargs)
+            with _ActiveSpan(recorder, name):
+                return func(*args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorate
+
+
+def enable() -> Recorder:
+    """Start recording spans, returning the recorder."""
+    global _recorder
+    _recorder = Recorder()
+    return _recorder
+
+
+def disable() -> Recorder | None:
+    """Stop recording spans, returning the recorder that was active."""
+    global _recorder
+    recorder, _recorder = _recorder, None
+    return recorder
@@ -0,0 +1,79 @@
+"""Fast reloads of contracts that already passed validation.
+
+Reloading a stored contract is dominated by YAML parsing, not by validation: for
+`examples/sample_contract.yml`, libyaml takes about 20 times as long as `model_validate`. A
+validated contract is therefore stored in a trusted form, its document as compact JSON, which
+`load` turns into the ODCS models in a single pydantic-core pass, parsing and building the model
+tree without a Python dict in between. `load_document` returns the raw document instead, with
+the schema properties the generated models do not keep.
+
+Skipping validation with a recursive `model_construct`-style builder is slower still: pydantic-core
+builds each nested model faster than Python-level construction can, so nothing is gained by
+trusting the content beyond not parsing YAML. `python -m benchmarks.trusted_load` compares them.
+
+`dump` spot-checks that the trusted form builds the same model as the document it came from
+when `DATADOC_TRUSTED_SPOT_CHECK` sets a share of dumps to check, or always under `python -X dev`.
+"""
+
+import json
+import os
+import random
+import sys
+from collections.abc import Mapping
+from datetime import date, datetime
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from datadoc.models.odcs import OpenDataContractStandardODCS
+
+
+class TrustedLoadError(ValueError):
+    """A contract's trusted form does not build the same model as the contract itself."""
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, date | datetime):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def spot_check_rate() -> float:
+    """The share of dumps to check, from `DATADOC_TRUSTED_SPOT_CHECK`; all of them in dev mode."""
+    rate = os.environ.get("DATADOC_TRUSTED_SPOT_CHECK")
+    if rate:
+        return float(rate)
+    return 1.0 if sys.flags.dev_mode else 0.0
+
+
+def dump(content: Mapping[str, Any], spot_check: float | None = None) -> bytes:
+    """Serialise a validated contract document to its trusted form.
+
+    A random `spot_check` share of calls (default: `spot_check_rate()`) also validates the
+    document and raises `TrustedLoadError` unless `load` builds an equal model from the result.
+    """
+    data = json.dumps(content, default=_default, ensure_ascii=False, separators=(",", ":")).encode()
+    rate = spot_check_rate() if spot_check is None else spot_check
+    if rate and random.random() < rate:
+        from pydantic import ValidationError
+
+        from datadoc.models.odcs import OpenDataContractStandardODCS
+
+        try:
+            same = OpenDataContractStandardODCS.model_validate(content) == load(data)
+        except ValidationError as e:
+            raise TrustedLoadError(f"Contract {content.get('id')!r} does not validate:\n{e}") from e
+        if not same:
+            raise TrustedLoadError(f"The trusted form of contract {content.get('id')!r} builds a different model")
+    return data
+
+
+def load(data: bytes | str) -> "OpenDataContractStandardODCS":
+    """Build the ODCS models from a trusted form written by `dump`."""
+    from datadoc.models.odcs import OpenDataContractStandardODCS
+
+    return OpenDataContractStandardODCS.model_validate_json(data)
+
+
+def load_document(data: bytes | str) -> Any:
+    """Return the contract document of a trusted form written by `dump`."""
+    return json.loads(data)
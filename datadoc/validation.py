@@ -0,0 +1,340 @@
+"""Core contract validation used by the `validate` command.
+
+Two engines are available. `pydantic` builds the generated `OpenDataContractStandardODCS`
+models. `jsonschema` checks the raw YAML document against the ODCS JSON schema shipped in
+`schema/`, compiled once per process by `datadoc.schema_validator`, without building any
+model objects; it also covers parts of the standard the generated models leave empty, such
+as schema properties.
+"""
+
+import glob
+import json
+import os
+import time
+from collections.abc import Generator, Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from dataclasses import asdict, dataclass, field
+from functools import lru_cache
+from pathlib import Path
+from typing import IO, TYPE_CHECKING, Any
+
+import yaml
+
+from datadoc import snapshot, yaml_io
+from datadoc.timing import span
+
+if TYPE_CHECKING:
+    from datadoc.cache import ValidationCache
+    from datadoc.schema_validator import CompiledSchema
+
+CONTRACT_SUFFIXES = (".yaml", ".yml")
+# Files larger than this are parsed straight from disk, one document at a time, instead of
+# being read into memory and cached.
+STREAM_THRESHOLD = 8 * 1024 * 1024
+ENGINES = ("pydantic", "jsonschema")
+SCHEMA_FILE = Path(__file__).parent.parent / "schema" / "odcs-json-schema-latest.json"
+_END = object()
+
+
+@dataclass
+class ValidationResult:
+    """Outcome of validating a single contract.
+
+    `contract` summarises the identifying fields of any parsed mapping, valid or not.
+    `duration_ms` covers parsing and validating the document in the run that produced it.
+    """
+
+    path: str
+    valid: bool
+    error_type: str | None = None
+    message: str | None = None
+    errors: list[dict[str, Any]] = field(default_factory=list)
+    contract: dict[str, Any] | None = None
+    document: int | None = None
+    duration_ms: float | None = None
+    cached: bool = False
+
+    @property
+    def label(self) -> str:
+        """The file, followed by the document number for multi-document files."""
+        return self.path if self.document is None else f"{self.path}#{self.document}"
+
+
+def collect_contract_files(paths: Iterable[str]) -> list[Path]:
+    """Expand files, directories and glob patterns into a sorted list of contract files."""
+    files: set[Path] = set()
+    for raw in paths:
+        if glob.has_magic(raw):
+            matches = [Path(p) for p in glob.glob(raw, recursive=True)]
+            if not matches:
+                raise FileNotFoundError(f"No files match pattern: {raw}")
+            for match in matches:
+                files.update(expand_path(match))
+            continue
+        path = Path(raw)
+        if not path.exists():
+            raise FileNotFoundError(f"Path does not exist: {raw}")
+        files.update(expand_path(path, explicit=True))
+    return sorted(files)
+
+
+def expand_path(path: Path, explicit: bool = False) -> list[Path]:
+    """Return the contract files for a path, walking directories recursively.
+
+    Files named `explicit`ly are returned whatever their suffix.
+    """
+    if path.is_dir():
+        return [p for p in path.rglob("*") if p.is_file() and p.suffix.lower() in CONTRACT_SUFFIXES]
+    if explicit or path.suffix.lower() in CONTRACT_SUFFIXES:
+        return [path]
+    return []
+
+
+def validate_source(path: str, data: bytes | None = None, engine: str = "pydantic") -> list[ValidationResult]:
+    """Parse and validate every document of a contract file, reading it from disk unless `data` is given.
+
+    The documents of a file compiled with `datadoc compile` are read from its fresh snapshot instead.
+    """
+    with span("snapshot.load"):
+        compiled = snapshot.documents(path, data)
+    if compiled is not None:
+        return list(_validate_parsed(path, iter(compiled), engine, None))
+    if data is None:
+        try:
+            data = Path(path).read_bytes()
+        except OSError as e:
+            return [ValidationResult(path=path, valid=False, error_type="io", message=str(e))]
+    return list(validate_documents(path, data, engine))
+
+
+def validate_documents(path: str, stream: bytes | IO[bytes], engine: str = "pydantic") -> Iterator[ValidationResult]:
+    """Validate the `---`-separated documents of a YAML stream lazily, one at a time.
+
+    Each document is parsed, validated and released before the next one is read. A stream
+    with one document gives one result without a `document` number; the results of a longer
+    stream are numbered from 1. A YAML error ends the stream, as the parser cannot recover.
+    """
+    yield from _validate_parsed(path, yaml_io.load_all(stream), engine)
+
+
+def _validate_parsed(
+    path: str, documents: Iterator[Any], engine: str, phase: str | None = "yaml.parse"
+) -> Iterator[ValidationResult]:
+    """Validate documents as `documents` produces them, timing their production as `phase` if given."""
+    # The first result is held back until we know whether a second document follows.
+    held: ValidationResult | None = None
+    count = 0
+    try:
+        while True:
+            start = time.perf_counter()
+            with span(phase) if phase else nullcontext():
+                content = next(documents, _END)
+            if content is _END:
+                break
+            count += 1
+            with span(f"validate.{engine}"):
+                result = validate_content(path, content, engine)
+            result.duration_ms = (time.perf_counter() - start) * 1000
+            if count == 1:
+                held = result
+                continue
+            if held is not None:
+                held.document = 1
+                yield held
+                held = None
+            result.document = count
+            yield result
+    except yaml.YAMLError as e:
+        if held is not None:
+            held.document = 1
+            yield held
+        yield ValidationResult(
+            path=path, valid=False, error_type="yaml", message=str(e), document=count + 1 if count else None
+        )
+        return
+    if held is not None:
+        yield held
+    elif count == 0:
+        yield validate_content(path, None, engine)
+
+
+def _validate_streamed(path: str, engine: str) -> Iterator[ValidationResult]:
+    """Validate a file read incrementally from disk, for files too large to load at once."""
+    try:
+        with open(path, "rb") as f:
+            yield from validate_documents(path, f, engine)
+    except OSError as e:
+        yield ValidationResult(path=path, valid=False, error_type="io", message=str(e))
+
+
+def validate_content(path: str, content: Any, engine: str = "pydantic") -> ValidationResult:
+    """Validate an already parsed contract document with the given engine."""
+    if engine == "jsonschema":
+        return _validate_jsonschema(path, content)
+    if engine != "pydantic":
+        raise ValueError(f"Unknown validation engine '{engine}', expected one of: {', '.join(ENGINES)}")
+    return _validate_pydantic(path, content)
+
+
+def _validate_pydantic(path: str, content: Any) -> ValidationResult:
+    """Validate a document by building the generated ODCS models."""
+    with span("models.import"):
+        from pydantic import ValidationError
+
+        from datadoc.models.odcs import OpenDataContractStandardODCS
+
+    try:
+        OpenDataContractStandardODCS.model_validate(content)
+    except ValidationError as e:
+        errors = [
+            {"loc": list(err["loc"]), "msg": err["msg"], "type": err["type"]} for err in e.errors(include_url=False)
+        ]
+        return ValidationResult(
+            path=path, valid=False, error_type="contract", message=str(e), errors=errors, contract=_summary(content)
+        )
+    except Exception as e:
+        return ValidationResult(
+            path=path, valid=False, error_type="contract", message=str(e), contract=_summary(content)
+        )
+    return ValidationResult(path=path, valid=True, contract=_summary(content))
+
+
+@lru_cache(maxsize=1)
+def json_schema_validator() -> "CompiledSchema":
+    """Compile the ODCS JSON schema into a validator, once per process."""
+    from datadoc.schema_validator import CompiledSchema
+
+    return CompiledSchema(json.loads(SCHEMA_FILE.read_text()))
+
+
+def _validate_jsonschema(path: str, content: Any) -> ValidationResult:
+    """Validate a raw document against the compiled ODCS JSON schema."""
+    found = json_schema_validator().iter_errors(content)
+    if not found:
+        return ValidationResult(path=path, valid=True, contract=_summary(content))
+    errors = [error._asdict() for error in sorted(found, key=lambda e: [str(key) for key in e.loc])]
+    lines = [f"{len(errors)} validation error{'s' if len(errors) > 1 else ''} for the ODCS JSON schema"]
+    for error in errors:
+        lines.append(".".join(str(p) for p in error["loc"]) or "(root)")
+        lines.append(f"  {error['msg']} [type={error['type']}]")
+    return ValidationResult(
+        path=path,
+        valid=False,
+        error_type="contract",
+        message="\n".join(lines),
+        errors=errors,
+        contract=_summary(content),
+    )
+
+
+def _summary(content: Any) -> dict[str, Any] | None:
+    """Pick the identifying fields of a contract from the raw document, if it is a mapping."""
+    if not isinstance(content, dict):
+        return None
+    description = content.get("description")
+    if isinstance(description, dict):
+        description = " ".join(f"{key}={value!r}" for key, value in description.items() if value is not None)
+    return {
+        "version": content.get("version"),
+        "id": content.get("id"),
+        "name": content.get("name"),
+        "status": content.get("status"),
+        "description": str(description) if description else None,
+    }
+
+
+def _warm_worker(engine: str) -> None:
+    """Build the ODCS model or compile the JSON schema once per worker process instead of once per task."""
+    if engine == "jsonschema":
+        json_schema_validator()
+    else:
+        import datadoc.models.odcs  # noqa: F401
+
+
+def validate_many(
+    paths: Iterable[Path],
+    workers: int | None = None,
+    cache: "ValidationCache | None" = None,
+    engine: str = "pydantic",
+) -> Iterator[ValidationResult]:
+    """Validate contracts with `engine`, fanning out across a process pool when there is enough work.
+
+    Every document of a multi-document file gets its own result. With a `cache`, files whose
+    content was validated before are answered from it without parsing, and only the remaining
+    files are sent to the pool. Files over `STREAM_THRESHOLD` bytes are streamed in this process
+    and never cached, so memory stays flat on large bundles. Results are yielded in the order
+    of `paths`.
+    """
+    files = [str(p) for p in paths]
+    streamed = {i for i, path in enumerate(files) if _size(path) > STREAM_THRESHOLD}
+    keys: list[str | None] = [None] * len(files)
+    datas: list[bytes | None] = [None] * len(files)
+    hits: dict[str, dict[str, Any]] = {}
+    if cache is not None:
+        from datadoc.cache import content_key, model_fingerprint
+
+        with span("cache.lookup"):
+            fingerprint = model_fingerprint(engine)
+            for i, path in enumerate(files):
+                if i in streamed:
+                    continue
+                try:
+                    data = Path(path).read_bytes()
+                except OSError:
+                    continue
+                keys[i] = content_key(data, fingerprint)
+                datas[i] = data
+            hits = cache.get_many(k for k in keys if k is not None)
+
+    misses = [i for i, key in enumerate(keys) if i not in streamed and key not in hits]
+    computed = _run([files[i] for i in misses], [datas[i] for i in misses], workers, engine)
+
+    pending: list[tuple[str, dict[str, Any]]] = []
+    try:
+        for i, (path, key) in enumerate(zip(files, keys)):
+            if i in streamed:
+                yield from _validate_streamed(path, engine)
+                continue
+            if key is not None and key in hits:
+                hit = hits[key]
+                for document in hit.get("documents", [hit]):
+                    yield ValidationResult(**{**document, "path": path, "cached": True})
+                continue
+            results = next(computed)
+            if cache is not None and key is not None and results[0].error_type != "io":
+                entry = asdict(results[0]) if len(results) == 1 else {"documents": [asdict(r) for r in results]}
+                pending.append((key, entry))
+                if len(pending) >= 500:
+                    with span("cache.store"):
+                        cache.put_many(pending)
+                    pending.clear()
+            yield from results
+    finally:
+        computed.close()
+        if cache is not None and pending:
+            with span("cache.store"):
+                cache.put_many(pending)
+
+
+def _size(path: str) -> int:
+    try:
+        return os.stat(path).st_size
+    except OSError:
+        return 0
+
+
+def _run(
+    files: list[str], datas: list[bytes | None], workers: int | None, engine: str = "pydantic"
+) -> Generator[list[ValidationResult], None, None]:
+    """Validate `files` in-process or across a process pool, preserving order."""
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1 or len(files) <= 1:
+        for path, data in zip(files, datas):
+            yield validate_source(path, data, engine)
+        return
+
+    workers = min(workers, len(files))
+    chunksize = max(1, len(files) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_warm_worker, initargs=(engine,)) as pool:
+        yield from pool.map(validate_source, files, datas, [engine] * len(files), chunksize=chunksize)
@@ -0,0 +1,171 @@
+"""Incremental revalidation of a watched set of contracts.
+
+`ContractSet` keeps the latest result of every contract file and an index from contract `id`
+to the files that declare it. When files change, only those files are validated again and
+only the ids they declared before or after the change are checked for duplicates, so the cost
+of an update follows the size of the change rather than the size of the watched set.
+"""
+
+import os
+import time
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from datadoc.validation import CONTRACT_SUFFIXES, ValidationResult, expand_path, validate_many
+
+if TYPE_CHECKING:
+    import threading
+
+    from datadoc.cache import ValidationCache
+
+# How long to wait for a burst of writes to settle, and the longest a burst may be grouped.
+DEBOUNCE_STEP_MS = 30
+DEBOUNCE_MAX_MS = 1600
+# Changes touching more files than this are validated in a process pool.
+IN_PROCESS_LIMIT = 64
+
+
+def is_available() -> bool:
+    """Return True if watchfiles can be imported."""
+    try:
+        import watchfiles  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+@dataclass
+class Update:
+    """What changed in a `ContractSet` after one batch of file changes."""
+
+    results: list[ValidationResult] = field(default_factory=list)
+    removed: list[str] = field(default_factory=list)
+    duplicates: dict[str, list[str]] = field(default_factory=dict)
+    resolved: list[str] = field(default_factory=list)
+    elapsed_ms: float = 0.0
+
+
+class ContractSet:
+    """The validation state of a watched set of contract files."""
+
+    def __init__(self, engine: str = "pydantic", cache: "ValidationCache | None" = None) -> None:
+        self.engine = engine
+        self.cache = cache
+        self.results: dict[str, list[ValidationResult]] = {}
+        self.owners: dict[str, set[str]] = {}
+        self.invalid = 0
+        # Ids currently declared by more than one contract.
+        self.duplicated: set[str] = set()
+
+    def __len__(self) -> int:
+        return sum(len(results) for results in self.results.values())
+
+    def duplicates(self) -> dict[str, list[str]]:
+        """Every id declared by more than one contract, with the contracts declaring it."""
+        return {key: sorted(labels) for key, labels in self.owners.items() if len(labels) > 1}
+
+    def update(self, changed: Iterable[Path], removed: Iterable[str | Path] = (), workers: int | None = None) -> Update:
+        """Revalidate `changed` files, forget `removed` files and directories, and re-check their ids.
+
+        Files are tracked by absolute path.
+        """
+        start = time.perf_counter()
+        update = Update()
+        touched: set[str] = set()
+        for raw in removed:
+            path = str(Path(raw).absolute())
+            prefix = path.rstrip(os.sep) + os.sep
+            for known in sorted(k for k in self.results if k == path or k.startswith(prefix)):
+                touched.update(self._forget(known))
+                update.removed.append(known)
+
+        files = sorted({str(Path(p).absolute()) for p in changed})
+        if files:
+            if workers is None and len(files) <= IN_PROCESS_LIMIT:
+                workers = 1
+            by_file: dict[str, list[ValidationResult]] = {path: [] for path in files}
+            validated = validate_many(map(Path, files), workers=workers, cache=self.cache, engine=self.engine)
+            for result in validated:
+                by_file[result.path].append(result)
+            for path, results in by_file.items():
+                touched.update(self._forget(path))
+                self.results[path] = results
+                for result in results:
+                    self.invalid += not result.valid
+                    key = _contract_id(result)
+                    if key is not None:
+                        self.owners.setdefault(key, set()).add(result.label)
+                        touched.add(key)
+                update.results.extend(results)
+
+        for key in sorted(touched):
+            labels = self.owners.get(key, set())
+            if len(labels) > 1:
+                update.duplicates[key] = sorted(labels)
+            elif key in self.duplicated:
+                update.resolved.append(key)
+        self.duplicated = (self.duplicated - set(update.resolved)) | set(update.duplicates)
+        update.elapsed_ms = (time.perf_counter() - start) * 1000
+        return update
+
+    def _forget(self, path: str) -> set[str]:
+        """Drop the results of a file, returning the ids it declared."""
+        ids = set()
+        for result in self.results.pop(path, []):
+            self.invalid -= not result.valid
+            key = _contract_id(result)
+            if key is None:
+                continue
+            ids.add(key)
+            labels = self.owners.get(key)
+            if labels is not None:
+                labels.discard(result.label)
+                if not labels:
+                    del self.owners[key]
+        return ids
+
+
+def _contract_id(result: ValidationResult) -> str | None:
+    value = (result.contract or {}).get("id")
+    return None if value is None else str(value)
+
+
+def watch_changes(
+    paths: list[Path], stop_event: "threading.Event | None" = None
+) -> Iterator[tuple[list[Path], list[str]]]:
+    """Yield `(changed, removed)` contract files for each debounced burst of file system events.
+
+    Bursts are debounced: events are grouped until none arrive for `DEBOUNCE_STEP_MS`. A changed
+    directory, for example one moved into place, contributes all the contracts below it.
+    """
+    import watchfiles
+
+    explicit = {str(p.absolute()) for p in paths if not p.is_dir()}
+    default_filter = watchfiles.DefaultFilter()
+
+    def is_contract(change: "watchfiles.Change", path: str) -> bool:
+        # Anything that is no longer a file may be a removed directory of contracts.
+        if not default_filter(change, path):
+            return False
+        return path in explicit or path.lower().endswith(CONTRACT_SUFFIXES) or not os.path.isfile(path)
+
+    for batch in watchfiles.watch(
+        *paths,
+        watch_filter=is_contract,
+        debounce=DEBOUNCE_MAX_MS,
+        step=DEBOUNCE_STEP_MS,
+        stop_event=stop_event,
+        yield_on_timeout=False,
+    ):
+        changed: list[Path] = []
+        removed: list[str] = []
+        for _, raw in batch:
+            path = Path(raw)
+            if path.exists():
+                changed.extend(expand_path(path, explicit=raw in explicit))
+            else:
+                removed.append(raw)
+        if changed or removed:
+            yield changed, removed
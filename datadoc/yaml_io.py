@@ -0,0 +1,27 @@
+"""Fast YAML loading.
+
+PyYAML's `safe_load` uses the pure-Python parser. When PyYAML was built against libyaml,
+`CSafeLoader` parses the same safe subset several times faster, so it is preferred and the
+pure-Python loader is only a fallback.
+"""
+
+from collections.abc import Iterator
+from typing import IO, Any
+
+import yaml
+
+SafeLoader: type = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+HAS_LIBYAML = SafeLoader is not yaml.SafeLoader
+
+
+def load(stream: str | bytes | IO[Any]) -> Any:
+    """Parse a single YAML document, like `yaml.safe_load`."""
+    return yaml.load(stream, Loader=SafeLoader)
+
+
+def load_all(stream: str | bytes | IO[Any]) -> Iterator[Any]:
+    """Parse the `---`-separated documents of a stream lazily, one at a time.
+
+    A file object is read incrementally, so only the document being built is held in memory.
+    """
+    return yaml.load_all(stream, Loader=SafeLoader)
@@ -0,0 +1,139 @@
+"""Tests for the in-process Python API."""
+
+import asyncio
+import threading
+from collections.abc import AsyncIterator, Iterator
+from pathlib import Path
+from typing import Any
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from datadoc import api
+from datadoc.api import ContractValidator, SchemaExtractor
+
+EXAMPLE = Path(__file__).parent.parent / "examples" / "sample_contract.yml"
+
+CONTRACT = {"apiVersion": "v3.0.2", "kind": "DataContract", "id": "orders", "version": "1.0.0", "status": "active"}
+
+
+@pytest.mark.parametrize("engine", ["pydantic", "jsonschema"])
+def test_validator_returns_results(engine: str) -> None:
+    """Test that bytes, mappings and files give structured results without printing."""
+    validator = ContractValidator(engine)
+    results = validator.validate_bytes(b"kind: DataContract\n---\n" + EXAMPLE.read_bytes())
+    assert [(r.label, r.valid) for r in results] == [("<bytes>#1", False), ("<bytes>#2", True)]
+    assert results[0].errors and results[1].contract and results[1].contract["id"] == "sample-contract-123"
+
+    result = validator.validate_mapping(CONTRACT, path="orders")
+    assert result.valid and result.path == "orders" and result.duration_ms is not None
+    assert not validator.validate_mapping({**CONTRACT, "status": 1}).valid
+    assert validator.validate_file(EXAMPLE)[0].valid
+
+    with pytest.raises(ValueError, match="Unknown validation engine"):
+        ContractValidator("nope")
+
+
+def test_validate_many_is_lazy_and_ordered() -> None:
+    """Test that parallel validation keeps order and only reads a bounded number of sources ahead."""
+    consumed = []
+
+    def sources() -> Iterator[Any]:
+        for i in range(40):
+            consumed.append(i)
+            yield ("bad", {"id": i}) if i == 3 else {**CONTRACT, "id": f"c{i}"}
+        yield EXAMPLE
+
+    with ContractValidator(workers=2, max_pending=3) as validator:
+        results = validator.validate_many(sources())
+        assert next(results).path == "<input 0>"
+        assert len(consumed) <= 4
+        rest = list(results)
+    assert [r.path for r in rest[:3]] == ["<input 1>", "<input 2>", "bad"]
+    assert [r.valid for r in rest].count(False) == 1 and rest[-1].path == str(EXAMPLE)
+
+
+def test_schema_extractor(tmp_path: Path) -> None:
+    """Test that the extractor reads footers in-process and reports failures in the result."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    pq.write_table(pa.table({"id": [1, 2], "name": ["a", "b"]}), tmp_path / "orders.parquet")
+    with SchemaExtractor(engine="native", cache=True, cache_dir=tmp_path / "cache") as extractor:
+        result = extractor.extract(str(tmp_path / "orders.parquet"), "parquet")
+        assert result.error is None and result.engine == "native" and result.spec.name == "orders"
+        assert result.schema is not None
+        assert [prop["name"] for prop in result.schema["properties"]] == ["id", "name"]
+        assert extractor.extract(str(tmp_path / "orders.parquet"), "parquet").cache == "hit"
+        assert extractor.extract(str(tmp_path / "missing.parquet"), "parquet").error
+
+
+def test_schema_extractor_reports_instead_of_printing(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    """Test that footer fallbacks and invalid engines end up in the results, not on the console."""
+    (tmp_path / "broken.parquet").write_bytes(b"not parquet")
+    spark_schema = {"name": "broken", "logicalType": "object", "properties": []}
+    with SchemaExtractor() as extractor, patch("datadoc.extraction.engine.detect_schema", return_value=spark_schema):
+        extractor.spark = MagicMock()  # type: ignore[assignment]
+        result = extractor.extract(str(tmp_path / "broken.parquet"), "parquet")
+        assert result.engine == "spark" and result.fallback and "Footer read failed" in result.fallback
+        assert "Unknown engine" in str(extractor.extract(str(tmp_path), "parquet", engine="nope").error)
+        assert "native engine needs" in str(extractor.extract(str(tmp_path), "csv", engine="native").error)
+    assert capsys.readouterr().out == ""
+
+
+def test_async_validation(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that async validation keeps the event loop responsive, keeps order and can be cancelled."""
+    started, release = threading.Event(), threading.Event()
+
+    def blocking(*args: Any) -> Any:
+        started.set()
+        release.wait(10)
+        return validate_item(*args)
+
+    async def sources() -> AsyncIterator[Any]:
+        for i in range(20):
+            await asyncio.sleep(0)
+            yield {**CONTRACT, "id": f"c{i}"}
+
+    async def main() -> None:
+        async with ContractValidator(max_pending=2) as validator:
+            results = await asyncio.gather(*(validator.validate_async(CONTRACT, f"r{i}") for i in range(6)))
+            assert [r[0].path for r in results] == [f"r{i}" for i in range(6)] and all(r[0].valid for r in results)
+            assert (await validator.validate_async(b"kind: [")).pop().error_type == "yaml"
+
+            paths = [result.path async for result in validator.validate_stream(sources())]
+            assert paths == [f"<input {i}>" for i in range(20)]
+
+            monkeypatch.setattr(api, "_validate_item", blocking)
+            running = asyncio.ensure_future(validator.validate_async(CONTRACT, "running"))
+            queued = asyncio.ensure_future(validator.validate_async(CONTRACT, "queued"))
+            await asyncio.to_thread(started.wait, 10)
+            # The loop keeps serving other coroutines while the validation is blocked.
+            assert await asyncio.wait_for(asyncio.sleep(0, result="other"), 10) == "other"
+            assert not running.done()
+            queued.cancel()
+            release.set()
+            assert (await running)[0].path == "running"
+            with pytest.raises(asyncio.CancelledError):
+                await queued
+
+    validate_item = api._validate_item
+    asyncio.run(main())
+
+
+def test_async_extraction(tmp_path: Path) -> None:
+    """Test that concurrent extractions run on the extractor's threads."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    for name in ("a", "b", "c"):
+        pq.write_table(pa.table({name: [1]}), tmp_path / f"{name}.parquet")
+
+    async def main() -> list[Any]:
+        async with SchemaExtractor(engine="native", parallelism=2) as extractor:
+            return await asyncio.gather(
+                *(extractor.extract_async(str(tmp_path / f"{name}.parquet"), "parquet") for name in ("a", "b", "c"))
+            )
+
+    results = asyncio.run(main())
+    assert [r.schema["properties"][0]["name"] for r in results] == ["a", "b", "c"]
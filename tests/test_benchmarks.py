@@ -0,0 +1,35 @@
+"""Tests for the benchmark generator, suite and comparison."""
+
+from pathlib import Path
+
+from benchmarks import generator
+from benchmarks.compare import compare
+from benchmarks.suite import run_case
+from datadoc.extraction.engine import detect_schema_native
+from datadoc.validation import validate_content
+
+
+def test_generator_is_seeded_and_valid(tmp_path: Path) -> None:
+    """Test that a seed reproduces the same contracts, which both engines accept."""
+    deep = generator.corpus("deep", seed=1)
+    assert deep == generator.corpus("deep", seed=1) != generator.corpus("deep", seed=2)
+    for name, contract in deep[:3] + generator.corpus("small")[:3]:
+        for engine in ("pydantic", "jsonschema"):
+            result = validate_content(name, contract, engine)
+            assert result.valid, result.message
+
+    schema = detect_schema_native(str(generator.write_parquet(tmp_path, files=2, rows_per_file=10)), "parquet")
+    assert [prop["name"] for prop in schema["properties"]][-2:] == ["address", "tags"]
+
+
+def test_suite_results_compare(tmp_path: Path) -> None:
+    """Test that a case reports its metrics and that worse numbers are flagged."""
+    generator.write_corpus("small", tmp_path)
+    result = run_case("validate", tmp_path, "pydantic", 0.0, 3)
+    assert result["ops"] == 3 and result["p50_ms"] <= result["p99_ms"]
+    assert result["ops_per_s"] > 0 and result["peak_rss_mb"] > 0
+
+    slower = dict(result, ops_per_s=result["ops_per_s"] / 2)
+    findings = compare({"results": {"case": result}}, {"results": {"case": slower, "new": result}})
+    worsening = {finding.metric: finding.worsening for finding in findings}
+    assert worsening == {"ops_per_s": 0.5, "p99_ms": 0.0, "peak_rss_mb": 0.0}
@@ -0,0 +1,137 @@
+"""Tests for the contract catalog and the index and query commands."""
+
+import json
+from pathlib import Path
+from typing import Any
+
+import pytest
+from typer.testing import CliRunner
+
+from datadoc import catalog as catalog_module
+from datadoc.catalog import Catalog, parse_file
+from datadoc.cli import app
+from datadoc.validation import collect_contract_files
+
+runner = CliRunner()
+
+EXAMPLES = Path(__file__).parent.parent / "examples"
+
+CONTRACT = """
+apiVersion: v3.0.2
+kind: DataContract
+id: {id}
+name: {name}
+version: 1.0.0
+status: active
+domain: {domain}
+tags: [finance]
+servers:
+  - server: prod
+    type: {server_type}
+team:
+  - username: ada
+    role: owner
+schema:
+  - name: orders
+    physicalName: orders_tbl
+    tags: [core]
+    properties:
+      - name: order_id
+        logicalType: string
+        primaryKey: true
+      - name: address
+        logicalType: object
+        properties:
+          - name: city
+            logicalType: string
+            tags: [pii]
+"""
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path_factory: pytest.TempPathFactory, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Keep the catalog out of the user's home directory."""
+    directory = tmp_path_factory.mktemp("cache")
+    monkeypatch.setenv("DATADOC_CACHE_DIR", str(directory))
+    return directory
+
+
+def _write(path: Path, id: str, domain: str = "sales", server_type: str = "snowflake") -> Path:
+    path.write_text(CONTRACT.format(id=id, name=f"{id}_v1", domain=domain, server_type=server_type))
+    return path
+
+
+def test_catalog_lookups(tmp_path: Path) -> None:
+    """Test that headers and nested metadata can be looked up with indexed filters."""
+    _write(tmp_path / "a.yaml", "orders", server_type="snowflake")
+    _write(tmp_path / "b.yaml", "refunds", domain="finance", server_type="postgres")
+    with Catalog(tmp_path / "catalog.sqlite") as catalog:
+        stats = catalog.update(collect_contract_files([str(tmp_path), str(EXAMPLES)]), [tmp_path, EXAMPLES])
+        assert stats.contracts == 4 and stats.indexed == 4
+
+        def ids(**filters: str) -> list[str | None]:
+            return [row.id for row in catalog.find(None, **filters)]
+
+        assert ids(domain="sales", server_type="snowflake") == ["orders"]
+        assert ids(server_type="postgres") == ["refunds"]
+        assert ids(tag="pii") == ["orders", "refunds"]
+        assert ids(property="city", member="ada", domain="finance") == ["refunds"]
+        assert ids(name="ord*") == ["orders"]
+        assert ids(id="53581432-6c55-4ba2-a65f-72344a91553a", tag="finance")[0] is not None
+        assert ids(object="missing") == []
+        with pytest.raises(ValueError, match="Unknown filter"):
+            catalog.find(colour="red")
+
+
+def test_catalog_updates_incrementally(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that only changed files are parsed and re-indexed and removed files are dropped."""
+    a = _write(tmp_path / "a.yaml", "orders")
+    b = _write(tmp_path / "b.yaml", "refunds")
+    parsed: list[str] = []
+
+    def spy(path: str) -> Any:
+        parsed.append(Path(path).name)
+        return parse_file(path)
+
+    monkeypatch.setattr(catalog_module, "parse_file", spy)
+    with Catalog(tmp_path / "catalog.sqlite") as catalog:
+        catalog.update([a, b], [tmp_path])
+        stats = catalog.update([a, b], [tmp_path])
+        assert (stats.indexed, stats.unchanged) == (0, 2)
+
+        a.write_text(a.read_text())  # new mtime, same content
+        _write(b, "returns")
+        parsed.clear()
+        stats = catalog.update([a, b], [tmp_path])
+        assert (stats.indexed, stats.unchanged) == (1, 1) and parsed == ["b.yaml"]
+        assert catalog.update([a, b], [tmp_path]).unchanged == 2
+        assert [row.id for row in catalog.find(property="order_id")] == ["orders", "returns"]
+
+        a.unlink()
+        stats = catalog.update([b], [tmp_path])
+        assert stats.removed == 1 and stats.contracts == 1
+        assert catalog.find(tag="core")[0].id == "returns"
+
+
+def test_index_and_query_commands(tmp_path: Path, cache_dir: Path) -> None:
+    """Test the index and query commands end to end."""
+    _write(tmp_path / "a.yaml", "orders")
+    bundle = [CONTRACT.format(id=id, name=id, domain="ops", server_type="s3") for id in ("x", "y")]
+    (tmp_path / "bundle.yaml").write_text("---".join(["", *bundle]))
+
+    result = runner.invoke(app, ["query", "--domain", "sales"])
+    assert result.exit_code == 2
+    result = runner.invoke(app, ["index", str(tmp_path)])
+    assert result.exit_code == 0, result.stdout
+    assert "3 contracts in the catalog" in result.stdout
+    assert (cache_dir / "catalog.sqlite").exists()
+
+    result = runner.invoke(app, ["query", "--server-type", "snowflake", "--format", "jsonl"])
+    assert result.exit_code == 0
+    [row] = [json.loads(line) for line in result.stdout.splitlines()]
+    assert row["id"] == "orders" and row["path"] == str((tmp_path / "a.yaml").absolute())
+
+    result = runner.invoke(app, ["query", "--domain", "ops"])
+    assert "2 contracts" in result.stdout
+    result = runner.invoke(app, ["query", "--domain", "ops", "--format", "jsonl"])
+    assert [json.loads(line)["document"] for line in result.stdout.splitlines()] == [1, 2]
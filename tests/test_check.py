@@ -0,0 +1,120 @@
+"""Tests for the check command and the quality rule engine."""
+
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+import typer
+import yaml
+from typer.testing import CliRunner
+
+from datadoc.checks import Rule, collect_rules, evaluate, metric_key, plan_metrics
+from datadoc.cli import app
+from datadoc.commands.check import data_locations
+
+runner = CliRunner()
+
+ORDERS = {
+    "name": "orders",
+    "physicalName": "orders_v1",
+    "quality": [{"type": "library", "rule": "rowCount", "mustBeGreaterThan": 0}],
+    "properties": [
+        {
+            "name": "id",
+            "quality": [
+                {"rule": "duplicateCount", "mustBe": 0},
+                {"rule": "nullValues"},
+                {"rule": "rowCount", "mustBeGreaterOrEqualTo": 10},
+            ],
+        },
+        {
+            "name": "status",
+            "quality": [
+                {"rule": "validValues", "validValues": ["open", "closed"]},
+                {"type": "text", "description": "Should be sensible"},
+            ],
+        },
+        {"name": "amount", "quality": [{"rule": "validValues", "mustBeBetween": [0, 100]}]},
+    ],
+}
+
+
+def test_plan_shares_metrics_across_rules() -> None:
+    """Test that rules needing the same aggregate are computed once."""
+    rules = collect_rules(ORDERS)
+    assert [(r.property_name, r.name) for r in rules][:4] == [
+        (None, "rowCount"),
+        ("id", "duplicateCount"),
+        ("id", "nullCount"),
+        ("id", "rowCount"),
+    ]
+    plan = plan_metrics(rules)
+    assert list(plan) == [
+        ("rows",),
+        ("duplicates", "id"),
+        ("nulls", "id"),
+        ("invalid", "status", ("open", "closed"), ()),
+        ("invalid", "amount", None, (("mustBeBetween", (0, 100)),)),
+    ]
+
+
+def test_evaluate_rules() -> None:
+    """Test judging rules from computed metrics."""
+    metrics = {("rows",): 5, ("duplicates", "id"): 1, ("nulls", "id"): 0}
+    results = [evaluate(rule, metrics) for rule in collect_rules(ORDERS)[:4]]
+    assert [r.status for r in results] == ["passed", "failed", "passed", "failed"]
+    assert results[2].message == "mustBe 0"
+
+    text_rule = Rule("orders", "status", {"type": "text"})
+    assert metric_key(text_rule) is None
+    assert evaluate(text_rule, {}).status == "skipped"
+    assert (
+        evaluate(
+            Rule("orders", "amount", {"rule": "validValues", "mustBe": 1}),
+            {("invalid", "amount", None, (("mustBe", 1),)): 0},
+        ).status
+        == "passed"
+    )
+
+
+def test_data_locations() -> None:
+    """Test matching --data arguments to schema objects."""
+    assert data_locations([ORDERS], ["data/orders"]) == {"orders": "data/orders"}
+    assert data_locations([ORDERS, {"name": "items"}], ["orders_v1=a", "items=b"]) == {"orders": "a", "items": "b"}
+    with pytest.raises(typer.BadParameter):
+        data_locations([ORDERS, {"name": "items"}], ["data/orders"])
+
+
+def test_check_command(tmp_path: Path) -> None:
+    """Test that one aggregation is run per table and failures set the exit code."""
+    contract = tmp_path / "contract.yaml"
+    contract.write_text(
+        yaml.dump(
+            {
+                "apiVersion": "v3.0.2",
+                "kind": "DataContract",
+                "id": "c",
+                "version": "1",
+                "status": "active",
+                "schema": [ORDERS],
+            }
+        )
+    )
+    df = MagicMock()
+    metrics = {
+        ("rows",): 20,
+        ("duplicates", "id"): 0,
+        ("nulls", "id"): 0,
+        ("invalid", "status", ("open", "closed"), ()): 0,
+        ("invalid", "amount", None, (("mustBeBetween", (0, 100)),)): 3,
+    }
+    with (
+        patch("datadoc.commands.check.SharedSparkSession") as shared,
+        patch("datadoc.checks.compute_metrics", return_value=metrics) as compute,
+    ):
+        shared.return_value.return_value.read.format.return_value.options.return_value.load.return_value = df
+        result = runner.invoke(app, ["check", str(contract), "--data", "orders=data/orders"])
+
+    assert result.exit_code == 1, result.stdout
+    compute.assert_called_once()
+    assert "1 of 7 rules failed" in result.stdout
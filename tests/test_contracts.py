@@ -0,0 +1,83 @@
+"""Tests for header-first contract loading and the list command."""
+
+import json
+from pathlib import Path
+
+import pytest
+import yaml
+from pydantic import ValidationError
+from typer.testing import CliRunner
+
+from datadoc.cli import app
+from datadoc.contracts import LazyContract, RawContract, load_documents
+
+runner = CliRunner()
+
+EXAMPLES = Path(__file__).parent.parent / "examples"
+
+CONTRACT = """# orders
+apiVersion: v3.0.2
+kind: DataContract
+id: orders
+version: 1.0.0
+status: active
+tags: [finance]
+schema:
+- name: orders
+  properties:
+    - name: order_id
+      logicalType: string
+servers:
+  - server: prod
+    type: {server_type}
+"""
+
+STREAMS = {
+    "block": CONTRACT.format(server_type="snowflake"),
+    "bundle": "---\n" + CONTRACT.format(server_type="s3") + "---\n" + CONTRACT.format(server_type="kafka"),
+    "flow": '{"id": "orders", "version": "1", "status": "active"}',
+    "anchors": "id: &id orders\nversion: '1'\nstatus: active\ndescription:\n  purpose: *id\n",
+}
+
+
+@pytest.mark.parametrize("name", sorted(STREAMS))
+def test_load_documents_matches_full_parse(name: str) -> None:
+    """Test that split documents read back exactly like a full YAML parse."""
+    data = STREAMS[name].encode()
+    documents = [dict(doc) if isinstance(doc, RawContract) else doc for doc in load_documents(data)]
+    assert documents == list(yaml.safe_load_all(data))
+    for document in (EXAMPLES / "base_example.yml", EXAMPLES / "sample_contract.yml"):
+        raw = document.read_bytes()
+        assert [dict(doc) for doc in load_documents(raw)] == list(yaml.safe_load_all(raw))
+
+
+def test_lazy_contract_defers_sections() -> None:
+    """Test that the header is validated on load and other sections only when read."""
+    data = CONTRACT.format(server_type="not-a-server-type").encode()
+    document = next(load_documents(data))
+    contract = LazyContract(document)
+    assert (contract.id, contract.status, contract.tags.root) == ("orders", "active", ["finance"])
+    assert isinstance(document, RawContract) and "schema" not in document._values
+    assert contract.schema_[0].name == "orders"
+    with pytest.raises(ValidationError) as excinfo:
+        contract.servers
+    assert excinfo.value.errors()[0]["loc"] == ("servers", 0, "type")
+    with pytest.raises(ValidationError, match="extra_forbidden|Extra inputs"):
+        LazyContract({"id": "x", "version": "1", "status": "active", "unknown": 1})
+
+
+def test_list_command(tmp_path: Path) -> None:
+    """Test that list reports headers and fails on an invalid one."""
+    (tmp_path / "bundle.yaml").write_text(STREAMS["bundle"])
+    result = runner.invoke(app, ["list", str(tmp_path), "--format", "jsonl"])
+    assert result.exit_code == 0, result.output
+    records = [json.loads(line) for line in result.stdout.splitlines()]
+    assert [(r["document"], r["id"], r["tags"]) for r in records] == [
+        (1, "orders", ["finance"]),
+        (2, "orders", ["finance"]),
+    ]
+
+    (tmp_path / "broken.yaml").write_text("id: broken\nversion: 1.0.0\n")
+    result = runner.invoke(app, ["list", str(tmp_path)])
+    assert result.exit_code == 1
+    assert "1 contracts have an invalid header" in result.stdout
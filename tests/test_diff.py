@@ -0,0 +1,112 @@
+"""Tests for contract compatibility diffs and the diff command."""
+
+import json
+from pathlib import Path
+from typing import Any
+
+import yaml
+from typer.testing import CliRunner
+
+from datadoc.cli import app
+from datadoc.diff import diff_files, diff_paths, diff_schemas
+
+runner = CliRunner()
+
+
+def _contract(id: str, version: str, properties: list[dict]) -> str:
+    schema = [{"name": "orders", "physicalName": "orders_tbl", "properties": properties}]
+    return yaml.safe_dump({"id": id, "version": version, "status": "active", "schema": schema})
+
+
+OLD: list[dict[str, Any]] = [
+    {"name": "order_id", "logicalType": "integer", "physicalType": "int", "primaryKey": True},
+    {"name": "amount", "logicalType": "integer", "logicalTypeOptions": {"maximum": 100}},
+    {"name": "customer", "physicalName": "cust", "physicalType": "varchar(10)"},
+    {"name": "note", "logicalType": "string"},
+    {"name": "address", "logicalType": "object", "properties": [{"name": "city", "logicalType": "string"}]},
+]
+NEW: list[dict[str, Any]] = [
+    {"name": "order_id", "logicalType": "integer", "physicalType": "bigint"},
+    {"name": "amount", "logicalType": "number", "logicalTypeOptions": {"maximum": 100, "minimum": 0}},
+    {"name": "customer_name", "physicalName": "cust", "physicalType": "varchar(20)", "required": True},
+    {"name": "comment", "logicalType": "string"},
+    {"name": "address", "logicalType": "object", "properties": [{"name": "city", "logicalType": "string"}]},
+]
+
+
+def test_diff_classifies_changes() -> None:
+    """Test that each kind of change is matched and classified as breaking or not."""
+    schema = yaml.safe_load(_contract("orders", "1", OLD))["schema"]
+    changes = {
+        (c.kind, c.path): c.breaking for c in diff_schemas(schema, yaml.safe_load(_contract("o", "2", NEW))["schema"])
+    }
+    assert changes == {
+        ("physical_type_changed", "orders.order_id"): False,
+        ("primary_key_changed", "orders.order_id:primaryKey"): True,
+        ("logical_type_changed", "orders.amount"): False,
+        ("type_option_changed", "orders.amount:minimum"): True,
+        ("property_renamed", "orders.customer_name"): True,
+        ("required_changed", "orders.customer_name"): True,
+        ("physical_type_changed", "orders.customer_name"): False,
+        ("property_removed", "orders.note"): True,
+        ("property_added", "orders.comment"): False,
+    }
+    wide = [{"name": f"c{i}", "logicalType": "string"} for i in range(20000)]
+    assert diff_schemas([{"name": "t", "properties": wide}], [{"name": "t", "properties": wide[1:]}])[0].path == "t.c0"
+
+
+def test_decimal_widening() -> None:
+    """Test that a decimal must keep both its integer digits and its scale to widen."""
+
+    def breaking(old: str, new: str) -> bool:
+        changes = diff_schemas(
+            [{"name": "t", "properties": [{"name": "amount", "physicalType": old}]}],
+            [{"name": "t", "properties": [{"name": "amount", "physicalType": new}]}],
+        )
+        return changes[0].breaking
+
+    assert not breaking("decimal(10,2)", "decimal(12,4)")
+    assert not breaking("numeric(10)", "numeric(12,2)")
+    assert breaking("decimal(10,2)", "decimal(10,4)")
+    assert breaking("decimal(10,2)", "decimal(12,1)")
+
+
+def test_diff_directories(tmp_path: Path) -> None:
+    """Test that directories are compared contract by contract, matched by id across files."""
+    old, new = tmp_path / "old", tmp_path / "new"
+    old.mkdir()
+    new.mkdir()
+    (old / "orders.yaml").write_text(_contract("orders", "1.0.0", OLD))
+    (new / "moved.yaml").write_text(_contract("orders", "1.1.0", NEW))
+    (old / "same.yaml").write_text(_contract("same", "1.0.0", OLD))
+    (new / "same.yaml").write_text(_contract("same", "1.0.0", OLD))
+    (old / "gone.yaml").write_text(_contract("gone", "1.0.0", []))
+    (new / "fresh.yaml").write_text(_contract("fresh", "1.0.0", []))
+
+    diffs = {d.id: d for d in diff_paths(old, new)}
+    assert set(diffs) == {"orders", "gone", "fresh"}
+    assert diffs["orders"].breaking and diffs["orders"].needs_major_bump
+    assert [c.kind for c in diffs["gone"].changes] == ["contract_removed"]
+    assert not diffs["fresh"].breaking
+
+
+def test_diff_command(tmp_path: Path) -> None:
+    """Test the exit code and jsonl output of the diff command."""
+    (tmp_path / "old.yaml").write_text(_contract("orders", "1.0.0", OLD))
+    (tmp_path / "new.yaml").write_text(_contract("orders", "1.0.1", OLD[:2] + OLD[3:]))
+    result = runner.invoke(app, ["diff", str(tmp_path / "old.yaml"), str(tmp_path / "new.yaml"), "-f", "jsonl"])
+    assert result.exit_code == 1
+    assert [json.loads(line)["kind"] for line in result.stdout.splitlines()] == ["property_removed"]
+
+    result = runner.invoke(app, ["diff", str(tmp_path / "old.yaml"), str(tmp_path / "old.yaml")])
+    assert result.exit_code == 0 and "No changes" in result.stdout
+
+
+def test_diff_files_with_renamed_id(tmp_path: Path) -> None:
+    """Test that two single-contract files are compared property by property even when the id changed."""
+    (tmp_path / "old.yaml").write_text(_contract("orders-v1", "1.0.0", OLD))
+    (tmp_path / "new.yaml").write_text(_contract("orders-v2", "2.0.0", NEW))
+    [diff] = diff_files(tmp_path / "old.yaml", tmp_path / "new.yaml")
+    kinds = {change.kind for change in diff.changes}
+    assert diff.id == "orders-v2" and diff.old_file and diff.new_file
+    assert "property_renamed" in kinds and not kinds & {"contract_added", "contract_removed"}
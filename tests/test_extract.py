@@ -1,17 +1,46 @@
 """Tests for the extract command."""
 
+import os
 import tempfile
 from pathlib import Path
+from typing import Any
+from unittest.mock import patch
 
+import pytest
+import typer
+import yaml
 from typer.testing import CliRunner
 
+from datadoc.cache import ExtractionCache
 from datadoc.cli import app
-from datadoc.commands.extract import map_spark_to_logical_type
+from datadoc.commands.extract import (
+    DatasetSpec,
+    dataset_specs,
+    ddl_schema,
+    detect_schema_native,
+    extract_datasets,
+    extract_incremental,
+    map_spark_to_logical_type,
+    schema_from_fields,
+)
+from datadoc.extraction import fingerprint, native
+from datadoc.extraction.drift import compare
+from datadoc.extraction.engine import _describe_spark_type, _schema_from_dataframe
+from datadoc.extraction.nested import build_fields
+from datadoc.extraction.sampling import SamplingConfig
 from datadoc.models.odcs import LogicalType1
 
 runner = CliRunner()
 
 
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path_factory: pytest.TempPathFactory, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Keep the extraction cache out of the user's home directory."""
+    path = tmp_path_factory.mktemp("cache")
+    monkeypatch.setenv("DATADOC_CACHE_DIR", str(path))
+    return path
+
+
 def test_map_spark_to_logical_type():
     """Test mapping Spark types to ODCS logical types."""
     assert map_spark_to_logical_type("string") == LogicalType1.string
@@ -78,3 +107,321 @@ def test_extract_command_invalid_config():
         result = runner.invoke(app, ["extract", str(config_file)])
         assert result.exit_code in (1, 2)
         assert "Error" in result.stdout
+
+
+def test_native_engine_reads_parquet_footer(tmp_path: Path) -> None:
+    """Test that Parquet schemas are read from the footer without Spark."""
+    pa = pytest.importorskip("pyarrow")
+    pq = pytest.importorskip("pyarrow.parquet")
+    table = pa.table(
+        {
+            "id": pa.array([1, 2], pa.int64()),
+            "price": pa.array([1.5, 2.5], pa.float64()),
+            "tags": pa.array([["a"], ["b", "c"]], pa.list_(pa.string())),
+        }
+    )
+    schema = pa.schema([pa.field("id", pa.int64(), nullable=False), *list(table.schema)[1:]])
+    pq.write_table(table.cast(schema), tmp_path / "data.parquet")
+
+    result = detect_schema_native(str(tmp_path / "data.parquet"), "parquet")
+    assert result["properties"] == [
+        {"name": "id", "logicalType": "integer", "physicalType": "bigint", "required": True},
+        {"name": "price", "logicalType": "number", "physicalType": "double", "required": False},
+        {
+            "name": "tags",
+            "logicalType": "array",
+            "physicalType": "array",
+            "required": False,
+            "items": {"logicalType": "string", "physicalType": "string", "required": False},
+        },
+    ]
+
+
+def test_extract_command_native_engine(tmp_path: Path) -> None:
+    """Test that auto engine selection extracts a Parquet directory without Spark."""
+    pa = pytest.importorskip("pyarrow")
+    pq = pytest.importorskip("pyarrow.parquet")
+    dataset = tmp_path / "dataset" / "country=NL"
+    dataset.mkdir(parents=True)
+    pq.write_table(pa.table({"name": ["a"], "active": [True]}), dataset / "part-0.parquet")
+    config_file = tmp_path / "config.yaml"
+    config_file.write_text(f'data_path: "{tmp_path / "dataset"}"\nformat: "parquet"\n')
+
+    with patch("datadoc.extraction.engine.detect_schema") as spark_detect:
+        result = runner.invoke(app, ["extract", str(config_file), "--output", str(tmp_path / "schema.yaml")])
+    assert result.exit_code == 0, result.stdout
+    spark_detect.assert_not_called()
+    assert "native engine" in result.stdout
+    schema = yaml.safe_load((tmp_path / "schema.yaml").read_text())
+    assert [p["name"] for p in schema["properties"]] == ["name", "active", "country"]
+
+
+def test_native_engine_rejects_unsupported_format(tmp_path: Path) -> None:
+    """Test that forcing the native engine on CSV is a usage error."""
+    config_file = tmp_path / "config.yaml"
+    config_file.write_text(f'data_path: "{tmp_path}"\nformat: "csv"\nengine: "native"\n')
+    result = runner.invoke(app, ["extract", str(config_file)])
+    assert result.exit_code == 1
+    assert "native engine" in result.stdout
+
+
+def test_dataset_specs() -> None:
+    """Test reading single- and multi-dataset configurations."""
+    [legacy] = dataset_specs({"data_path": "data.csv", "options": {"header": "true"}})
+    assert legacy == DatasetSpec("extracted_schema", "data.csv", "csv", {"header": "true"})
+
+    specs = dataset_specs(
+        {
+            "format": "json",
+            "options": {"multiLine": "true"},
+            "sampling": {"max_files": 2},
+            "datasets": [
+                {"name": "orders", "data_path": "s3://bucket/orders/", "format": "parquet"},
+                {"data_path": "landing/customers/", "options": {"mode": "PERMISSIVE"}, "sampling": {"ratio": 0.1}},
+            ],
+        }
+    )
+    assert [(s.name, s.format) for s in specs] == [("orders", "parquet"), ("customers", "json")]
+    assert specs[1].options == {"multiLine": "true", "mode": "PERMISSIVE"}
+    assert specs[0].sampling == SamplingConfig(max_files=2)
+    assert specs[1].sampling == SamplingConfig(ratio=0.1)
+
+    with pytest.raises(typer.BadParameter, match="sampling"):
+        dataset_specs({"data_path": "x", "sampling": {"ratio": 0}})
+
+    with pytest.raises(typer.BadParameter, match="duplicates: a"):
+        dataset_specs({"datasets": [{"name": "a", "data_path": "x"}, {"name": "a", "data_path": "y"}]})
+
+
+def test_extract_datasets_shares_one_session() -> None:
+    """Test that concurrent Spark extractions reuse a single session."""
+    sessions = []
+
+    def spark_session() -> object:
+        sessions.append(object())
+        return sessions[0]
+
+    specs = [DatasetSpec(f"ds{i}", f"path{i}", "csv", {"header": "true"}) for i in range(4)]
+    with patch("datadoc.extraction.engine.detect_schema") as spark_detect:
+        spark_detect.side_effect = lambda spark, path, fmt, options: {"name": "x", "properties": []}
+        results = list(extract_datasets(specs, "auto", spark_session, parallelism=3))  # type: ignore[arg-type]
+    assert [r.schema["name"] for r in results if r.schema] == ["ds0", "ds1", "ds2", "ds3"]
+    assert {id(call.args[0]) for call in spark_detect.call_args_list} == {id(sessions[0])}
+    assert all(call.args[3] == {"header": "true"} for call in spark_detect.call_args_list)
+
+
+def test_extract_command_multiple_datasets(tmp_path: Path) -> None:
+    """Test extracting several datasets into one schema list and into split files."""
+    pa = pytest.importorskip("pyarrow")
+    pq = pytest.importorskip("pyarrow.parquet")
+    for name in ("orders", "customers"):
+        pq.write_table(pa.table({f"{name}_id": [1]}), tmp_path / f"{name}.parquet")
+    config_file = tmp_path / "config.yaml"
+    config_file.write_text(
+        yaml.dump(
+            {
+                "format": "parquet",
+                "datasets": [
+                    {"name": "orders", "data_path": str(tmp_path / "orders.parquet")},
+                    {"name": "customers", "data_path": str(tmp_path / "customers.parquet")},
+                    {"name": "missing", "data_path": str(tmp_path / "missing.parquet"), "engine": "native"},
+                ],
+            }
+        )
+    )
+
+    result = runner.invoke(app, ["extract", str(config_file), "-o", str(tmp_path / "schema.yaml")])
+    assert result.exit_code == 1
+    assert "missing" in result.stdout
+    schema = yaml.safe_load((tmp_path / "schema.yaml").read_text())
+    assert [s["name"] for s in schema["schema"]] == ["orders", "customers"]
+    assert schema["schema"][1]["properties"][0]["name"] == "customers_id"
+
+    result = runner.invoke(app, ["extract", str(config_file), "-o", str(tmp_path / "out"), "--split"])
+    assert sorted(p.name for p in (tmp_path / "out").iterdir()) == ["customers.yaml", "orders.yaml"]
+
+
+def test_incremental_extract_reads_only_changed_files(tmp_path: Path, cache_dir: Path) -> None:
+    """Test that unchanged datasets come from the cache and new files are merged in."""
+    pa = pytest.importorskip("pyarrow")
+    pq = pytest.importorskip("pyarrow.parquet")
+    dataset = tmp_path / "events"
+    (dataset / "day=1").mkdir(parents=True)
+    pq.write_table(pa.table({"id": pa.array([1], pa.int32())}), dataset / "day=1" / "part-0.parquet")
+    spec = DatasetSpec("events", str(dataset), "parquet")
+
+    def no_spark() -> None:
+        raise AssertionError("Spark should not be needed")
+
+    with ExtractionCache(cache_dir) as cache:
+        first = extract_incremental(spec, "auto", no_spark, cache)  # type: ignore[arg-type]
+        assert (first.cache, first.engine) == ("miss", "native")
+        assert first.schema is not None
+        assert [(p["name"], p["physicalType"]) for p in first.schema["properties"]] == [("id", "int"), ("day", "int")]
+
+        with patch("datadoc.extraction.native.read_fields") as read_fields:
+            second = extract_incremental(spec, "auto", no_spark, cache)  # type: ignore[arg-type]
+        read_fields.assert_not_called()
+        assert second.cache == "hit"
+        assert second.schema == first.schema
+
+        (dataset / "day=2").mkdir()
+        table = pa.table({"id": pa.array([2], pa.int64()), "note": ["x"]})
+        pq.write_table(table, dataset / "day=2" / "part-0.parquet")
+        with patch("datadoc.extraction.native.read_fields", wraps=native.read_fields) as read_fields:
+            third = extract_incremental(spec, "auto", no_spark, cache)  # type: ignore[arg-type]
+        assert [call.args[0] for call in read_fields.call_args_list] == [str(dataset / "day=2" / "part-0.parquet")]
+        assert third.cache == "incremental"
+        assert third.schema is not None
+        assert [(p["name"], p["physicalType"], p["required"]) for p in third.schema["properties"]] == [
+            ("id", "bigint", False),
+            ("note", "string", False),
+            ("day", "int", False),
+        ]
+
+
+def test_fingerprint_ignores_rewritten_parquet_files(tmp_path: Path) -> None:
+    """Test that a file touched without changing its footer is not reported as modified."""
+    pa = pytest.importorskip("pyarrow")
+    pq = pytest.importorskip("pyarrow.parquet")
+    path = tmp_path / "data.parquet"
+    pq.write_table(pa.table({"id": [1, 2]}), path)
+    before = fingerprint.scan(str(tmp_path), "parquet")
+    assert before is not None
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    after = fingerprint.scan(str(tmp_path), "parquet", before)
+    assert after is not None
+    assert after[str(path)].footer == before[str(path)].footer
+    assert not fingerprint.diff(before, after)
+
+    (tmp_path / "extra.parquet").write_bytes(path.read_bytes())
+    path.unlink()
+    changes = fingerprint.diff(before, fingerprint.scan(str(tmp_path), "parquet", before) or {})
+    assert (changes.added, changes.removed) == ([str(tmp_path / "extra.parquet")], [str(path)])
+
+
+def test_nested_spark_types_become_nested_properties() -> None:
+    """Test that structs, arrays and maps are extracted as nested properties with short physical types."""
+    types = pytest.importorskip("pyspark.sql.types")
+    address = types.StructType(
+        [types.StructField("street", types.StringType()), types.StructField("zip", types.IntegerType(), False)]
+    )
+    spark_schema = types.StructType(
+        [
+            types.StructField("home", address),
+            types.StructField("work", address),
+            types.StructField("visits", types.ArrayType(address, False)),
+            types.StructField("scores", types.MapType(types.StringType(), types.DoubleType())),
+        ]
+    )
+
+    class FakeFrame:
+        schema = spark_schema
+
+    schema = _schema_from_dataframe(FakeFrame())  # type: ignore[arg-type]
+    home, work, visits, scores = schema["properties"]
+    assert (home["logicalType"], home["physicalType"]) == ("object", "struct")
+    assert [(p["name"], p["physicalType"], p["required"]) for p in home["properties"]] == [
+        ("street", "string", False),
+        ("zip", "int", True),
+    ]
+    assert home["properties"] is work["properties"]  # repeated sub-schemas are interned
+    assert visits["items"]["properties"] is home["properties"]
+    assert visits["items"]["required"] is True
+    assert [(p["name"], p["logicalType"]) for p in scores["properties"]] == [("key", "string"), ("value", "number")]
+    assert ddl_schema({"properties": [visits, scores]}) == (
+        "`visits` array<struct<`street`:string,`zip`:int>>, `scores` map<string,double>"
+    )
+
+
+def test_deeply_nested_types_do_not_recurse() -> None:
+    """Test that schemas nested far beyond the recursion limit are walked iteratively."""
+    types = pytest.importorskip("pyspark.sql.types")
+    depth = 5000
+    data_type = types.StringType()
+    for level in range(depth):
+        data_type = types.StructType([types.StructField(f"level{level}", data_type)])
+    fields = build_fields([("root", data_type, True)], _describe_spark_type)
+    [root] = schema_from_fields(fields)["properties"]
+    for _ in range(depth):
+        [root] = root["properties"]
+    assert (root["name"], root["physicalType"]) == ("level0", "string")
+
+
+def test_extract_against_contract_reports_drift(tmp_path: Path) -> None:
+    """Test that --against reports added, missing and type-changed columns and merges the contract."""
+    pa = pytest.importorskip("pyarrow")
+    pq = pytest.importorskip("pyarrow.parquet")
+    dataset = tmp_path / "orders"
+    dataset.mkdir()
+    pq.write_table(pa.table({"name": ["a"], "active": [True], "amount": [1.5]}), dataset / "part-0.parquet")
+    config_file = tmp_path / "config.yaml"
+    config_file.write_text(f'datasets:\n  - data_path: "{dataset}"\n    format: parquet\n')
+    contract: dict[str, Any] = {
+        "id": "orders",
+        "version": "1.0.0",
+        "status": "active",
+        "schema": [
+            {
+                "name": "orders",
+                "properties": [
+                    {"name": "customer", "physicalName": "name", "logicalType": "string", "description": "kept"},
+                    {"name": "active", "logicalType": "string"},
+                    {"name": "gone", "logicalType": "integer"},
+                ],
+            }
+        ],
+    }
+    contract_file = tmp_path / "contract.yaml"
+    contract_file.write_text(yaml.safe_dump(contract))
+    merged_file = tmp_path / "merged.yaml"
+
+    args = ["extract", str(config_file), "--against", str(contract_file), "--merged-output", str(merged_file)]
+    result = runner.invoke(app, args)
+    assert result.exit_code == 1, result.stdout
+    assert "Schema Drift: orders" in result.stdout
+    merged = yaml.safe_load(merged_file.read_text())["schema"][0]["properties"]
+    assert [(p["name"], p["logicalType"]) for p in merged] == [
+        ("customer", "string"),
+        ("active", "boolean"),
+        ("gone", "integer"),
+        ("amount", "number"),
+    ]
+    assert merged[0]["description"] == "kept"
+
+    contract["schema"][0]["properties"] = merged[:2] + merged[3:]
+    contract_file.write_text(yaml.safe_dump(contract))
+    result = runner.invoke(app, ["extract", str(config_file), "--against", str(contract_file)])
+    assert result.exit_code == 0, result.stdout
+    assert "orders matches schema object 'orders'" in result.stdout
+
+
+def test_compare_descends_into_array_items() -> None:
+    """Test that array items are compared, and scalar items merge back without a `properties` list."""
+    declared = {
+        "name": "orders",
+        "properties": [
+            {"name": "tags", "logicalType": "array", "items": {"logicalType": "string"}},
+            {
+                "name": "lines",
+                "logicalType": "array",
+                "items": {"logicalType": "object", "properties": [{"name": "sku"}]},
+            },
+        ],
+    }
+    live = {
+        "properties": [
+            {"name": "tags", "logicalType": "array", "items": {"logicalType": "string"}},
+            {
+                "name": "lines",
+                "logicalType": "array",
+                "items": {"logicalType": "object", "properties": [{"name": "sku"}, {"name": "qty"}]},
+            },
+        ]
+    }
+    drift, merged = compare("orders", declared, live)
+    assert drift.added == ["lines[].qty"] and not drift.missing and not drift.type_changed
+    tags, lines = merged["properties"]
+    assert tags["items"] == {"logicalType": "string"}
+    assert [p["name"] for p in lines["items"]["properties"]] == ["sku", "qty"]
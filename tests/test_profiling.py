@@ -0,0 +1,102 @@
+"""Tests for single-pass column profiling."""
+
+import datetime
+from unittest.mock import MagicMock, patch
+
+from datadoc.extraction.engine import DatasetSpec, ddl_schema, extract_datasets
+from datadoc.extraction.profiling import ColumnProfile, DatasetProfile, apply_profile, unique_candidates
+
+
+def _schema() -> dict:
+    return {
+        "name": "orders",
+        "logicalType": "object",
+        "properties": [
+            {"name": "id", "logicalType": "integer", "physicalType": "bigint", "required": False},
+            {"name": "amount", "logicalType": "number", "physicalType": "double", "required": False},
+            {"name": "placed", "logicalType": "date", "physicalType": "date", "required": False},
+        ],
+    }
+
+
+def test_apply_profile_seeds_rules() -> None:
+    """Test that statistics become required/unique flags and library quality rules."""
+    profile = DatasetProfile(
+        row_count=100,
+        columns={
+            "id": ColumnProfile(non_null_count=100, distinct_count=100, exact_distinct_count=100, min=1, max=100),
+            "amount": ColumnProfile(non_null_count=90, distinct_count=40, min=0.5, max=99.5, quantiles={"p50": 10.0}),
+            "placed": ColumnProfile(
+                non_null_count=100, distinct_count=3, min=datetime.date(2024, 1, 1), max=datetime.date(2024, 1, 3)
+            ),
+        },
+    )
+    schema = apply_profile(_schema(), profile)
+    id_prop, amount, placed = schema["properties"]
+
+    assert schema["quality"][0]["rule"] == "rowCount"
+    assert id_prop["required"] is True and id_prop["unique"] is True
+    assert [q["rule"] for q in id_prop["quality"]] == ["duplicateCount", "validValues"]
+    assert id_prop["quality"][1]["mustBeBetween"] == [1.0, 100.0]
+
+    assert amount["required"] is False and "unique" not in amount
+    assert amount["customProperties"][0]["value"]["nullRate"] == 0.1
+    assert amount["customProperties"][0]["value"]["p50"] == 10.0
+
+    assert placed["customProperties"][0]["value"]["min"] == "2024-01-01"
+    assert "quality" not in placed
+
+
+def test_apply_profile_near_unique_column() -> None:
+    """Test that a column with 2% duplicates is not made unique, however close its estimate is."""
+    profile = DatasetProfile(
+        row_count=1000,
+        columns={
+            "id": ColumnProfile(non_null_count=1000, distinct_count=1000, exact_distinct_count=980, min=1, max=980)
+        },
+    )
+    id_prop = apply_profile(_schema(), profile)["properties"][0]
+
+    assert id_prop["required"] is True and "unique" not in id_prop
+    assert [q["rule"] for q in id_prop["quality"]] == ["validValues"]
+    assert id_prop["customProperties"][0]["value"]["distinctCount"] == 980
+
+
+def test_unique_candidates() -> None:
+    """Test that only columns without nulls and an estimate near the row count get an exact count."""
+    profile = DatasetProfile(
+        row_count=1000,
+        columns={
+            "id": ColumnProfile(non_null_count=1000, distinct_count=1012),
+            "near": ColumnProfile(non_null_count=1000, distinct_count=960),
+            "status": ColumnProfile(non_null_count=1000, distinct_count=4),
+            "email": ColumnProfile(non_null_count=998, distinct_count=998),
+        },
+    )
+    assert unique_candidates(profile, ["id", "near", "status", "email"]) == ["id", "near"]
+    assert unique_candidates(DatasetProfile(row_count=0, columns={"id": ColumnProfile(0, 0)}), ["id"]) == []
+
+
+def test_ddl_schema_quotes_names() -> None:
+    """Test the DDL used to re-read CSV/JSON without inference."""
+    schema = {"properties": [{"name": "a`b", "physicalType": "int"}, {"name": "c", "physicalType": "array<string>"}]}
+    assert ddl_schema(schema) == "`a``b` int, `c` array<string>"
+
+
+def test_extract_datasets_profiles_with_extracted_schema() -> None:
+    """Test that profiling re-reads CSV with the extracted schema and one aggregation."""
+    spark = MagicMock()
+    spec = DatasetSpec("orders", "orders.csv", "csv", {"header": "true"})
+    with (
+        patch("datadoc.extraction.engine.detect_schema", return_value=_schema()),
+        patch("datadoc.extraction.engine.profile_dataframe") as profile_dataframe,
+    ):
+        profile_dataframe.return_value = DatasetProfile(row_count=0, columns={})
+        [result] = list(extract_datasets([spec], "spark", lambda: spark, profile=True))
+
+    assert result.error is None
+    spark.read.format.return_value.options.return_value.schema.assert_called_once_with(
+        "`id` bigint, `amount` double, `placed` date"
+    )
+    profile_dataframe.assert_called_once()
+    assert result.schema is not None and result.schema["quality"][0]["rule"] == "rowCount"
@@ -0,0 +1,71 @@
+"""Tests for bounded schema inference sampling."""
+
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+from datadoc.extraction.sampling import (
+    SamplingConfig,
+    list_data_files,
+    load_sample,
+    parse_size,
+    select_files,
+)
+
+
+def _write_files(directory: Path, sizes: list[int]) -> list[Path]:
+    paths = []
+    for i, size in enumerate(sizes):
+        path = directory / f"part-{i:03d}.csv"
+        path.write_bytes(b"x" * size)
+        paths.append(path)
+    return paths
+
+
+def test_parse_size() -> None:
+    """Test parsing byte budgets."""
+    assert parse_size(2048) == 2048
+    assert parse_size("512KB") == 512 * 1024
+    assert parse_size("1.5 gb") == int(1.5 * 1024**3)
+    assert parse_size("64M") == 64 * 1024**2
+    with pytest.raises(ValueError):
+        parse_size("lots")
+
+
+def test_sampling_config_from_config() -> None:
+    """Test parsing and validating the sampling section."""
+    assert SamplingConfig.from_config(None) is None
+    config = SamplingConfig.from_config({"ratio": 0.1, "max_bytes": "1MB", "max_files": 3})
+    assert config == SamplingConfig(ratio=0.1, max_bytes=1024**2, max_files=3)
+    with pytest.raises(ValueError, match="ratio"):
+        SamplingConfig.from_config({"ratio": 2})
+    with pytest.raises(ValueError, match="Unknown"):
+        SamplingConfig.from_config({"rows": 10})
+
+
+def test_list_and_select_files(tmp_path: Path) -> None:
+    """Test file listing skips markers and selection respects both budgets."""
+    files = _write_files(tmp_path, [100, 100, 100, 100])
+    (tmp_path / "_SUCCESS").write_text("")
+    assert list_data_files(str(tmp_path)) == files
+    assert list_data_files("s3://bucket/data/") is None
+
+    assert select_files(files, SamplingConfig(max_files=2)) == files[:2]
+    assert select_files(files, SamplingConfig(max_bytes=250)) == files[:2]
+    assert select_files(files, SamplingConfig(max_bytes=10)) == files[:1]
+
+
+def test_load_sample_limits_spark_read(tmp_path: Path) -> None:
+    """Test that a sampled read only hands the selected files and options to Spark."""
+    files = _write_files(tmp_path, [100, 100, 100])
+    spark = MagicMock()
+    _, report = load_sample(
+        spark, str(tmp_path), "csv", {"header": "true"}, SamplingConfig(ratio=0.5, max_files=1, max_rows=10)
+    )
+
+    spark.read.text.assert_called_once_with([str(files[0])])
+    spark.read.text.return_value.limit.assert_called_once_with(10)
+    spark.read.options.assert_called_once_with(header="true", samplingRatio="0.5")
+    assert (report.files_read, report.total_files, report.bytes_read, report.total_bytes) == (1, 3, 100, 300)
+    assert report.describe() == "1 of 3 files (100 B of 300 B), samplingRatio=0.5, first 10 lines"
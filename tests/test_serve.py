@@ -0,0 +1,123 @@
+"""Tests for the validation daemon and the serve command."""
+
+import threading
+import time
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+from typer.testing import CliRunner
+
+from datadoc.cli import app
+from datadoc.daemon import DaemonError, DaemonServer, request, start_server, validate_remote
+
+runner = CliRunner()
+
+EXAMPLES = Path(__file__).parent.parent / "examples"
+
+
+@pytest.fixture
+def daemon(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Iterator[DaemonServer]:
+    """Run a daemon on a private socket in a background thread."""
+    monkeypatch.setenv("DATADOC_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setenv("DATADOC_SOCKET", str(tmp_path / "d.sock"))
+    server = start_server()
+    thread = threading.Thread(target=server.serve, daemon=True)
+    thread.start()
+    yield server
+    request({"op": "shutdown"}, server.socket_path)
+    thread.join(timeout=5)
+    assert not thread.is_alive()
+    assert not server.socket_path.exists()
+
+
+def test_validate_uses_running_daemon(daemon: DaemonServer, tmp_path: Path) -> None:
+    """Test that validate sends its work to the daemon and renders the results."""
+    invalid = tmp_path / "invalid.yaml"
+    invalid.write_text("version: 1.0.0\n")
+
+    result = runner.invoke(app, ["validate", str(EXAMPLES / "sample_contract.yml"), "-v"])
+    assert result.exit_code == 0, result.stdout
+    assert "sample-contract-123" in result.stdout
+    result = runner.invoke(app, ["validate", str(invalid)])
+    assert result.exit_code == 1
+    assert "Invalid data contract" in result.stdout
+    assert daemon.requests == 2
+
+    result = runner.invoke(app, ["validate", str(invalid), "--no-daemon"])
+    assert result.exit_code == 1
+    assert daemon.requests == 2
+
+
+def test_validate_remote_round_trip(daemon: DaemonServer) -> None:
+    """Test that a warm daemon answers a cached validation in a few milliseconds."""
+    path = EXAMPLES / "sample_contract.yml"
+    results = validate_remote([path], "jsonschema")
+    assert results is not None
+    [result] = results
+    assert result.valid and result.path == str(path)
+
+    start = time.perf_counter()
+    for _ in range(20):
+        validate_remote([path], "pydantic")
+    assert (time.perf_counter() - start) / 20 < 0.05
+
+
+def test_daemon_reports_errors_and_refuses_a_second_instance(daemon: DaemonServer) -> None:
+    """Test that bad requests are answered with an error and the socket is not taken over."""
+    with pytest.raises(DaemonError, match="Unknown operation"):
+        request({"op": "nope"}, daemon.socket_path)
+    with pytest.raises(DaemonError, match="already serving"):
+        start_server(daemon.socket_path)
+    result = runner.invoke(app, ["serve", "--status", "--socket", str(daemon.socket_path)])
+    assert result.exit_code == 0
+    assert "requests" in result.stdout
+
+
+def test_extract_uses_running_daemon(daemon: DaemonServer, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that extract reads footers in the daemon, with its cache, relative to the caller's directory."""
+    pa = pytest.importorskip("pyarrow")
+    import pyarrow.parquet as pq
+
+    pq.write_table(pa.table({"id": [1, 2]}), tmp_path / "data.parquet")
+    (tmp_path / "extract.yaml").write_text("data_path: data.parquet\nformat: parquet\nengine: native\n")
+    monkeypatch.chdir(tmp_path)
+    result = runner.invoke(app, ["extract", "extract.yaml"])
+    assert result.exit_code == 0, result.stdout
+    assert "id" in result.stdout and daemon.requests == 1
+    result = runner.invoke(app, ["extract", "extract.yaml"])
+    assert result.exit_code == 0 and "from cache" in result.stdout and daemon.requests == 2
+
+    result = runner.invoke(app, ["extract", "extract.yaml", "--no-daemon"])
+    assert result.exit_code == 0 and daemon.requests == 2
+
+
+def test_slow_request_does_not_block_others(daemon: DaemonServer, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that other clients are answered while a validation is still running."""
+    started, release = threading.Event(), threading.Event()
+
+    def blocking(message: dict) -> list:
+        started.set()
+        release.wait(10)
+        return []
+
+    monkeypatch.setattr(daemon, "_validate", blocking)
+    slow = threading.Thread(target=validate_remote, args=([EXAMPLES / "sample_contract.yml"], "pydantic"))
+    slow.start()
+    try:
+        assert started.wait(10)
+        assert request({"op": "ping"}, daemon.socket_path, timeout=5) is not None
+    finally:
+        release.set()
+        slow.join(10)
+
+
+def test_stale_socket_is_replaced(tmp_path: Path) -> None:
+    """Test that a socket left behind by a dead daemon does not block a new one."""
+    socket_path = tmp_path / "d.sock"
+    start_server(socket_path).server_close()
+    assert socket_path.exists()
+    assert request({"op": "ping"}, socket_path) is None
+    server = start_server(socket_path)
+    server.server_close()
+    socket_path.unlink()
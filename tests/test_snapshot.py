@@ -0,0 +1,111 @@
+"""Tests for compiled contract snapshots and bundles."""
+
+import shutil
+from datetime import date, datetime
+from pathlib import Path
+
+import pytest
+from typer.testing import CliRunner
+
+from datadoc import snapshot, yaml_io
+from datadoc.cli import app
+from datadoc.validation import validate_documents, validate_source
+
+runner = CliRunner()
+
+EXAMPLES = Path(__file__).parent.parent / "examples"
+
+
+def test_compile_and_reload(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that commands read fresh snapshots instead of YAML, and parse YAML again once it changes."""
+    contract = tmp_path / "sample_contract.yml"
+    shutil.copy(EXAMPLES / "sample_contract.yml", contract)
+    result = runner.invoke(app, ["compile", str(tmp_path)])
+    assert result.exit_code == 0, result.output
+    assert snapshot.snapshot_path(contract).exists()
+    documents = snapshot.documents(contract)
+    assert documents == [yaml_io.load(contract.read_bytes())]
+    assert snapshot.documents(contract, contract.read_bytes()) == documents
+
+    def no_yaml(*args: object) -> None:
+        raise AssertionError("YAML was parsed")
+
+    with monkeypatch.context() as m:
+        m.setattr(yaml_io, "load_all", no_yaml)
+        result = runner.invoke(app, ["validate", str(contract), "--no-cache", "--no-daemon", "--workers", "1"])
+        assert result.exit_code == 0, result.output
+
+    contract.write_text(contract.read_text().replace('status: "active"', 'status: "deprecated"'))
+    assert snapshot.documents(contract) is None
+    assert snapshot.documents(contract, contract.read_bytes()) is None
+
+
+def test_snapshot_keeps_types(tmp_path: Path) -> None:
+    """Test that dates and timestamps reload as YAML parsed them, and other non-JSON values stay in YAML."""
+    text = (EXAMPLES / "sample_contract.yml").read_text().replace('dateIn: "2024-01-01"', "dateIn: 2024-01-01")
+    text += "contractCreatedTs: 2024-03-01T12:30:00+02:00\n"
+    contract = tmp_path / "dated.yml"
+    contract.write_text(text)
+    binary = tmp_path / "binary.yml"
+    binary.write_text(text.replace('name: "Sample Data Contract"', "name: !!binary U2FtcGxl"))
+    result = runner.invoke(app, ["compile", str(tmp_path)])
+    assert result.exit_code == 0, result.output
+    assert "binary.yml" in result.output and "a snapshot cannot keep" in result.output
+    assert not snapshot.snapshot_path(binary).exists()
+
+    parsed = yaml_io.load(contract.read_bytes())
+    assert isinstance(parsed["team"][0]["dateIn"], date) and isinstance(parsed["contractCreatedTs"], datetime)
+    assert snapshot.documents(contract) == [parsed]
+    for engine in ("pydantic", "jsonschema"):
+        fresh = validate_source(str(contract), engine=engine)
+        assert [(r.valid, r.errors) for r in fresh] == [
+            (r.valid, r.errors) for r in validate_documents("", text.encode(), engine)
+        ]
+
+    bundle_path = tmp_path / "contracts.bundle"
+    assert runner.invoke(app, ["compile", str(contract), "--bundle", str(bundle_path)]).exit_code == 0
+    with snapshot.Bundle(bundle_path) as bundle:
+        assert bundle["sample-contract-123"] == parsed
+        assert bundle.load("sample-contract-123").team[0].dateIn == date(2024, 1, 1)  # type: ignore[index]
+    result = runner.invoke(app, ["compile", str(binary), "--bundle", str(bundle_path)])
+    assert result.exit_code == 1 and "binary.yml" in result.output
+
+
+def test_compile_invalid(tmp_path: Path) -> None:
+    """Test that invalid contracts are reported and neither snapshotted nor bundled."""
+    shutil.copy(EXAMPLES / "sample_contract.yml", tmp_path / "valid.yml")
+    (tmp_path / "invalid.yml").write_text("id: orders\nversion: 1.0.0\n")
+    result = runner.invoke(app, ["compile", str(tmp_path), "--bundle", str(tmp_path / "contracts.bundle")])
+    assert result.exit_code == 1
+    assert "invalid.yml" in result.output
+    assert not (tmp_path / "contracts.bundle").exists()
+
+    result = runner.invoke(app, ["compile", str(tmp_path)])
+    assert result.exit_code == 1
+    assert snapshot.snapshot_path(tmp_path / "valid.yml").exists()
+    assert not snapshot.snapshot_path(tmp_path / "invalid.yml").exists()
+
+
+def test_bundle(tmp_path: Path) -> None:
+    """Test packing contracts into a bundle and loading them one at a time by id."""
+    contracts = tmp_path / "contracts"
+    shutil.copytree(EXAMPLES, contracts)
+    bundle_path = tmp_path / "contracts.bundle"
+    result = runner.invoke(app, ["compile", str(contracts), "--bundle", str(bundle_path)])
+    assert result.exit_code == 0, result.output
+    assert not list(contracts.glob(f"*{snapshot.SUFFIX}"))
+
+    with snapshot.Bundle(bundle_path) as bundle:
+        assert "sample-contract-123" in bundle and len(bundle) == len(list(contracts.glob("*.yml")))
+        assert bundle["sample-contract-123"]["schema"][0]["properties"][0]["name"] == "user_id"
+        model = bundle.load("sample-contract-123")
+        assert model.id == "sample-contract-123"
+
+    shutil.copy(contracts / "sample_contract.yml", contracts / "copy.yml")
+    result = runner.invoke(app, ["compile", str(contracts), "--bundle", str(bundle_path)])
+    assert result.exit_code != 0
+    assert "sample-contract-123" in result.output
+
+    (tmp_path / "empty.bundle").write_bytes(b"")
+    with pytest.raises(snapshot.SnapshotError):
+        snapshot.Bundle(tmp_path / "empty.bundle")
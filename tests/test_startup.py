@@ -0,0 +1,48 @@
+"""Startup cost checks: light commands must not import heavy dependencies."""
+
+import json
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+EXAMPLE = Path(__file__).parent.parent / "examples" / "sample_contract.yml"
+
+HEAVY_MODULES = ["pyspark", "datadoc.models.odcs", "pydantic"]
+
+PROBE = """
+import json, sys
+from typer.testing import CliRunner
+from datadoc.cli import app
+result = CliRunner().invoke(app, sys.argv[1:])
+heavy = {heavy!r}
+print(json.dumps({{"exit_code": result.exit_code, "loaded": [m for m in heavy if m in sys.modules]}}))
+"""
+
+
+def _probe(*args: str) -> tuple[dict, float]:
+    """Run the CLI in a fresh interpreter and report which heavy modules it loaded."""
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-c", PROBE.format(heavy=HEAVY_MODULES), *args],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    elapsed = time.perf_counter() - start
+    return json.loads(proc.stdout.strip().splitlines()[-1]), elapsed
+
+
+def test_help_imports_nothing_heavy() -> None:
+    """`datadoc --help` must not load pyspark or the pydantic models."""
+    report, elapsed = _probe("--help")
+    assert report["exit_code"] == 0
+    assert report["loaded"] == [], f"--help imported {report['loaded']} ({elapsed:.2f}s)"
+
+
+def test_validate_does_not_import_pyspark(tmp_path: Path) -> None:
+    """`datadoc validate` loads the models but never pyspark."""
+    report, elapsed = _probe("validate", str(EXAMPLE), "--cache-dir", str(tmp_path))
+    assert report["exit_code"] == 0
+    assert "pyspark" not in report["loaded"], f"validate imported pyspark ({elapsed:.2f}s)"
+    assert "datadoc.models.odcs" in report["loaded"]
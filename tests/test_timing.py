@@ -0,0 +1,55 @@
+"""Tests for phase timing and the global --profile option."""
+
+import json
+import pstats
+import time
+from pathlib import Path
+
+from typer.testing import CliRunner
+
+from datadoc import timing
+from datadoc.cli import app
+
+runner = CliRunner()
+
+EXAMPLE = Path(__file__).parent.parent / "examples" / "sample_contract.yml"
+
+
+def test_spans_record_self_time() -> None:
+    """Test that nested spans are subtracted from their parent and nothing is kept while disabled."""
+    with timing.span("ignored"):
+        pass
+    recorder = timing.enable()
+    try:
+        with timing.span("outer"):
+            time.sleep(0.01)
+            with timing.span("inner"):
+                time.sleep(0.02)
+        timing.traced("inner")(time.sleep)(0.01)
+    finally:
+        assert timing.disable() is recorder
+    with timing.span("ignored"):
+        pass
+
+    phases = {phase.name: phase for phase in recorder.phases()}
+    assert set(phases) == {"outer", "inner"}
+    assert phases["inner"].calls == 2 and phases["inner"].self_ns >= 30_000_000
+    assert 10_000_000 <= phases["outer"].self_ns < phases["outer"].total_ns
+    assert phases["outer"].total_ns >= 30_000_000
+
+
+def test_profile_option(tmp_path: Path) -> None:
+    """Test that --profile prints a breakdown and --profile-output writes a trace or pstats file."""
+    trace = tmp_path / "trace.json"
+    args = ["--profile-output", str(trace), "validate", "--no-daemon", "--no-cache", str(EXAMPLE)]
+    result = runner.invoke(app, args)
+    assert result.exit_code == 0, result.output
+    assert "yaml.parse" in result.output and "validate.pydantic" in result.output
+    events = json.loads(trace.read_text())["traceEvents"]
+    assert {"yaml.parse", "validate.pydantic"} <= {event["name"] for event in events}
+    assert all(event["ph"] == "X" and event["dur"] >= 0 for event in events)
+
+    stats = tmp_path / "run.pstats"
+    result = runner.invoke(app, ["--profile-output", str(stats), "validate", "--no-daemon", str(EXAMPLE)])
+    assert result.exit_code == 0, result.output
+    assert pstats.Stats(str(stats)).stats  # type: ignore[attr-defined]
@@ -0,0 +1,36 @@
+"""Tests for trusted reloads of validated contracts."""
+
+from datetime import date
+from pathlib import Path
+
+import pytest
+
+from datadoc import trusted, yaml_io
+from datadoc.models.odcs import OpenDataContractStandardODCS
+
+EXAMPLE = Path(__file__).parent.parent / "examples" / "sample_contract.yml"
+
+
+def test_trusted_form_round_trip() -> None:
+    """Test that the trusted form builds the same model and keeps the raw document."""
+    document = yaml_io.load(EXAMPLE.read_bytes())
+    document["team"][0]["dateIn"] = date(2024, 1, 1)
+    data = trusted.dump(document, spot_check=1.0)
+
+    contract = trusted.load(data)
+    assert contract == OpenDataContractStandardODCS.model_validate(document)
+    assert contract.team and contract.team[0].dateIn == date(2024, 1, 1)
+    assert contract.schema_ and contract.schema_[0].name == "users"
+    raw = trusted.load_document(data)
+    assert raw["schema"][0]["properties"][0]["name"] == "user_id"
+
+
+def test_spot_check(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that sampled dumps reject content that does not validate, and others skip the check."""
+    invalid = {"id": "orders", "version": "1.0.0"}
+    monkeypatch.delenv("DATADOC_TRUSTED_SPOT_CHECK", raising=False)
+    assert trusted.load_document(trusted.dump(invalid, spot_check=0.0)) == invalid
+
+    monkeypatch.setenv("DATADOC_TRUSTED_SPOT_CHECK", "1")
+    with pytest.raises(trusted.TrustedLoadError, match="'orders' does not validate"):
+        trusted.dump(invalid)
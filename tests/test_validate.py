@@ -0,0 +1,282 @@
+"""Tests for the validate command."""
+
+from pathlib import Path
+
+import pytest
+from typer.testing import CliRunner
+
+from datadoc.cache import ValidationCache
+from datadoc.cli import app
+from datadoc.validation import collect_contract_files, validate_many
+
+runner = CliRunner()
+
+EXAMPLES = Path(__file__).parent.parent / "examples"
+
+VALID_CONTRACT = """
+apiVersion: v3.0.2
+kind: DataContract
+id: {id}
+version: 1.0.0
+status: active
+"""
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path_factory: pytest.TempPathFactory, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Keep the validation cache out of the user's home directory."""
+    directory = tmp_path_factory.mktemp("cache")
+    monkeypatch.setenv("DATADOC_CACHE_DIR", str(directory))
+    return directory
+
+
+def _write_contracts(directory: Path, count: int) -> list[Path]:
+    paths = []
+    for i in range(count):
+        path = directory / f"contract_{i}.yaml"
+        path.write_text(VALID_CONTRACT.format(id=f"contract-{i}"))
+        paths.append(path)
+    return paths
+
+
+def test_validate_single_file() -> None:
+    """Test validating a single valid contract."""
+    result = runner.invoke(app, ["validate", str(EXAMPLES / "sample_contract.yml"), "--verbose"])
+    assert result.exit_code == 0
+    assert "valid ODCS data contract" in result.stdout
+    assert "sample-contract-123" in result.stdout
+
+
+def test_validate_invalid_contract(tmp_path: Path) -> None:
+    """Test that a contract missing required fields fails."""
+    contract = tmp_path / "invalid.yaml"
+    contract.write_text("kind: DataContract\n")
+    result = runner.invoke(app, ["validate", str(contract)])
+    assert result.exit_code == 1
+    assert "Invalid data contract" in result.stdout
+
+
+def test_validate_invalid_yaml(tmp_path: Path) -> None:
+    """Test that malformed YAML is reported as such."""
+    contract = tmp_path / "broken.yaml"
+    contract.write_text("invalid: yaml: content: {")
+    result = runner.invoke(app, ["validate", str(contract)])
+    assert result.exit_code == 1
+    assert "Invalid YAML format" in result.stdout
+
+
+def test_validate_directory_with_pool(tmp_path: Path) -> None:
+    """Test bulk validation of a directory across worker processes."""
+    _write_contracts(tmp_path, 6)
+    result = runner.invoke(app, ["validate", str(tmp_path), "--workers", "2"])
+    assert result.exit_code == 0
+    assert "All 6 contracts are valid" in result.stdout
+
+
+def test_validate_glob_reports_failures(tmp_path: Path) -> None:
+    """Test that one bad contract fails the whole run with a summary."""
+    _write_contracts(tmp_path, 3)
+    (tmp_path / "contract_bad.yaml").write_text("version: 1.0.0\n")
+    result = runner.invoke(app, ["validate", str(tmp_path / "*.yaml"), "--workers", "1"])
+    assert result.exit_code == 1
+    assert "1 of 4 contracts failed validation" in result.stdout
+
+
+def test_validate_missing_path() -> None:
+    """Test that a missing path is rejected."""
+    result = runner.invoke(app, ["validate", "does-not-exist.yaml"])
+    assert result.exit_code == 2
+
+
+def test_collect_contract_files(tmp_path: Path) -> None:
+    """Test expansion of directories and globs into contract files."""
+    nested = tmp_path / "nested"
+    nested.mkdir()
+    paths = _write_contracts(tmp_path, 2) + _write_contracts(nested, 1)
+    (tmp_path / "notes.txt").write_text("not a contract")
+    assert collect_contract_files([str(tmp_path)]) == sorted(paths)
+    assert collect_contract_files([str(tmp_path / "*.yaml"), str(paths[0])]) == sorted(paths[:2])
+
+
+def test_validate_many_preserves_order(tmp_path: Path) -> None:
+    """Test that pooled results come back in input order."""
+    paths = _write_contracts(tmp_path, 5)
+    results = list(validate_many(paths, workers=2))
+    assert [r.path for r in results] == [str(p) for p in paths]
+    assert all(r.valid for r in results)
+    assert results[0].contract is not None and results[0].contract["id"] == "contract-0"
+
+
+def test_cache_answers_unchanged_files(tmp_path: Path, cache_dir: Path) -> None:
+    """Test that a warm cache skips parsing and a content change invalidates it."""
+    paths = _write_contracts(tmp_path, 3)
+    with ValidationCache(cache_dir) as cache:
+        assert all(r.valid for r in validate_many(paths, workers=1, cache=cache))
+
+    paths[0].write_text("version: 1.0.0\n")
+    with ValidationCache(cache_dir) as cache:
+        results = list(validate_many(paths, workers=1, cache=cache))
+        assert [r.valid for r in results] == [False, True, True]
+        assert results[0].errors and results[0].errors[0]["loc"]
+
+    with ValidationCache(cache_dir) as cache:
+        results = list(validate_many(paths, workers=1, cache=cache))
+    assert [r.valid for r in results] == [False, True, True]
+    assert results[1].path == str(paths[1])
+
+
+def test_cache_evicts_oldest_entries(cache_dir: Path) -> None:
+    """Test that the cache never grows past its bound."""
+    with ValidationCache(cache_dir, max_entries=2) as cache:
+        cache.put_many([("a", {"valid": True})])
+        cache.put_many([("b", {"valid": True}), ("c", {"valid": False})])
+        assert set(cache.get_many(["a", "b", "c"])) == {"b", "c"}
+
+
+def test_validate_no_cache(tmp_path: Path, cache_dir: Path) -> None:
+    """Test that --no-cache leaves the cache untouched."""
+    _write_contracts(tmp_path, 2)
+    result = runner.invoke(app, ["validate", str(tmp_path), "--no-cache", "--workers", "1"])
+    assert result.exit_code == 0
+    assert not (cache_dir / "validation.sqlite").exists()
+
+
+def test_jsonschema_engine_checks_schema_properties(tmp_path: Path) -> None:
+    """Test that the JSON schema engine validates property subtrees the generated models drop."""
+    contract = tmp_path / "contract.yaml"
+    contract.write_text(
+        VALID_CONTRACT.format(id="props")
+        + "schema:\n  - name: orders\n    properties:\n      - name: id\n        logicalType: uuid\n"
+    )
+    [pydantic_result] = validate_many([contract], workers=1, engine="pydantic")
+    [json_result] = validate_many([contract], workers=1, engine="jsonschema")
+    assert pydantic_result.valid
+    assert not json_result.valid
+    assert json_result.errors[0]["loc"] == ["schema", 0, "properties", 0, "logicalType"]
+    assert json_result.errors[0]["type"] == "enum"
+
+    result = runner.invoke(app, ["validate", str(EXAMPLES / "sample_contract.yml"), "--engine", "jsonschema", "-v"])
+    assert result.exit_code == 0, result.stdout
+    assert "sample-contract-123" in result.stdout
+    result = runner.invoke(app, ["validate", str(contract), "--engine", "jsonschema"])
+    assert result.exit_code == 1
+    assert "schema.0.properties.0.logicalType" in result.stdout
+
+
+def test_compiled_schema_matches_jsonschema() -> None:
+    """Test that the compiled validator agrees with the reference jsonschema implementation."""
+    jsonschema = pytest.importorskip("jsonschema")
+    import yaml
+
+    from datadoc.validation import json_schema_validator
+
+    compiled = json_schema_validator()
+    reference = jsonschema.Draft201909Validator(compiled.schema)
+    documents = [yaml.safe_load(path.read_text()) for path in sorted(EXAMPLES.glob("*.yml"))]
+    documents += [
+        {"apiVersion": "v3.0.2", "kind": "DataContract", "id": "x", "version": "1", "status": "active", "extra": 1},
+        {"apiVersion": "v9", "kind": "DataContract", "id": "x", "version": "1", "status": "active"},
+        {"kind": "DataContract", "id": 1, "version": "1", "status": "active"},
+        {"apiVersion": "v3.0.2", "kind": "DataContract", "id": "x", "version": "1", "status": "active", "schema": [{}]},
+    ]
+    for document in documents:
+        expected = sorted(str(list(error.absolute_path)) for error in reference.iter_errors(document))
+        actual = sorted(str(error.loc) for error in compiled.iter_errors(document))
+        assert actual == expected
+        assert compiled.is_valid(document) == (not expected)
+
+
+def _write_bundle(path: Path, count: int, padding: int = 0) -> None:
+    """Write `count` contracts as one multi-document YAML stream."""
+    with open(path, "w") as f:
+        for i in range(count):
+            f.write("---" + VALID_CONTRACT.format(id=f"c{i}"))
+            if padding:
+                f.write(f"description:\n  purpose: {'x' * padding}\n")
+
+
+def test_multi_document_bundle(tmp_path: Path, cache_dir: Path) -> None:
+    """Test that each document of a bundle is validated and reported on its own."""
+    bundle = tmp_path / "bundle.yaml"
+    _write_bundle(bundle, 3)
+    bundle.write_text(bundle.read_text().replace("id: c1\n", ""))
+    for _ in range(2):
+        with ValidationCache(cache_dir) as cache:
+            results = list(validate_many([bundle], workers=1, cache=cache))
+        assert [(r.document, r.valid) for r in results] == [(1, True), (2, False), (3, True)]
+
+    result = runner.invoke(app, ["validate", str(bundle)])
+    assert result.exit_code == 1
+    assert f"{bundle}#2" in result.stdout
+    assert "1 of 3 contracts failed validation" in result.stdout
+
+
+def test_yaml_error_ends_the_stream(tmp_path: Path) -> None:
+    """Test that documents before a YAML error are still reported."""
+    bundle = tmp_path / "bundle.yaml"
+    bundle.write_text("---" + VALID_CONTRACT.format(id="ok") + "---\nkey: [unclosed\n")
+    results = list(validate_many([bundle], workers=1))
+    assert [(r.document, r.valid, r.error_type) for r in results] == [(1, True, None), (2, False, "yaml")]
+
+
+def test_large_bundles_are_streamed(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that memory stays flat while a bundle much larger than one contract is validated."""
+    import tracemalloc
+
+    from datadoc import validation
+
+    bundle = tmp_path / "bundle.yaml"
+    _write_bundle(bundle, 400, padding=20_000)
+    monkeypatch.setattr(validation, "STREAM_THRESHOLD", 1024)
+    (tmp_path / "warm").mkdir()
+    list(validate_many(_write_contracts(tmp_path / "warm", 1), workers=1))  # load the models first
+
+    tracemalloc.start()
+    try:
+        count = sum(result.valid for result in validate_many([bundle], workers=1))
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert count == 400
+    assert peak < bundle.stat().st_size / 10
+
+
+def test_jsonl_format_streams_one_record_per_contract(tmp_path: Path) -> None:
+    """Test that --format jsonl writes a structured record for every contract."""
+    import json
+
+    paths = _write_contracts(tmp_path, 2)
+    paths[1].write_text(VALID_CONTRACT.format(id="broken").replace("status: active\n", ""))
+    result = runner.invoke(app, ["validate", str(tmp_path), "--format", "jsonl", "--workers", "1"])
+    assert result.exit_code == 1
+    records = [json.loads(line) for line in result.stdout.splitlines()]
+    assert [(r["file"], r["id"], r["status"]) for r in records] == [
+        (str(paths[0]), "contract-0", "valid"),
+        (str(paths[1]), "broken", "invalid"),
+    ]
+    assert records[1]["errors"][0]["loc"] == ["status"]
+    assert records[0]["duration_ms"] >= 0 and not records[0]["cached"]
+
+    result = runner.invoke(app, ["validate", str(tmp_path), "--format", "jsonl", "--workers", "1"])
+    assert all(json.loads(line)["cached"] for line in result.stdout.splitlines())
+
+
+def test_sarif_format(tmp_path: Path) -> None:
+    """Test that --format sarif writes a SARIF log with one result per error."""
+    import json
+
+    contract = tmp_path / "contract.yaml"
+    contract.write_text("kind: DataContract\n")
+    result = runner.invoke(app, ["validate", str(contract), "--format", "sarif"])
+    assert result.exit_code == 1
+    log = json.loads(result.stdout)
+    assert log["version"] == "2.1.0"
+    [run] = log["runs"]
+    assert run["tool"]["driver"]["name"] == "datadoc"
+    assert {r["ruleId"] for r in run["results"]} == {"odcs/missing"}
+    assert [r["message"]["text"].split(":")[0] for r in run["results"]] == ["version", "id", "status"]
+    assert run["results"][0]["locations"][0]["physicalLocation"]["artifactLocation"]["uri"] == contract.as_uri()
+
+    result = runner.invoke(app, ["validate", str(EXAMPLES / "sample_contract.yml"), "--format", "sarif"])
+    assert result.exit_code == 0
+    assert json.loads(result.stdout)["runs"][0]["results"] == []
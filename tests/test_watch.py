@@ -0,0 +1,124 @@
+"""Tests for watch mode and incremental revalidation."""
+
+import json
+import threading
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+from typer.testing import CliRunner
+
+from datadoc.cli import app
+from datadoc.watch import ContractSet, watch_changes
+
+runner = CliRunner()
+
+CONTRACT = """
+apiVersion: v3.0.2
+kind: DataContract
+id: {id}
+version: 1.0.0
+status: {status}
+"""
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path_factory: pytest.TempPathFactory, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Keep the validation cache out of the user's home directory."""
+    directory = tmp_path_factory.mktemp("cache")
+    monkeypatch.setenv("DATADOC_CACHE_DIR", str(directory))
+    return directory
+
+
+def _write(path: Path, id: str, status: str = "active") -> Path:
+    path.write_text(CONTRACT.format(id=id, status=status))
+    return path
+
+
+def test_contract_set_tracks_duplicate_ids_incrementally(tmp_path: Path) -> None:
+    """Test that updates revalidate only changed files and report duplicate ids as they come and go."""
+    a = _write(tmp_path / "a.yaml", "orders")
+    b = _write(tmp_path / "b.yaml", "customers")
+    contracts = ContractSet()
+    update = contracts.update([a, b])
+    assert len(update.results) == 2 and not update.duplicates
+    assert len(contracts) == 2
+
+    _write(b, "orders")
+    update = contracts.update([b])
+    assert [r.path for r in update.results] == [str(b)]
+    assert update.duplicates == {"orders": [str(a), str(b)]}
+    assert contracts.duplicated == {"orders"}
+
+    _write(a, "orders", status="")
+    update = contracts.update([a])
+    assert contracts.invalid == 1
+    assert update.duplicates == {"orders": [str(a), str(b)]}
+
+    a.unlink()
+    update = contracts.update([], [tmp_path])
+    assert update.removed == [str(a), str(b)]
+    assert update.resolved == ["orders"]
+    assert len(contracts) == 0 and contracts.invalid == 0 and not contracts.owners
+
+
+def test_validate_watch_reports_changes(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that --watch revalidates changed files after the initial run."""
+    pytest.importorskip("watchfiles")
+    a = _write(tmp_path / "a.yaml", "orders")
+    b = _write(tmp_path / "b.yaml", "customers")
+
+    def batches(roots: list[Path]) -> Iterator[tuple[list[Path], list[str]]]:
+        assert roots == [tmp_path]
+        _write(b, "orders")
+        yield [b], []
+        b.unlink()
+        yield [], [str(b)]
+
+    monkeypatch.setattr("datadoc.commands.validate.watch_changes", batches)
+    result = runner.invoke(app, ["validate", str(tmp_path), "--watch"])
+    assert result.exit_code == 0, result.stdout
+    assert "Duplicate contract id 'orders'" in result.stdout
+    assert "is unique again" in result.stdout
+    assert "1 contracts, 0 invalid, 0 duplicate ids" in result.stdout
+
+    _write(b, "customers")
+    result = runner.invoke(app, ["validate", str(tmp_path), "--watch", "--format", "jsonl"])
+    lines = [json.loads(line) for line in result.stdout.splitlines()]
+    assert [line.get("event") or line["status"] for line in lines] == [
+        "valid",
+        "valid",
+        "valid",
+        "duplicate_id",
+        "removed",
+        "duplicate_id_resolved",
+    ]
+    assert str(a) == lines[0]["file"]
+
+
+def test_watch_changes_debounces_file_events(tmp_path: Path) -> None:
+    """Test that a burst of writes arrives as one batch of contract files."""
+    pytest.importorskip("watchfiles")
+    stop = threading.Event()
+    batches: list[tuple[list[Path], list[str]]] = []
+
+    def collect() -> None:
+        for batch in watch_changes([tmp_path], stop_event=stop):
+            batches.append(batch)
+            stop.set()
+
+    thread = threading.Thread(target=collect)
+    thread.start()
+    try:
+        for _ in range(50):
+            if stop.wait(0.05):
+                break
+            _write(tmp_path / "a.yaml", "orders")
+            _write(tmp_path / "b.yaml", "customers")
+            (tmp_path / "notes.txt").write_text("ignored")
+    finally:
+        stop.set()
+        thread.join(timeout=5)
+    [(changed, removed)] = batches
+    assert sorted(p.name for p in set(changed)) == ["a.yaml", "b.yaml"]
+    assert removed == []